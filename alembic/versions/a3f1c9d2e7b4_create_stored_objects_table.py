@@ -0,0 +1,50 @@
+"""create_stored_objects_table
+
+Revision ID: a3f1c9d2e7b4
+Revises: dbe51a169fbc
+Create Date: 2026-10-19 09:12:31.402117
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'a3f1c9d2e7b4'
+down_revision: str | None = 'dbe51a169fbc'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('stored_objects',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False, comment='Digest SHA-256 (hex) do conteúdo'),
+    sa.Column('bucket', sa.String(length=100), nullable=False, comment='Bucket do tenant no Minio/S3'),
+    sa.Column('object_key', sa.String(length=255), nullable=False, comment='Chave do objeto dentro do bucket (sha256/ab/<digest>.ext)'),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('ref_count', sa.Integer(), nullable=False, comment='Quantidade de registros que referenciam o objeto'),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tenant_id', 'sha256', name='uq_stored_objects_tenant_sha256')
+    )
+    op.create_index(op.f('ix_stored_objects_tenant_id'), 'stored_objects', ['tenant_id'], unique=False)
+    # Índice parcial para o Garbage Collector (apenas objetos órfãos)
+    op.create_index(
+        'ix_stored_objects_unreferenced',
+        'stored_objects',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text('ref_count <= 0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stored_objects_unreferenced', table_name='stored_objects')
+    op.drop_index(op.f('ix_stored_objects_tenant_id'), table_name='stored_objects')
+    op.drop_table('stored_objects')
@@ -0,0 +1,44 @@
+"""create_tenant_storage_usage_table
+
+Revision ID: b7e2d4a1c8f3
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-19 10:03:47.218554
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'b7e2d4a1c8f3'
+down_revision: str | None = 'a3f1c9d2e7b4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('tenant_storage_usage',
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('used_bytes', sa.BigInteger(), nullable=False, comment='Bytes ocupados no bucket do tenant'),
+    sa.Column('object_count', sa.Integer(), nullable=False),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True, comment='Última reconciliação com a listagem do bucket'),
+    sa.Column('last_drift_bytes', sa.BigInteger(), nullable=False, comment='Diferença (bucket - ledger) encontrada na última reconciliação'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tenant_id')
+    )
+    # Semeia o ledger com o que já está indexado no storage content-addressed
+    op.execute(
+        """
+        INSERT INTO tenant_storage_usage (tenant_id, used_bytes, object_count, last_drift_bytes)
+        SELECT tenant_id, COALESCE(SUM(size_bytes), 0), COUNT(*), 0
+        FROM stored_objects
+        GROUP BY tenant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_storage_usage')
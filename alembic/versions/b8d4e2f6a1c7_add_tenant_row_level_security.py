@@ -0,0 +1,98 @@
+"""add_tenant_row_level_security
+
+Revision ID: b8d4e2f6a1c7
+Revises: f7c3a9e1b5d2
+Create Date: 2026-10-19 18:36:05.281940
+
+Políticas de RLS por tenant_id nas tabelas multi-tenant e o papel
+managershow_tenant (NOLOGIN) assumido pelas transações com escopo de
+tenant (ver app/core/rls.py). O dono das tabelas continua ignorando RLS:
+sem RLS_ENABLED nada muda para a aplicação.
+
+Tabelas novas com tenant_id devem ganhar a mesma política na migração
+que as cria (os privilégios do papel vêm dos default privileges).
+
+O papel é concedido ao usuário que roda a migração. Se a aplicação
+conecta com outro usuário, conceda manualmente antes de ligar
+RLS_ENABLED (GRANT managershow_tenant TO <usuário da aplicação>); o
+/health/ready acusa a falta da concessão.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'b8d4e2f6a1c7'
+down_revision: str | None = 'f7c3a9e1b5d2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ROLE = 'managershow_tenant'
+POLICY = 'tenant_isolation'
+
+TENANT_TABLES = [
+    'artists',
+    'artist_crews',
+    'city_base_costs',
+    'commercial_leads',
+    'commissions',
+    'contractor_notes',
+    'contractors',
+    'contracts',
+    'device_tokens',
+    'document_templates',
+    'financial_transactions',
+    'form_templates',
+    'logistics_timeline',
+    'outbox_messages',
+    'roles',
+    'sellers',
+    'show_checkins',
+    'show_crews',
+    'show_execution_media',
+    'shows',
+    'stored_objects',
+    'support_tickets',
+    'tenant_settings',
+    'tenant_storage_usage',
+    'tickets',
+    'users',
+    'venues',
+]
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{ROLE}') THEN
+                CREATE ROLE {ROLE} NOLOGIN;
+            END IF;
+        END
+        $$
+    """)
+    op.execute(f'GRANT {ROLE} TO CURRENT_USER')
+    op.execute(f'GRANT USAGE ON SCHEMA public TO {ROLE}')
+    op.execute(f'GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO {ROLE}')
+    op.execute(f'GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO {ROLE}')
+    op.execute(f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT, INSERT, UPDATE, DELETE ON TABLES TO {ROLE}')
+    op.execute(f'ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT USAGE, SELECT ON SEQUENCES TO {ROLE}')
+
+    for table in TENANT_TABLES:
+        op.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY')
+        op.execute(f"""
+            CREATE POLICY {POLICY} ON {table}
+            USING (tenant_id = current_setting('app.tenant_id')::uuid)
+            WITH CHECK (tenant_id = current_setting('app.tenant_id')::uuid)
+        """)
+
+
+def downgrade() -> None:
+    for table in reversed(TENANT_TABLES):
+        op.execute(f'DROP POLICY IF EXISTS {POLICY} ON {table}')
+        op.execute(f'ALTER TABLE {table} DISABLE ROW LEVEL SECURITY')
+
+    op.execute(f'ALTER DEFAULT PRIVILEGES IN SCHEMA public REVOKE USAGE, SELECT ON SEQUENCES FROM {ROLE}')
+    op.execute(f'ALTER DEFAULT PRIVILEGES IN SCHEMA public REVOKE SELECT, INSERT, UPDATE, DELETE ON TABLES FROM {ROLE}')
+    op.execute(f'DROP OWNED BY {ROLE}')
+    op.execute(f'DROP ROLE IF EXISTS {ROLE}')
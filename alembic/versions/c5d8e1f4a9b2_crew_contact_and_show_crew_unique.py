@@ -0,0 +1,44 @@
+"""crew_contact_and_show_crew_unique
+
+Revision ID: c5d8e1f4a9b2
+Revises: b7e2d4a1c8f3
+Create Date: 2026-10-19 11:41:05.730912
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'c5d8e1f4a9b2'
+down_revision: str | None = 'b7e2d4a1c8f3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('artist_crews', sa.Column('phone', sa.String(length=20), nullable=True, comment='WhatsApp do membro'))
+    op.add_column('artist_crews', sa.Column('user_id', sa.UUID(), nullable=True, comment='Usuário do app (para Push FCM), se o membro tiver login'))
+    op.create_index(op.f('ix_artist_crews_user_id'), 'artist_crews', ['user_id'], unique=False)
+    op.create_foreign_key('artist_crews_user_id_fkey', 'artist_crews', 'users', ['user_id'], ['id'], ondelete='SET NULL')
+
+    # Remove vínculos duplicados (mantém um por membro/show) antes da UNIQUE
+    op.execute(
+        """
+        DELETE FROM show_crews a
+        USING show_crews b
+        WHERE a.show_id = b.show_id
+          AND a.crew_member_id = b.crew_member_id
+          AND a.ctid > b.ctid
+        """
+    )
+    op.create_unique_constraint('uq_show_crews_show_member', 'show_crews', ['show_id', 'crew_member_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_show_crews_show_member', 'show_crews', type_='unique')
+    op.drop_constraint('artist_crews_user_id_fkey', 'artist_crews', type_='foreignkey')
+    op.drop_index(op.f('ix_artist_crews_user_id'), table_name='artist_crews')
+    op.drop_column('artist_crews', 'user_id')
+    op.drop_column('artist_crews', 'phone')
@@ -0,0 +1,31 @@
+"""create_outbox_deliveries_table
+
+Revision ID: c9e3f5a7b1d4
+Revises: b8d4e2f6a1c7
+Create Date: 2026-10-19 20:14:37.520913
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'c9e3f5a7b1d4'
+down_revision: str | None = 'b8d4e2f6a1c7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_deliveries',
+    sa.Column('message_id', sa.UUID(), nullable=False),
+    sa.Column('recipient', sa.String(length=512), nullable=False, comment='Canal + destinatário (push:<fcm_token>, whatsapp:<crew_member_id>)'),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['message_id'], ['outbox_messages.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('message_id', 'recipient')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('outbox_deliveries')
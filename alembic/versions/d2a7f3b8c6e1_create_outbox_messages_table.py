@@ -0,0 +1,50 @@
+"""create_outbox_messages_table
+
+Revision ID: d2a7f3b8c6e1
+Revises: c5d8e1f4a9b2
+Create Date: 2026-10-19 12:26:18.904417
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'd2a7f3b8c6e1'
+down_revision: str | None = 'c5d8e1f4a9b2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.String(length=100), nullable=False, comment='Tipo do evento (ex.: daysheet.published)'),
+    sa.Column('reference_id', sa.UUID(), nullable=True, comment='Entidade de origem (ex.: show_id) para consulta de status'),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.Enum('PENDENTE', 'DESPACHADA', 'ENTREGUE', 'MORTA', name='outbox_status'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Quando o relay pode (re)despachar a mensagem'),
+    sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outbox_messages_reference_id'), 'outbox_messages', ['reference_id'], unique=False)
+    op.create_index(op.f('ix_outbox_messages_tenant_id'), 'outbox_messages', ['tenant_id'], unique=False)
+    op.create_index('ix_outbox_messages_relay', 'outbox_messages', ['next_attempt_at'], unique=False, postgresql_where=sa.text("status IN ('PENDENTE', 'DESPACHADA')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_relay', table_name='outbox_messages', postgresql_where=sa.text("status IN ('PENDENTE', 'DESPACHADA')"))
+    op.drop_index(op.f('ix_outbox_messages_tenant_id'), table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_reference_id'), table_name='outbox_messages')
+    op.drop_table('outbox_messages')
+    sa.Enum(name='outbox_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,58 @@
+"""recount_stored_object_references
+
+Revision ID: d4a8b2c6e0f3
+Revises: c9e3f5a7b1d4
+Create Date: 2026-10-19 20:52:09.318476
+
+O ref_count era incrementado a cada upload/claim e quase nunca liberado.
+Recalcula a contagem a partir das linhas que realmente guardam a URL
+(recibos do ledger e mídias de execução). A partir daqui ela é mantida
+pelo hook de flush (app/core/storage_refs.py). Objetos que ficam sem
+referência entram na carência do Garbage Collector a partir de agora.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'd4a8b2c6e0f3'
+down_revision: str | None = 'c9e3f5a7b1d4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# URL = <endpoint>/<bucket>/sha256/<ab>/<digest><ext>
+PATH_PATTERN = '([^/]+/sha256/[^/]+/[^/]+)$'
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        WITH refs AS (
+            SELECT tenant_id, substring(receipt_url FROM '{PATH_PATTERN}') AS path
+            FROM financial_transactions
+            WHERE receipt_url LIKE '%/sha256/%'
+            UNION ALL
+            SELECT tenant_id, substring(media_url FROM '{PATH_PATTERN}') AS path
+            FROM show_execution_media
+            WHERE media_url LIKE '%/sha256/%'
+        ),
+        counts AS (
+            SELECT tenant_id, path, count(*) AS total
+            FROM refs
+            GROUP BY tenant_id, path
+        ),
+        recount AS (
+            SELECT so.id, COALESCE(c.total, 0) AS total
+            FROM stored_objects so
+            LEFT JOIN counts c
+                ON c.tenant_id = so.tenant_id AND c.path = so.bucket || '/' || so.object_key
+        )
+        UPDATE stored_objects so
+        SET ref_count = recount.total, updated_at = now()
+        FROM recount
+        WHERE recount.id = so.id AND so.ref_count <> recount.total
+    """)
+
+
+def downgrade() -> None:
+    # Contagem corrigida é válida também para o código anterior
+    pass
@@ -0,0 +1,34 @@
+"""add_tracing_policy_to_system_settings
+
+Revision ID: e4b9c2d7f1a3
+Revises: d2a7f3b8c6e1
+Create Date: 2026-10-19 15:02:41.117305
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'e4b9c2d7f1a3'
+down_revision: str | None = 'd2a7f3b8c6e1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'system_settings',
+        sa.Column(
+            'tracing_policy',
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment='Overrides da amostragem de traces (Sentry) — ver app/core/tracing.py',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('system_settings', 'tracing_policy')
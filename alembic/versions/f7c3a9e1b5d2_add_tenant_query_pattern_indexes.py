@@ -0,0 +1,77 @@
+"""add_tenant_query_pattern_indexes
+
+Revision ID: f7c3a9e1b5d2
+Revises: e4b9c2d7f1a3
+Create Date: 2026-10-19 17:48:12.604187
+
+Índices compostos/parciais alinhados aos filtros quentes (agenda, DRE,
+sync, check-in, funil e help desk). Criados com CONCURRENTLY — sem
+bloquear escritas nas tabelas grandes — fora da transação da migração.
+Um build concorrente interrompido deixa o índice INVÁLIDO: ele é removido
+antes de recriar, então a migração pode ser reexecutada.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision: str = 'f7c3a9e1b5d2'
+down_revision: str | None = 'e4b9c2d7f1a3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (nome, tabela, colunas, opções)
+INDEXES = [
+    ('ix_shows_tenant_date_show', 'shows', ['tenant_id', 'date_show'], {}),
+    ('ix_shows_tenant_artist_date_show', 'shows', ['tenant_id', 'artist_id', 'date_show'], {}),
+    ('ix_shows_tenant_updated_at', 'shows', ['tenant_id', 'updated_at'], {}),
+    (
+        'ix_financial_transactions_tenant_show_type',
+        'financial_transactions',
+        ['tenant_id', 'show_id', 'type'],
+        {'postgresql_include': ['budgeted_amount', 'realized_amount']},
+    ),
+    ('ix_financial_transactions_tenant_updated_at', 'financial_transactions', ['tenant_id', 'updated_at'], {}),
+    ('ix_logistics_timeline_tenant_updated_at', 'logistics_timeline', ['tenant_id', 'updated_at'], {}),
+    ('ix_show_checkins_show_user', 'show_checkins', ['show_id', 'user_id'], {}),
+    (
+        'ix_commercial_leads_tenant_status_created_at',
+        'commercial_leads',
+        ['tenant_id', 'status', 'created_at'],
+        {},
+    ),
+    ('ix_tickets_tenant_status_created_at', 'tickets', ['tenant_id', 'status', 'created_at'], {}),
+    (
+        'ix_tickets_open_queue',
+        'tickets',
+        ['created_at'],
+        {'postgresql_where': sa.text("status IN ('ABERTO', 'EM_ATENDIMENTO')")},
+    ),
+]
+
+
+def _drop_if_invalid(name: str) -> None:
+    invalid = op.get_bind().execute(sa.text("""
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {'name': name}).scalar()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            _drop_if_invalid(name)
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True, **options,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _options in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
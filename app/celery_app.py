@@ -13,18 +13,25 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 # Configuração de Observabilidade (Sentry)
 SENTRY_DSN = os.getenv("SENTRY_DSN", "")
 if SENTRY_DSN:
+    from app.core.tracing import sentry_options
+
     sentry_sdk.init(
         dsn=SENTRY_DSN,
         integrations=[CeleryIntegration()],
         environment=os.getenv("APP_ENV", "development"),
-        traces_sample_rate=1.0,
+        **sentry_options(),
     )
 
 celery_app = Celery(
     "manager_show",
     broker=REDIS_URL,
     backend=REDIS_URL,
-    include=["app.tasks.notifications"]
+    include=[
+        "app.tasks.notifications",
+        "app.tasks.logistics",
+        "app.tasks.storage",
+        "app.tasks.outbox",
+    ]
 )
 
 # Configurações adicionais
@@ -37,5 +44,42 @@ celery_app.conf.update(
     task_track_started=True,
 )
 
+# Rotinas periódicas (Celery Beat)
+celery_app.conf.beat_schedule = {
+    "outbox-relay": {
+        "task": "relay_outbox",
+        "schedule": 5,  # a cada 5 segundos
+    },
+    "read-receipts-flush": {
+        "task": "flush_read_receipts",
+        "schedule": 30,  # a cada 30 segundos
+    },
+    "whatsapp-queue-kick": {
+        "task": "kick_whatsapp_queue",
+        "schedule": 60,  # a cada minuto
+    },
+    "evolution-health-poller": {
+        "task": "poll_evolution_instance_state",
+        "schedule": 60,  # a cada minuto
+    },
+    "storage-garbage-collector": {
+        "task": "collect_unreferenced_objects",
+        "schedule": 60 * 60,  # a cada hora
+    },
+    "storage-reference-recount": {
+        "task": "recount_storage_references",
+        "schedule": 6 * 60 * 60,  # a cada 6 horas (dentro da carência do GC)
+    },
+    "storage-usage-reconciliation": {
+        "task": "reconcile_storage_usage",
+        "schedule": 24 * 60 * 60,  # diária
+    },
+}
+
+# Ciclo de vida do worker: loop persistente + pool do banco por processo
+from app.core import celery_utils  # noqa: E402,F401
+# Métricas Prometheus das tasks + exportador HTTP do worker
+from app.core import celery_metrics  # noqa: E402,F401
+
 if __name__ == "__main__":
     celery_app.start()
@@ -25,6 +25,9 @@ from sqlalchemy.orm import selectinload
 
 from app.config import Settings, get_settings
 from app.database import get_db
+from app.core.metrics import tag_request
+from app.core.read_routing import bind_user
+from app.core.tracing import tag_tenant
 from app.exceptions import InvalidTokenException, TenantSuspendedException
 from app.models.tenant import TenantStatus
 from app.models.user import User
@@ -137,6 +140,9 @@ async def _get_active_user_with_relations(
         raise HTTPException(status_code=404, detail=detail)
 
     _validate_user_access(user)
+    tag_request(user.tenant.plan_type if user.tenant else None, user.tenant_id)
+    tag_tenant(user.tenant_id)
+    bind_user(db, user.id)
     return user
 
 
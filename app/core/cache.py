@@ -0,0 +1,168 @@
+"""
+Manager Show — Core: Cache de Leitura (Redis)
+
+Cache JSON no Redis para dados caros de obter (APIs externas, consultas
+pesadas), com:
+- TTL de frescor: dentro dele o valor é servido direto do Redis.
+- Stale-while-revalidate: após o TTL, o valor antigo ainda é servido
+  por `stale_ttl` segundos enquanto UMA atualização roda em background
+  (lock distribuído evita stampede entre pods/workers).
+- Cache negativo: falhas ficam cacheadas por `negative_ttl`, para que uma
+  API fora do ar não custe o timeout inteiro em todo request.
+
+O cache é best-effort: se o Redis falhar, o fetcher é chamado direto.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.metrics import record_cache_lookup
+from app.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+REFRESH_LOCK_TTL = 30  # segundos
+
+# Mantém referência das tasks de revalidação (evita coleta pelo GC)
+_background_tasks: set[asyncio.Task] = set()
+# Single-flight em processo: misses simultâneos da mesma chave aguardam o mesmo fetch
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def get_or_fetch(
+    key: str,
+    fetcher: Callable[[], Awaitable[Any]],
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    negative_ttl: int = 0,
+    is_negative: Callable[[Any], bool] = lambda value: value is None,
+) -> Any:
+    """
+    Retorna o valor cacheado de `key` ou executa `fetcher` e cacheia.
+
+    `is_negative(valor)` indica se o resultado representa uma falha
+    (cacheada apenas por `negative_ttl`, sem janela stale).
+    """
+    entry = await _read(key)
+    now = time.time()
+
+    if entry is not None:
+        if now < entry["fresh_until"]:
+            record_cache_lookup(key, "hit")
+            return entry["value"]
+        if not entry["negative"]:
+            # Stale: serve o valor antigo e revalida em background
+            record_cache_lookup(key, "stale")
+            _schedule_refresh(key, fetcher, ttl, stale_ttl, negative_ttl, is_negative)
+            return entry["value"]
+
+    record_cache_lookup(key, "miss")
+
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_and_store(key, fetcher, ttl, stale_ttl, negative_ttl, is_negative))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t, k=key: _inflight.pop(k, None))
+    return await asyncio.shield(task)
+
+
+async def get_many(keys: list[str]) -> list[Any | None]:
+    """
+    Leitura em lote (MGET) apenas de valores frescos — usada por quem
+    consolida os misses numa única chamada externa (ex.: Distance Matrix).
+    Chaves ausentes ou vencidas retornam None.
+    """
+    if not keys:
+        return []
+    try:
+        raws = await redis_client.mget(keys)
+    except Exception as e:
+        logger.warning(f"[Cache] Redis indisponível no MGET: {e}")
+        return [None] * len(keys)
+
+    now = time.time()
+    values: list[Any | None] = []
+    for key, raw in zip(keys, raws):
+        entry = None
+        if raw is not None:
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                entry = None
+        fresh = entry is not None and now < entry["fresh_until"]
+        record_cache_lookup(key, "hit" if fresh else "miss")
+        values.append(entry["value"] if fresh else None)
+    return values
+
+
+async def store(
+    key: str,
+    value: Any,
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    negative_ttl: int = 0,
+    is_negative: Callable[[Any], bool] = lambda value: value is None,
+) -> None:
+    """Grava um valor obtido fora de get_or_fetch (mesma semântica de TTLs)."""
+    negative = is_negative(value)
+    fresh_for = negative_ttl if negative else ttl
+    if fresh_for <= 0:
+        return
+
+    expire = fresh_for if negative else ttl + stale_ttl
+    entry = {"value": value, "fresh_until": time.time() + fresh_for, "negative": negative}
+    try:
+        await redis_client.set(key, json.dumps(entry, default=str), ex=expire)
+    except Exception as e:
+        logger.warning(f"[Cache] Redis indisponível na escrita de {key}: {e}")
+
+
+async def invalidate(*keys: str) -> None:
+    """Remove chaves do cache (invalidação explícita após escrita)."""
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"[Cache] Falha ao invalidar {keys}: {e}")
+
+
+async def _read(key: str) -> dict | None:
+    try:
+        raw = await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"[Cache] Redis indisponível na leitura de {key}: {e}")
+        return None
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+async def _fetch_and_store(key, fetcher, ttl, stale_ttl, negative_ttl, is_negative) -> Any:
+    value = await fetcher()
+    await store(key, value, ttl=ttl, stale_ttl=stale_ttl, negative_ttl=negative_ttl, is_negative=is_negative)
+    return value
+
+
+def _schedule_refresh(key, fetcher, ttl, stale_ttl, negative_ttl, is_negative) -> None:
+    async def _refresh():
+        try:
+            acquired = await redis_client.set(f"lock:{key}", "1", nx=True, ex=REFRESH_LOCK_TTL)
+            if not acquired:
+                return  # Outro processo já está revalidando
+            await _fetch_and_store(key, fetcher, ttl, stale_ttl, negative_ttl, is_negative)
+        except Exception as e:
+            logger.warning(f"[Cache] Falha ao revalidar {key}: {e}")
+
+    task = asyncio.create_task(_refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
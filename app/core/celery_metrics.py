@@ -0,0 +1,95 @@
+"""
+Manager Show — Core: Exportador de Métricas do Celery
+
+- Processos filhos (prefork): duração e estado final de cada task via
+  sinais task_prerun/task_postrun.
+- Processo principal do worker: servidor HTTP de métricas na porta
+  CELERY_METRICS_PORT (0 desativa), com a profundidade das filas lida do
+  broker no momento do scrape.
+
+As métricas das tasks nascem nos processos filhos: para exportá-las pelo
+processo principal, defina PROMETHEUS_MULTIPROC_DIR (diretório limpo a
+cada deploy) no ambiente do worker.
+"""
+
+import logging
+import os
+import time
+
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown, worker_ready
+from prometheus_client import start_http_server
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.metrics import (
+    CELERY_TASK_DURATION,
+    CELERY_TASKS,
+    MULTIPROCESS,
+    build_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", "9808"))
+
+_task_started: dict[str, float] = {}
+
+
+class CeleryQueueCollector:
+    """Mensagens aguardando em cada fila do broker (LLEN no Redis)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def collect(self):
+        queues = {q.name for q in (self.app.conf.task_queues or [])} or {self.app.conf.task_default_queue}
+        gauge = GaugeMetricFamily(
+            "managershow_celery_queue_depth",
+            "Mensagens aguardando na fila do broker",
+            labels=["queue"],
+        )
+        try:
+            with self.app.connection_for_read() as conn:
+                client = conn.default_channel.client
+                for queue in sorted(queues):
+                    gauge.add_metric([queue], client.llen(queue))
+        except Exception as e:
+            logger.warning(f"[Metrics] Falha ao ler a profundidade das filas: {e}")
+            return
+        yield gauge
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs) -> None:
+    started = _task_started.pop(task_id, None)
+    name = getattr(task, "name", "unknown")
+    CELERY_TASKS.labels(name, state or "UNKNOWN").inc()
+    if started is not None:
+        CELERY_TASK_DURATION.labels(name).observe(time.perf_counter() - started)
+
+
+@worker_ready.connect
+def _start_exporter(sender=None, **kwargs) -> None:
+    if not METRICS_PORT:
+        return
+    if not MULTIPROCESS:
+        logger.warning(
+            "[Metrics] PROMETHEUS_MULTIPROC_DIR não definido: métricas das tasks "
+            "nos processos filhos não serão exportadas."
+        )
+    from app.celery_app import celery_app
+
+    start_http_server(METRICS_PORT, registry=build_registry(CeleryQueueCollector(celery_app)))
+    logger.info(f"[Metrics] Exportador do Celery na porta {METRICS_PORT}.")
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs) -> None:
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -1,16 +1,46 @@
 """
 Manager Show — Core: Celery Utils (Async/Sync Bridge)
+
+Ponte entre os workers síncronos do Celery e o código assíncrono
+(SQLAlchemy/asyncpg, httpx, redis.asyncio).
+
+Ciclo de vida por processo do worker:
+- worker_process_init: cria UM event loop de longa duração e um engine
+  próprio (pool dimensionado para o worker, nunca herdado do fork).
+- async_to_sync: executa cada task nesse loop (run_until_complete),
+  sem criar/destruir loop por task e sem misturar conexões entre loops.
+- worker_process_shutdown: descarta o pool, fecha clients e o loop.
+
+Fora do worker (ex.: pool `solo`, testes, scripts) o loop é criado sob
+demanda na primeira task e reaproveitado pelas seguintes.
 """
 
 import asyncio
 import functools
+import logging
 from typing import Any, Callable
 
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Event loop persistente do processo (criado sob demanda)."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
 def async_to_sync(func: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorator que permite rodar funções assíncronas (FastAPI/SQLAlchemy)
     dentro de contextos síncronos (Workers do Celery).
-    
+
     Uso:
         @celery_app.task
         @async_to_sync
@@ -19,5 +49,55 @@ def async_to_sync(func: Callable[..., Any]) -> Callable[..., Any]:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        return asyncio.run(func(*args, **kwargs))
+        return get_worker_loop().run_until_complete(func(*args, **kwargs))
     return wrapper
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    """Processo filho do worker: loop próprio + engine com pool próprio."""
+    from app.config import get_settings
+    from app.database import build_engine, rebind_engine
+
+    settings = get_settings()
+    get_worker_loop()
+
+    inherited = rebind_engine(
+        build_engine(
+            pool_size=settings.celery_db_pool_size,
+            max_overflow=settings.celery_db_max_overflow,
+        )
+    )
+    # Conexões herdadas do processo pai pertencem a outro processo/loop:
+    # apenas abandona o pool, sem fechar os sockets do pai.
+    inherited.sync_engine.dispose(close=False)
+    logger.info(
+        f"[Celery] Worker pronto: loop persistente e pool do banco "
+        f"({settings.celery_db_pool_size}+{settings.celery_db_max_overflow})."
+    )
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs) -> None:
+    """Descarta pool, clients compartilhados e fecha o loop do processo."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+
+    from app import database
+    from app.core.http_client import close_http_client
+    from app.redis import redis_client
+
+    async def _close_resources():
+        await close_http_client()
+        await redis_client.aclose()
+        await database.engine.dispose()
+
+    try:
+        _worker_loop.run_until_complete(_close_resources())
+        _worker_loop.run_until_complete(_worker_loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.error(f"[Celery] Erro ao encerrar recursos do worker: {str(e)}")
+    finally:
+        _worker_loop.close()
+        _worker_loop = None
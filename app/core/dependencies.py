@@ -3,12 +3,15 @@ Manager Show — Dependências Reutilizáveis do FastAPI
 
 Centraliza dependências comuns usadas em múltiplos routers:
 - get_db: sessão de banco de dados
+- ReadDbSession: leitura do tenant (réplica, com fallback à sessão do request)
+- GlobalReadDbSession: leitura sem escopo de tenant (Retaguarda)
 - get_redis: cliente Redis
 - get_current_user: usuário autenticado
 - get_current_tenant_id: tenant_id do usuário logado
 """
 
 import uuid
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends, Header
@@ -16,7 +19,9 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
+from app.core.rls import scope_session
 from app.database import get_db as _get_db
+from app.database import read_session
 from app.models.user import User
 from app.redis import get_redis as _get_redis
 
@@ -28,6 +33,7 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 
 async def get_current_tenant_id(
     current_user: CurrentUser,
+    db: DbSession,
     x_impersonate_tenant_id: str | None = Header(None, alias="X-Impersonate-Tenant-Id"),
 ) -> uuid.UUID:
     """
@@ -35,16 +41,40 @@ async def get_current_tenant_id(
 
     Regra: Se o usuário for da Vima Sistemas (@vimasistemas.com.br) e o header
     estiver presente, usamos o ID do header para permitir o espelhamento.
+
+    Com RLS habilitado, a sessão do request passa a enxergar apenas esse tenant.
     """
+    tenant_id = current_user.tenant_id
     is_vima_admin = current_user.email and current_user.email.endswith("@vimasistemas.com.br")
 
     if is_vima_admin and x_impersonate_tenant_id:
         try:
-            return uuid.UUID(x_impersonate_tenant_id)
+            tenant_id = uuid.UUID(x_impersonate_tenant_id)
         except ValueError:
             pass
 
-    return current_user.tenant_id
+    await scope_session(db, tenant_id)
+    return tenant_id
 
 
 TenantId = Annotated[uuid.UUID, Depends(get_current_tenant_id)]
+
+
+async def _get_read_db(
+    current_user: CurrentUser,
+    tenant_id: TenantId,
+    db: DbSession,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Leitura do tenant na réplica (sticky no primário após escrita do usuário), com o mesmo escopo RLS."""
+    async with read_session(db, current_user.id, tenant_id) as session:
+        yield session
+
+
+async def _get_global_read_db(current_user: CurrentUser, db: DbSession) -> AsyncGenerator[AsyncSession, None]:
+    """Leitura sem escopo de tenant (métricas globais da Retaguarda)."""
+    async with read_session(db, current_user.id) as session:
+        yield session
+
+
+ReadDbSession = Annotated[AsyncSession, Depends(_get_read_db)]
+GlobalReadDbSession = Annotated[AsyncSession, Depends(_get_global_read_db)]
@@ -0,0 +1,165 @@
+"""
+Manager Show — Core: Health Checks (Liveness / Readiness)
+
+Probes baratos, concorrentes e com timeout contra as dependências:
+- database: SELECT 1 pelo pool asyncpg do engine da aplicação; com
+  RLS_ENABLED, confere também se o usuário da aplicação pode assumir o
+  papel de tenant (senão todo request com escopo de tenant falharia)
+- redis: PING no cliente compartilhado
+- broker: conexão Kombu com o broker do Celery (em thread, API síncrona)
+- storage: HEAD no bucket padrão do S3/Minio
+
+O resultado fica em cache no processo por CACHE_TTL segundos (probes do
+orquestrador em alta frequência não viram carga nas dependências) e é
+calculado uma vez só mesmo com chamadas simultâneas.
+
+Readiness falha (503) se uma dependência CRÍTICA (banco, Redis) estiver
+fora ou se o pool estiver saturado — o balanceador tira o pod da rotação.
+Broker e storage são compartilhados por todos os pods: apenas marcam o
+status como "degraded".
+"""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 2.0
+CACHE_TTL = 5.0
+CRITICAL_CHECKS = ("database", "redis")
+
+_cached: tuple[float, dict] | None = None
+_lock: asyncio.Lock | None = None
+
+
+async def _probe_database() -> None:
+    from app import database
+
+    async with database.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        if settings.rls_enabled:
+            from app.core.rls import TENANT_ROLE
+
+            member = await conn.scalar(
+                text("SELECT pg_has_role(current_user, :role, 'MEMBER')"), {"role": TENANT_ROLE}
+            )
+            if not member:
+                raise PermissionError(
+                    f"usuário do banco não é membro de {TENANT_ROLE} (GRANT {TENANT_ROLE} TO <usuário>)"
+                )
+
+
+async def _probe_redis() -> None:
+    from app.redis import redis_client
+
+    await redis_client.ping()
+
+
+async def _probe_broker() -> None:
+    from app.celery_app import celery_app
+
+    def _connect() -> None:
+        with celery_app.connection_for_write() as conn:
+            conn.ensure_connection(max_retries=1, timeout=PROBE_TIMEOUT)
+
+    await asyncio.to_thread(_connect)
+
+
+async def _probe_storage() -> None:
+    from app.services.s3_service import S3Service
+
+    async with S3Service.client() as client:
+        await client.head_bucket(Bucket=settings.s3_bucket)
+
+
+PROBES = {
+    "database": _probe_database,
+    "redis": _probe_redis,
+    "broker": _probe_broker,
+    "storage": _probe_storage,
+}
+
+
+async def _run_probe(name: str, probe) -> dict:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=PROBE_TIMEOUT)
+        status, error = "up", None
+    except asyncio.TimeoutError:
+        status, error = "down", f"timeout ({PROBE_TIMEOUT}s)"
+    except Exception as e:
+        status, error = "down", f"{type(e).__name__}: {e}"
+    result = {"status": status, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+    if error:
+        logger.warning(f"[Health] Probe {name} falhou: {error}")
+        result["error"] = error
+    return result
+
+
+def pool_stats() -> dict:
+    """Ocupação do pool de conexões do engine (QueuePool)."""
+    from app import database
+
+    pool = database.engine.pool
+    size = pool.size()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    checked_out = pool.checkedout()
+    capacity = size + max(max_overflow, 0)
+    return {
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+async def check_dependencies() -> dict:
+    """Executa (ou reaproveita do cache) todos os probes em paralelo."""
+    global _cached, _lock
+    now = time.monotonic()
+    if _cached and now < _cached[0]:
+        return _cached[1]
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _cached and time.monotonic() < _cached[0]:
+            return _cached[1]
+
+        names = list(PROBES)
+        results = await asyncio.gather(*(_run_probe(n, PROBES[n]) for n in names))
+        checks = dict(zip(names, results))
+        _cached = (time.monotonic() + CACHE_TTL, checks)
+        return checks
+
+
+async def readiness_report() -> tuple[bool, dict]:
+    """(pronto?, relatório) — checks cacheados + pool medido na hora."""
+    checks = await check_dependencies()
+    pool = pool_stats()
+
+    critical_down = [n for n in CRITICAL_CHECKS if checks[n]["status"] != "up"]
+    saturated = pool["saturation"] >= settings.health_pool_saturation_threshold
+    degraded = [n for n, c in checks.items() if c["status"] != "up" and n not in CRITICAL_CHECKS]
+
+    if critical_down or saturated:
+        status = "unhealthy"
+    elif degraded:
+        status = "degraded"
+    else:
+        status = "healthy"
+
+    return not (critical_down or saturated), {
+        "status": status,
+        "checks": checks,
+        "pool": pool,
+        "checked_at": time.time(),
+    }
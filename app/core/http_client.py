@@ -0,0 +1,84 @@
+"""
+Manager Show — Core: Cliente HTTP Compartilhado (httpx)
+
+Um único httpx.AsyncClient por event loop, com pool de conexões e
+keep-alive, reaproveitado por todas as integrações externas (Google,
+OpenWeather, Evolution API...). Evita o custo de handshake TCP/TLS
+que um `async with httpx.AsyncClient()` por chamada paga sempre.
+
+O client fica vinculado ao loop em que foi criado (API e workers
+Celery usam loops diferentes), por isso o registro é por loop.
+
+O transporte é instrumentado: cada chamada alimenta o histograma de
+latência de APIs externas, rotulado pelo serviço de destino.
+"""
+
+import asyncio
+import time
+import weakref
+
+import httpx
+
+from app.core.metrics import observe_external_call
+
+# Timeouts curtos: integrações externas nunca podem segurar o request
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+# Host → serviço (rótulo da métrica); a Evolution API roda em host próprio
+# de cada instalação e é reconhecida pelas rotas da API.
+SERVICE_HOSTS = {
+    "maps.googleapis.com": "google",
+    "api.openweathermap.org": "openweather",
+}
+EVOLUTION_PATH_PREFIXES = ("/message/", "/instance/", "/chat/")
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _service_for(request: httpx.Request) -> str:
+    service = SERVICE_HOSTS.get(request.url.host)
+    if service:
+        return service
+    if request.url.path.startswith(EVOLUTION_PATH_PREFIXES):
+        return "evolution"
+    return "other"
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Transporte pooled padrão que mede a latência de cada chamada."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TimeoutException:
+            observe_external_call(_service_for(request), started, "timeout")
+            raise
+        except httpx.HTTPError:
+            observe_external_call(_service_for(request), started, "error")
+            raise
+        outcome = "ok" if response.status_code < 400 else f"{response.status_code // 100}xx"
+        observe_external_call(_service_for(request), started, outcome)
+        return response
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retorna o client pooled do loop corrente (criado sob demanda)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            transport=InstrumentedTransport(limits=DEFAULT_LIMITS),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Fecha o client do loop corrente (shutdown da API/worker)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
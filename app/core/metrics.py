@@ -0,0 +1,363 @@
+"""
+Manager Show — Core: Métricas Prometheus
+
+Superfície de métricas da API e dos workers (complementa o Sentry):
+- HTTP (RED): taxa, erros e latência por tag do router e plano do tenant.
+- Pool do banco: ocupação lida de `engine.pool` no momento do scrape e
+  histograma do tempo de checkout (espera por conexão) — base para
+  dimensionar pool_size/max_overflow.
+- Réplica de leitura: destino das sessões de leitura e atraso de replicação.
+- Event loop: atraso do loop (lag) medido por uma task sentinela — cresce
+  quando algo bloqueia o loop (CPU, I/O síncrono).
+- Cache: consultas por namespace e resultado (hit/stale/miss).
+- PDF: duração da renderização por tipo de documento.
+- APIs externas: latência por serviço (Evolution, OpenWeather, Google, S3).
+- Celery: duração/estado das tasks e profundidade da fila (ver
+  app/core/celery_metrics.py).
+
+Com vários processos (gunicorn/uvicorn workers, Celery prefork), defina
+PROMETHEUS_MULTIPROC_DIR antes de iniciar os processos: os valores são
+agregados pelo MultiProcessCollector na exportação.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+KNOWN_TIERS = {"Essencial", "Pro", "Enterprise"}
+ANONYMOUS_TIER = "anonymous"
+
+# Requests de API: maioria < 1s; PDFs e chamadas externas vão além
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Espera por conexão: o interessante está abaixo de 100ms (acima disso o pool saturou)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+# =============================================================================
+# Definições
+# =============================================================================
+
+HTTP_REQUESTS = Counter(
+    "managershow_http_requests_total",
+    "Requests HTTP atendidos",
+    ["method", "route_tag", "status", "tenant_tier"],
+)
+HTTP_LATENCY = Histogram(
+    "managershow_http_request_duration_seconds",
+    "Latência dos requests HTTP",
+    ["method", "route_tag", "tenant_tier"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "managershow_http_requests_in_flight",
+    "Requests HTTP em andamento",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT = Histogram(
+    "managershow_db_pool_checkout_seconds",
+    "Tempo para obter uma conexão do pool (espera + abertura/pre-ping)",
+    buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "managershow_db_pool_timeouts_total",
+    "Checkouts que estouraram o pool_timeout",
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "managershow_event_loop_lag_seconds",
+    "Atraso do event loop em relação ao agendado (sentinela a cada 250ms)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+DB_READ_ROUTING = Counter(
+    "managershow_db_read_routing_total",
+    "Sessões de leitura por destino (replica/primary) e motivo",
+    ["target", "reason"],
+)
+DB_REPLICA_LAG = Gauge(
+    "managershow_db_replica_lag_seconds",
+    "Atraso de replicação medido na réplica de leitura",
+    multiprocess_mode="max",
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "managershow_db_queries_per_request",
+    "Statements SQL executados por request",
+    ["route_tag"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "managershow_db_time_per_request_seconds",
+    "Tempo total em statements SQL por request",
+    ["route_tag"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_N_PLUS_ONE = Counter(
+    "managershow_db_n_plus_one_total",
+    "Requests com o mesmo formato de statement repetido acima do limite (N+1)",
+    ["route_tag"],
+)
+
+CACHE_LOOKUPS = Counter(
+    "managershow_cache_lookups_total",
+    "Consultas ao cache Redis por namespace e resultado",
+    ["cache", "result"],
+)
+
+PDF_RENDER = Histogram(
+    "managershow_pdf_render_seconds",
+    "Duração da renderização de PDFs",
+    ["document"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+EXTERNAL_API_LATENCY = Histogram(
+    "managershow_external_api_duration_seconds",
+    "Latência das chamadas a APIs externas",
+    ["service", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CELERY_TASKS = Counter(
+    "managershow_celery_tasks_total",
+    "Tasks Celery executadas por estado final",
+    ["task", "state"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "managershow_celery_task_duration_seconds",
+    "Duração das tasks Celery",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0),
+)
+
+# =============================================================================
+# Rótulos do request corrente
+# =============================================================================
+
+# Dicionário mutável criado pelo middleware: dependências (ex.: autenticação)
+# preenchem rótulos que o middleware lê ao final do request.
+_request_labels: ContextVar[dict | None] = ContextVar("metrics_request_labels", default=None)
+
+
+def tag_request(tenant_tier: str | None, tenant_id=None) -> None:
+    """Associa o tenant (e seu plano) ao request corrente (sem efeito fora de HTTP)."""
+    labels = _request_labels.get()
+    if labels is not None:
+        labels["tenant_tier"] = tenant_tier if tenant_tier in KNOWN_TIERS else "other"
+        labels["tenant_id"] = tenant_id
+
+
+def current_request() -> dict | None:
+    """Rótulos do request HTTP corrente (scope ASGI, tenant), ou None."""
+    return _request_labels.get()
+
+
+def route_tag(scope: dict) -> str:
+    """Primeira tag do router que atendeu o request (rótulo de baixa cardinalidade)."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    tags = getattr(route, "tags", None)
+    return str(tags[0]) if tags else "untagged"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro: RED por tag do router e plano do tenant."""
+
+    def __init__(self, app, excluded_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        labels = {"tenant_tier": ANONYMOUS_TIER, "tenant_id": None, "scope": scope}
+        token = _request_labels.set(labels)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            _request_labels.reset(token)
+
+            method, tag, tier = scope["method"], route_tag(scope), labels["tenant_tier"]
+            HTTP_REQUESTS.labels(method, tag, f"{status_code // 100}xx", tier).inc()
+            HTTP_LATENCY.labels(method, tag, tier).observe(elapsed)
+
+
+# =============================================================================
+# Pool do banco
+# =============================================================================
+
+class DbPoolCollector:
+    """Ocupação do pool do engine corrente, lida no momento do scrape."""
+
+    def collect(self):
+        from app.core.health import pool_stats
+
+        try:
+            stats = pool_stats()
+        except Exception:
+            return
+
+        for name, doc in (
+            ("size", "Conexões permanentes configuradas (pool_size)"),
+            ("max_overflow", "Conexões extras permitidas (max_overflow)"),
+            ("checked_out", "Conexões em uso"),
+            ("checked_in", "Conexões ociosas no pool"),
+            ("overflow", "Conexões de overflow abertas"),
+            ("saturation", "Uso / capacidade total do pool"),
+        ):
+            gauge = GaugeMetricFamily(f"managershow_db_pool_{name}", doc, labels=["pid"])
+            gauge.add_metric([str(os.getpid())], stats[name])
+            yield gauge
+
+
+def instrument_pool(engine) -> None:
+    """Mede o tempo de checkout de conexões do pool (idempotente)."""
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    pool = engine.sync_engine.pool
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+
+    original_connect = pool.connect
+
+    def connect():
+        started = time.perf_counter()
+        try:
+            return original_connect()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+    pool.connect = connect
+    pool._metrics_instrumented = True
+
+
+# =============================================================================
+# Event loop
+# =============================================================================
+
+LOOP_LAG_INTERVAL = 0.25
+_loop_monitor: asyncio.Task | None = None
+
+
+async def _monitor_event_loop() -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - started - LOOP_LAG_INTERVAL))
+
+
+def start_event_loop_monitor() -> None:
+    """Inicia a sentinela de lag no loop corrente (idempotente)."""
+    global _loop_monitor
+    if _loop_monitor is None or _loop_monitor.done():
+        _loop_monitor = asyncio.get_running_loop().create_task(_monitor_event_loop())
+
+
+# =============================================================================
+# Helpers de instrumentação
+# =============================================================================
+
+def record_cache_lookup(key: str, result: str) -> None:
+    """Consulta ao cache; o namespace são os dois primeiros segmentos da chave."""
+    CACHE_LOOKUPS.labels(":".join(key.split(":")[:2]), result).inc()
+
+
+@contextmanager
+def observe_pdf_render(document: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PDF_RENDER.labels(document).observe(time.perf_counter() - started)
+
+
+def observe_external_call(service: str, started: float, outcome: str) -> None:
+    EXTERNAL_API_LATENCY.labels(service, outcome).observe(time.perf_counter() - started)
+
+
+def instrument_s3_client(client) -> None:
+    """Latência das operações S3 via eventos do botocore (before/after-call)."""
+
+    def _before(context, **kwargs):
+        context["metrics_started"] = time.perf_counter()
+
+    def _after(http_response, context, **kwargs):
+        started = context.get("metrics_started")
+        if started is not None:
+            outcome = "ok" if http_response.status_code < 400 else "error"
+            observe_external_call("s3", started, outcome)
+
+    def _after_error(context, **kwargs):
+        started = context.get("metrics_started")
+        if started is not None:
+            observe_external_call("s3", started, "error")
+
+    client.meta.events.register("before-call.s3", _before)
+    client.meta.events.register("after-call.s3", _after)
+    client.meta.events.register("after-call-error.s3", _after_error)
+
+
+# =============================================================================
+# Exportação
+# =============================================================================
+
+def build_registry(*extra_collectors) -> CollectorRegistry:
+    """
+    Registro para exportação: em modo multiprocesso agrega os arquivos de
+    todos os processos; caso contrário usa o registro global.
+    """
+    if not MULTIPROCESS:
+        for collector in extra_collectors:
+            REGISTRY.register(collector)
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in extra_collectors:
+        registry.register(collector)
+    return registry
+
+
+_api_registry: CollectorRegistry | None = None
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Payload do endpoint /metrics da API (corpo, content-type)."""
+    global _api_registry
+    if _api_registry is None:
+        _api_registry = build_registry(DbPoolCollector())
+    return generate_latest(_api_registry), CONTENT_TYPE_LATEST
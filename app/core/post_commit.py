@@ -0,0 +1,44 @@
+"""
+Manager Show — Core: Efeitos Pós-Commit
+
+Agendamentos que dependem do que o request acabou de gravar (tasks Celery
+que releem o show, a timeline etc.) não podem sair antes do commit: um
+commit lento ou um rollback fariam o worker ler dados velhos ou
+inexistentes. `after_commit()` guarda o callback na sessão e `get_db`
+executa os callbacks logo após o commit — no rollback eles somem com a
+sessão.
+
+Chamadas ao broker são síncronas (kombu): `send_task()` as executa numa
+thread para não bloquear o event loop.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+CALLBACKS_KEY = "post_commit_callbacks"
+
+PostCommitCallback = Callable[[], Awaitable[None]]
+
+
+def after_commit(db: AsyncSession, callback: PostCommitCallback) -> None:
+    """Executa `callback` depois do commit da sessão do request."""
+    db.info.setdefault(CALLBACKS_KEY, []).append(callback)
+
+
+async def run_after_commit(db: AsyncSession) -> None:
+    """Roda (e descarta) os callbacks pendentes; falhas só são logadas."""
+    for callback in db.info.pop(CALLBACKS_KEY, []):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"[PostCommit] Falha no efeito pós-commit {getattr(callback, '__qualname__', callback)}: {e}")
+
+
+async def send_task(task, args: list, countdown: float | None = None) -> None:
+    """Publica uma task Celery sem bloquear o event loop."""
+    await asyncio.to_thread(task.apply_async, args=args, countdown=countdown)
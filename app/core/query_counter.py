@@ -0,0 +1,157 @@
+"""
+Manager Show — Core: Contador de Queries por Request (detector de N+1)
+
+Hooks de cursor do SQLAlchemy contam, por request, os statements
+executados, o tempo total no banco e quantas vezes cada FORMATO de
+statement (SQL normalizado, sem parâmetros) se repetiu. O mesmo formato
+repetido N_PLUS_ONE_THRESHOLD vezes ou mais num request é um N+1.
+
+Saída:
+- desenvolvimento: headers X-DB-Query-Count, X-DB-Query-Time-Ms e
+  X-DB-Duplicate-Queries na resposta + log do formato repetido;
+- produção: histogramas/contador Prometheus por tag do router;
+- testes: `record_queries()` (ver fixture `query_budget` em tests/conftest.py).
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from app.config import get_settings
+from app.core.metrics import DB_N_PLUS_ONE, DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST, route_tag
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = 5
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s")
+_VALUE_GROUPS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Formato do statement: placeholders, listas IN e VALUES múltiplos colapsados."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _VALUE_GROUPS.sub(r"\1", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[normalize_statement(statement)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Formatos executados mais de uma vez (shape → execuções)."""
+        return {shape: n for shape, n in self.shapes.items() if n > 1}
+
+    @property
+    def worst_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements em {self.total_time * 1000:.1f}ms"]
+        for shape, n in sorted(self.duplicates.items(), key=lambda item: -item[1]):
+            lines.append(f"  {n}x {shape[:200]}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+# Gravadores globais (testes): recebem todo statement do processo
+_recorders: list[QueryStats] = []
+
+
+def install_query_counter(engine) -> None:
+    """Registra os hooks de cursor no engine (idempotente)."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None and not _recorders:
+        return
+    started = getattr(context, "_query_started", None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    if stats is not None:
+        stats.add(statement, elapsed)
+    for recorder in _recorders:
+        recorder.add(statement, elapsed)
+
+
+@contextmanager
+def record_queries():
+    """Conta todos os statements executados no processo dentro do bloco."""
+    stats = QueryStats()
+    _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        _recorders.remove(stats)
+
+
+class QueryCounterMiddleware:
+    """Middleware ASGI puro: estatísticas de SQL por request."""
+
+    def __init__(self, app):
+        self.app = app
+        self.expose_headers = settings.is_development
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-query-time-ms", f"{stats.total_time * 1000:.1f}".encode()),
+                    (b"x-db-duplicate-queries", str(sum(n - 1 for n in stats.duplicates.values())).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if stats.count:
+                self._record(scope, stats)
+
+    def _record(self, scope, stats: QueryStats) -> None:
+        tag = route_tag(scope)
+        DB_QUERIES_PER_REQUEST.labels(tag).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(tag).observe(stats.total_time)
+        if stats.worst_repeat >= N_PLUS_ONE_THRESHOLD:
+            DB_N_PLUS_ONE.labels(tag).inc()
+            if self.expose_headers:
+                logger.warning(f"[N+1] {scope['method']} {scope['path']}: {stats.report()}")
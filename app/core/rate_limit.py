@@ -0,0 +1,62 @@
+"""
+Manager Show — Core: Token Bucket Distribuído (Controle de Vazão de Saída)
+
+Limita a vazão de chamadas a APIs de terceiros (Evolution API) somando
+TODOS os pods e workers Celery. Diferente do SlowAPI (app.core.limiter),
+que protege a NOSSA API de entrada, este módulo protege os serviços
+externos de rajadas que geram throttling ou banimento.
+
+O estado do bucket (tokens, último refill) vive num hash do Redis e é
+atualizado atomicamente por um script Lua usando o relógio do Redis
+(sem depender do relógio de cada máquina).
+"""
+
+import asyncio
+
+from app.redis import redis_client
+
+# Retorna "0" se consumiu um token, ou os segundos de espera até haver um
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+_token_bucket_script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+
+
+class TokenBucket:
+    """
+    Token bucket no Redis: `rate` tokens por segundo, até `capacity`
+    acumulados (rajada). `acquire()` espera até haver um token disponível.
+    """
+
+    def __init__(self, key: str, rate: float, capacity: int):
+        self.key = f"ratelimit:{key}"
+        self.rate = rate
+        self.capacity = capacity
+
+    async def try_acquire(self) -> float:
+        """Tenta consumir um token; retorna 0 ou os segundos de espera."""
+        return float(await _token_bucket_script(keys=[self.key], args=[self.rate, self.capacity]))
+
+    async def acquire(self) -> None:
+        while True:
+            wait = await self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
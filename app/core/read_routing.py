@@ -0,0 +1,152 @@
+"""
+Manager Show — Core: Roteamento de Leituras (Réplica x Primário)
+
+Endpoints de relatório e listagem usam `ReadDbSession` (escopo do tenant)
+ou `GlobalReadDbSession` (Retaguarda): a sessão vai para a réplica
+(DATABASE_REPLICA_URL) exceto quando
+- não há réplica configurada;
+- o usuário escreveu há menos de REPLICA_STICKY_SECONDS (leia o que
+  escreveu: chave no Redis, compartilhada entre pods);
+- o atraso de replicação passa de REPLICA_MAX_LAG_SECONDS ou a réplica
+  não responde (medido a cada LAG_CHECK_INTERVAL por processo).
+
+No fallback o endpoint usa a própria sessão do request (get_db): nunca
+duas conexões do primário por request.
+
+Escritas são detectadas por eventos da sessão (flush e INSERT/UPDATE/
+DELETE via ORM) e marcadas após o commit em `get_db`. As decisões ficam em
+managershow_db_read_routing_total (destino, motivo).
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.metrics import DB_READ_ROUTING, DB_REPLICA_LAG
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+WROTE_KEY = "read_routing_wrote"
+USER_KEY = "read_routing_user_id"
+LAG_CHECK_INTERVAL = 2.0
+LAG_CHECK_TIMEOUT = 1.0
+
+# Réplica em dia (WAL recebido = aplicado) tem atraso zero mesmo com o
+# primário ocioso; fora de recovery (réplica promovida) também.
+_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_lag = {"seconds": 0.0, "checked_at": 0.0, "probing": False}
+
+
+def _sticky_key(user_id: uuid.UUID) -> str:
+    return f"db:sticky_primary:{user_id}"
+
+
+# =============================================================================
+# Escritas (sticky primary)
+# =============================================================================
+
+def _after_flush(session: Session, flush_context) -> None:
+    session.info[WROTE_KEY] = True
+
+
+def _do_orm_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE_KEY] = True
+
+
+def install_write_tracking() -> None:
+    """Registra os eventos que marcam sessões com escrita (idempotente)."""
+    if not settings.database_replica_url or event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _do_orm_execute)
+
+
+def bind_user(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Associa o usuário autenticado à sessão (dono do sticky após escrita)."""
+    db.info[USER_KEY] = user_id
+
+
+async def mark_primary_sticky(db: AsyncSession) -> None:
+    """Após um commit com escrita, fixa as leituras do usuário no primário."""
+    if not settings.database_replica_url or not db.info.pop(WROTE_KEY, False):
+        return
+    user_id = db.info.get(USER_KEY)
+    if user_id is None:
+        return
+
+    from app.redis import redis_client
+
+    try:
+        await redis_client.set(_sticky_key(user_id), "1", ex=settings.replica_sticky_seconds)
+    except Exception as e:
+        logger.warning(f"[ReadRouting] Falha ao marcar sticky primary: {e}")
+
+
+async def _is_sticky(user_id: uuid.UUID) -> bool:
+    from app.redis import redis_client
+
+    try:
+        return bool(await redis_client.exists(_sticky_key(user_id)))
+    except Exception as e:
+        logger.warning(f"[ReadRouting] Redis indisponível, lendo do primário: {e}")
+        return True
+
+
+# =============================================================================
+# Atraso de replicação
+# =============================================================================
+
+async def _probe_lag(engine: AsyncEngine) -> float:
+    async with engine.connect() as conn:
+        return float((await conn.execute(_LAG_SQL)).scalar() or 0.0)
+
+
+async def replica_lag(engine: AsyncEngine) -> float:
+    """Atraso da réplica em segundos (infinito se não responde), em cache por processo."""
+    if _lag["probing"] or time.monotonic() - _lag["checked_at"] < LAG_CHECK_INTERVAL:
+        return _lag["seconds"]
+
+    _lag["probing"] = True
+    try:
+        lag = await asyncio.wait_for(_probe_lag(engine), LAG_CHECK_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"[ReadRouting] Réplica indisponível: {e!r}")
+        lag = float("inf")
+    finally:
+        _lag["probing"] = False
+        _lag["checked_at"] = time.monotonic()
+
+    _lag["seconds"] = lag
+    DB_REPLICA_LAG.set(lag)
+    return lag
+
+
+async def use_replica(engine: AsyncEngine | None, user_id: uuid.UUID | None) -> bool:
+    """Decide o destino de uma sessão de leitura."""
+    if engine is None:
+        reason = "no_replica"
+    elif user_id is not None and await _is_sticky(user_id):
+        reason = "sticky"
+    elif await replica_lag(engine) > settings.replica_max_lag_seconds:
+        reason = "lag"
+    else:
+        DB_READ_ROUTING.labels("replica", "ok").inc()
+        return True
+
+    DB_READ_ROUTING.labels("primary", reason).inc()
+    return False
@@ -0,0 +1,65 @@
+"""
+Manager Show — Core: Row-Level Security (isolamento de tenant no Postgres)
+
+Com RLS_ENABLED, a dependência TenantId marca a sessão do request com o
+tenant e toda transação dela passa a rodar como o papel TENANT_ROLE, com
+`app.tenant_id` definido localmente (equivalente a SET LOCAL):
+
+    SELECT set_config('role', 'managershow_tenant', true),
+           set_config('app.tenant_id', '<uuid>', true)
+
+As políticas (migração b8d4e2f6a1c7) filtram `tenant_id =
+current_setting('app.tenant_id')::uuid` — predicado estável, usado pelo
+planner como condição de índice, inclusive nos caminhos que não passam
+por tenant_query. Sem o GUC definido o papel não enxerga nada (falha
+fechada).
+
+Fora do escopo de tenant (autenticação, retaguarda, Celery, roteiro
+público, migrações) a conexão segue como dona das tabelas, que ignora
+RLS — nada muda para esses caminhos.
+"""
+
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+settings = get_settings()
+
+TENANT_ROLE = "managershow_tenant"
+SESSION_KEY = "rls_tenant_id"
+
+_SCOPE_SQL = text(
+    "SELECT set_config('role', :role, true), set_config('app.tenant_id', :tenant_id, true)"
+)
+
+
+def _scope_params(tenant_id: uuid.UUID) -> dict:
+    return {"role": TENANT_ROLE, "tenant_id": str(tenant_id)}
+
+
+def _after_begin(session: Session, transaction, connection) -> None:
+    """Reaplica o escopo a cada transação (SET LOCAL termina no commit)."""
+    tenant_id = session.info.get(SESSION_KEY)
+    if tenant_id is not None:
+        connection.execute(_SCOPE_SQL, _scope_params(tenant_id))
+
+
+def install_rls() -> None:
+    """Registra o hook de início de transação nas sessões (idempotente)."""
+    if not settings.rls_enabled or event.contains(Session, "after_begin", _after_begin):
+        return
+    event.listen(Session, "after_begin", _after_begin)
+
+
+async def scope_session(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Restringe a sessão ao tenant (transação corrente e seguintes)."""
+    if not settings.rls_enabled or db.info.get(SESSION_KEY) == tenant_id:
+        return
+    db.info[SESSION_KEY] = tenant_id
+    if db.in_transaction():
+        # A transação já começou (ex.: consulta do usuário na autenticação)
+        await db.execute(_SCOPE_SQL, _scope_params(tenant_id))
@@ -0,0 +1,215 @@
+"""
+Manager Show — Core: Registro de Queries Lentas
+
+Hook de cursor do SQLAlchemy: statements acima de SLOW_QUERY_THRESHOLD_MS
+são agregados no Redis (compartilhado entre pods e workers) pelo FORMATO
+normalizado do SQL, com:
+- contagem, tempo total e tempo máximo;
+- formato dos parâmetros (tipos, nunca valores — sem dados de clientes);
+- último tenant e rota/task que o executou.
+
+Outliers (acima de SLOW_QUERY_EXPLAIN_THRESHOLD_MS) têm o plano
+amostrado com EXPLAIN (ANALYZE, BUFFERS) — apenas SELECTs sem lock
+(ANALYZE executa o statement), numa conexão própria, no máximo uma vez por
+formato a cada EXPLAIN_COOLDOWN.
+
+O hook roda dentro do greenlet do SQLAlchemy: a gravação no Redis é
+agendada no event loop corrente e nunca atrasa o statement.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from app.config import get_settings
+from app.core.metrics import current_request
+from app.core.query_counter import normalize_statement
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+TOTAL_KEY = "slowq:total_ms"
+MAX_KEY = "slowq:max_ms"
+STATS_TTL = 7 * 24 * 60 * 60
+EXPLAIN_COOLDOWN = 60 * 60
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _shape_id(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+def _stats_key(shape_id: str) -> str:
+    return f"slowq:q:{shape_id}"
+
+
+def _plan_key(shape_id: str) -> str:
+    return f"slowq:plan:{shape_id}"
+
+
+def _parameters_shape(parameters, executemany: bool) -> str:
+    """Tipos dos parâmetros (ex.: "(UUID, str, int)"); lotes indicam o tamanho."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)}x {_parameters_shape(parameters[0], False)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _origin() -> tuple[str | None, str | None]:
+    """(tenant, rota ou task) de quem executou o statement."""
+    request = current_request()
+    if request is not None:
+        route = request["scope"].get("route")
+        path = getattr(route, "path", None) or request["scope"].get("path")
+        tenant = request.get("tenant_id")
+        return (str(tenant) if tenant else None), f"{request['scope'].get('method')} {path}"
+
+    from celery import current_task
+
+    if current_task and current_task.request.id:
+        return None, f"task {current_task.name}"
+    return None, None
+
+
+def install_slow_query_recorder(engine) -> None:
+    """Registra o hook no engine (idempotente)."""
+    sync_engine = engine.sync_engine
+    if not settings.slow_query_threshold_ms:
+        return
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms < settings.slow_query_threshold_ms or statement.startswith("EXPLAIN"):
+        return  # rápido, ou a própria amostragem de plano
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # engine síncrono/fora do loop: nada a registrar
+
+    tenant, origin = _origin()
+    shape = normalize_statement(statement)
+    explain = (
+        not executemany
+        and settings.slow_query_explain_sample_rate > 0
+        and elapsed_ms >= settings.slow_query_explain_threshold_ms
+        and shape.lstrip().upper().startswith("SELECT")
+        and "FOR UPDATE" not in shape.upper()
+        and random.random() < settings.slow_query_explain_sample_rate
+    )
+    task = loop.create_task(_record(
+        shape, elapsed_ms, _parameters_shape(parameters, executemany), tenant, origin,
+        (statement, parameters) if explain else None,
+    ))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _record(shape, elapsed_ms, params_shape, tenant, origin, explain_args) -> None:
+    from app.redis import redis_client
+
+    shape_id = _shape_id(shape)
+    key = _stats_key(shape_id)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zincrby(TOTAL_KEY, elapsed_ms, shape_id)
+            pipe.zadd(MAX_KEY, {shape_id: elapsed_ms}, gt=True)
+            pipe.hincrby(key, "count", 1)
+            pipe.hset(key, mapping={
+                "sql": shape,
+                "params": params_shape,
+                "last_tenant": tenant or "",
+                "last_origin": origin or "",
+                "last_seen": datetime.now(timezone.utc).isoformat(),
+            })
+            pipe.expire(key, STATS_TTL)
+            await pipe.execute()
+
+        if explain_args and await redis_client.set(
+            f"{_plan_key(shape_id)}:lock", "1", nx=True, ex=EXPLAIN_COOLDOWN
+        ):
+            plan = await _explain(*explain_args)
+            await redis_client.set(_plan_key(shape_id), plan, ex=STATS_TTL)
+    except Exception as e:
+        logger.warning(f"[SlowQuery] Falha ao registrar statement lento: {e}")
+
+
+async def _explain(statement: str, parameters) -> str:
+    """EXPLAIN (ANALYZE, BUFFERS) numa transação descartada (rollback)."""
+    from app import database
+
+    async with database.engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        plan = "\n".join(row[0] for row in result)
+        await conn.rollback()
+    return plan
+
+
+async def top_offenders(limit: int = 20, order_by: str = "total") -> list[dict]:
+    """Formatos mais caros por tempo total (ou máximo), com plano se amostrado."""
+    from app.redis import redis_client
+
+    ranking = await redis_client.zrevrange(TOTAL_KEY if order_by == "total" else MAX_KEY, 0, limit - 1)
+    if not ranking:
+        return []
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for shape_id in ranking:
+            pipe.hgetall(_stats_key(shape_id))
+            pipe.zscore(TOTAL_KEY, shape_id)
+            pipe.zscore(MAX_KEY, shape_id)
+            pipe.get(_plan_key(shape_id))
+        raw = await pipe.execute()
+
+    offenders = []
+    for index, shape_id in enumerate(ranking):
+        stats, total_ms, max_ms, plan = raw[index * 4:index * 4 + 4]
+        if not stats:
+            continue  # expirado: sobra apenas no ranking
+        count = int(stats.get("count", 0))
+        offenders.append({
+            "id": shape_id,
+            "sql": stats.get("sql"),
+            "params": stats.get("params"),
+            "count": count,
+            "total_ms": round(total_ms or 0, 1),
+            "mean_ms": round((total_ms or 0) / count, 1) if count else 0.0,
+            "max_ms": round(max_ms or 0, 1),
+            "last_tenant": stats.get("last_tenant") or None,
+            "last_origin": stats.get("last_origin") or None,
+            "last_seen": stats.get("last_seen"),
+            "plan": plan,
+        })
+    return offenders
+
+
+async def reset() -> None:
+    """Zera o ranking (ex.: após um deploy de índices)."""
+    from app.redis import redis_client
+
+    shape_ids = await redis_client.zrange(TOTAL_KEY, 0, -1)
+    keys = [TOTAL_KEY, MAX_KEY]
+    keys += [_stats_key(s) for s in shape_ids] + [_plan_key(s) for s in shape_ids]
+    await redis_client.delete(*keys)
@@ -0,0 +1,164 @@
+"""
+Manager Show — Core: Referências ao Storage Content-Addressed
+
+O ref_count de StoredObject acompanha as LINHAS que gravam a URL do
+objeto — não os uploads. Um hook `before_flush` compara o estado de cada
+coluna de arquivo rastreada (TRACKED_URLS) e aplica a diferença no índice:
+
+- linha nova com URL → +1;
+- URL trocada (atualização via REST ou sync offline) → -1 na antiga, +1 na nova;
+- linha removida pela sessão (inclusive cascata do ORM) → -1.
+
+Se a URL anterior não estiver carregada na sessão (atributo expirado ou
+objeto removido sem ter sido lido), ela é lida do banco antes do flush.
+
+O hook não enxerga o que não passa pela unidade de trabalho: ON DELETE
+CASCADE do banco (show → lançamentos/mídias) e delete()/update() em lote.
+Esses casos são corrigidos por `recount_references()`, executada
+periodicamente pelo Beat (task `recount_storage_references`).
+
+Assim upload, claim por digest e reenvios do sync não inflam a contagem:
+um objeto enviado mas nunca salvo fica com ref_count 0 e é removido pelo
+Garbage Collector após o período de carência. URLs legadas (fora do
+índice) não casam com nenhuma linha e são ignoradas.
+"""
+
+import uuid
+from collections import Counter
+
+from sqlalchemy import event, func, inspect, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.financial_transaction import FinancialTransaction
+from app.models.show_execution_media import ShowExecutionMedia
+from app.models.stored_object import StoredObject
+
+settings = get_settings()
+
+# Model → coluna com a URL do arquivo no storage
+TRACKED_URLS = {
+    FinancialTransaction: "receipt_url",
+    ShowExecutionMedia: "media_url",
+}
+
+
+def storage_location(url: str | None) -> tuple[str, str] | None:
+    """(bucket, chave) de uma URL gerada por S3Service.public_url, ou None."""
+    prefix = f"{settings.s3_endpoint}/"
+    if not url or not url.startswith(prefix):
+        return None
+    bucket, _, key = url[len(prefix):].partition("/")
+    return (bucket, key) if key else None
+
+
+# URL = <endpoint>/<bucket>/sha256/<ab>/<digest><ext>
+PATH_PATTERN = "([^/]+/sha256/[^/]+/[^/]+)$"
+
+
+def _stored_url(session: Session, obj, attr: str) -> str | None:
+    """URL gravada no banco para a linha (valor anterior não carregado na sessão)."""
+    state = inspect(obj)
+    table = state.mapper.local_table
+    stmt = select(table.c[attr]).where(
+        *(column == value for column, value in zip(state.mapper.primary_key, state.identity))
+    )
+    return session.connection().execute(stmt).scalar_one_or_none()
+
+
+def _url_changes(session: Session, obj, attr: str, deleted: bool) -> tuple[list[str], list[str]]:
+    """(URLs que deixam de ser referenciadas, URLs que passam a ser)."""
+    history = inspect(obj).attrs[attr].history
+    if not deleted and not history.has_changes():
+        return [], []
+    if history.unchanged or history.deleted:
+        committed = [url for url in (*history.unchanged, *history.deleted) if url]
+    else:
+        # Atributo expirado/nunca carregado: o histórico não traz o valor anterior
+        committed = [url for url in (_stored_url(session, obj, attr),) if url]
+    if deleted:
+        return committed, []
+    return committed, [url for url in history.added if url]
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    deltas: Counter[tuple[uuid.UUID, str]] = Counter()
+
+    for obj in session.new:
+        attr = TRACKED_URLS.get(type(obj))
+        if attr and getattr(obj, attr):
+            deltas[(obj.tenant_id, getattr(obj, attr))] += 1
+
+    for objects, deleted in ((session.dirty, False), (session.deleted, True)):
+        for obj in objects:
+            attr = TRACKED_URLS.get(type(obj))
+            if not attr:
+                continue
+            dropped, added = _url_changes(session, obj, attr, deleted)
+            for url in dropped:
+                deltas[(obj.tenant_id, url)] -= 1
+            for url in added:
+                deltas[(obj.tenant_id, url)] += 1
+
+    if not any(deltas.values()):
+        return
+
+    connection = session.connection()
+    for (tenant_id, url), delta in deltas.items():
+        location = storage_location(url)
+        if not delta or location is None:
+            continue
+        bucket, key = location
+        connection.execute(
+            update(StoredObject.__table__)
+            .where(
+                StoredObject.tenant_id == tenant_id,
+                StoredObject.bucket == bucket,
+                StoredObject.object_key == key,
+            )
+            .values(ref_count=func.greatest(StoredObject.ref_count + delta, 0))
+        )
+
+
+async def recount_references(db: AsyncSession) -> int:
+    """
+    Recalcula o ref_count de todos os objetos a partir das linhas que
+    guardam as URLs (TRACKED_URLS). Retorna quantos objetos foram corrigidos.
+
+    Trava stored_objects contra escrita até o commit do chamador: um flush
+    concorrente espera a recontagem em vez de ter o seu incremento
+    sobrescrito por uma contagem feita antes do commit dele.
+    """
+    refs = " UNION ALL ".join(
+        f"SELECT tenant_id, substring({attr} FROM '{PATH_PATTERN}') AS path "
+        f"FROM {model.__table__.name} WHERE {attr} LIKE '%/sha256/%'"
+        for model, attr in TRACKED_URLS.items()
+    )
+    await db.execute(text("LOCK TABLE stored_objects IN SHARE ROW EXCLUSIVE MODE"))
+    result = await db.execute(text(f"""
+        WITH refs AS ({refs}),
+        counts AS (
+            SELECT tenant_id, path, count(*) AS total
+            FROM refs
+            GROUP BY tenant_id, path
+        ),
+        recount AS (
+            SELECT so.id, COALESCE(c.total, 0) AS total
+            FROM stored_objects so
+            LEFT JOIN counts c
+                ON c.tenant_id = so.tenant_id AND c.path = so.bucket || '/' || so.object_key
+        )
+        UPDATE stored_objects so
+        SET ref_count = recount.total, updated_at = now()
+        FROM recount
+        WHERE recount.id = so.id AND so.ref_count <> recount.total
+    """))
+    return result.rowcount
+
+
+def install_storage_refs() -> None:
+    """Registra o hook de contagem de referências nas sessões (idempotente)."""
+    if event.contains(Session, "before_flush", _before_flush):
+        return
+    event.listen(Session, "before_flush", _before_flush)
@@ -0,0 +1,216 @@
+"""
+Manager Show — Core: Política de Amostragem de Traces (Sentry)
+
+Substitui o tracing/profiling em 100% por uma política em duas etapas:
+
+1. Cabeça (traces_sampler): decide no início do request/task se ele será
+   instrumentado. Rotas de alto volume e baixo valor (health, métricas,
+   beat de alta frequência) ficam em 0; o restante é instrumentado na
+   taxa de CANDIDATOS (maior que a taxa base, para haver o que escolher).
+2. Cauda (before_send_transaction): com a transação concluída, mantém
+   sempre as que falharam ou foram lentas; as demais são mantidas na
+   proporção taxa_base / taxa_de_candidatos — o volume enviado converge
+   para a taxa base da rota (ou do tenant, se houver override).
+
+O tenant só é conhecido após a autenticação, por isso o override por
+tenant atua na cauda (dentro dos candidatos) — um override de 1.0 mantém
+todos os candidatos daquele tenant.
+
+As taxas padrão vêm do ambiente (Settings); a retaguarda pode ajustá-las
+em tempo de execução (SystemSettings.tracing_policy, publicado no Redis).
+Cada processo relê a política a cada POLICY_REFRESH_SECONDS numa thread
+daemon — os samplers rodam no caminho quente e nunca fazem I/O.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+import sentry_sdk
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+POLICY_KEY = "system_settings:tracing"
+POLICY_REFRESH_SECONDS = 30
+
+# Prefixos de rota (ou nomes de task) sem valor diagnóstico em volume
+DEFAULT_ROUTE_RATES: dict[str, float] = {
+    "/health": 0.0,
+    "/metrics": 0.0,
+    "/docs": 0.0,
+    "/redoc": 0.0,
+    "/openapi.json": 0.0,
+    "/public/daysheet": 0.01,
+    "relay_outbox": 0.001,
+    "flush_read_receipts": 0.01,
+    "kick_whatsapp_queue": 0.01,
+    "poll_evolution_instance_state": 0.01,
+}
+
+ERROR_TRACE_STATUSES = {
+    "internal_error", "unknown_error", "unknown", "aborted", "data_loss",
+    "deadline_exceeded", "unavailable", "resource_exhausted",
+}
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    default_rate: float
+    candidate_rate: float
+    slow_threshold_ms: int
+    profiles_rate: float
+    route_rates: dict[str, float] = field(default_factory=dict)
+    tenant_rates: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def defaults(cls) -> "SamplingPolicy":
+        return cls(
+            default_rate=settings.sentry_traces_default_rate,
+            candidate_rate=settings.sentry_traces_candidate_rate,
+            slow_threshold_ms=settings.sentry_slow_transaction_ms,
+            profiles_rate=settings.sentry_profiles_rate,
+            route_rates=dict(DEFAULT_ROUTE_RATES),
+        )
+
+    @classmethod
+    def from_overrides(cls, overrides: dict | None) -> "SamplingPolicy":
+        """Política padrão com os campos informados sobrescritos."""
+        base = asdict(cls.defaults())
+        for name, value in (overrides or {}).items():
+            if name == "route_rates":
+                base["route_rates"] = {**base["route_rates"], **value}
+            elif name in base and value is not None:
+                base[name] = value
+        return cls(**base)
+
+    def route_rate(self, name: str) -> float:
+        """Taxa base do prefixo mais específico que casa com a rota/task."""
+        match = max((p for p in self.route_rates if name.startswith(p)), key=len, default=None)
+        return self.route_rates[match] if match is not None else self.default_rate
+
+    def head_rate(self, name: str) -> float:
+        base = self.route_rate(name)
+        return 0.0 if base <= 0 else min(1.0, max(base, self.candidate_rate))
+
+
+_policy = SamplingPolicy.defaults()
+_refresher_pid: int | None = None
+
+
+def current_policy() -> SamplingPolicy:
+    _ensure_refresher()
+    return _policy
+
+
+def _load_from_redis() -> None:
+    global _policy
+    import redis
+
+    client = redis.Redis.from_url(settings.redis_url, socket_timeout=1, decode_responses=True)
+    try:
+        raw = client.get(POLICY_KEY)
+        _policy = SamplingPolicy.from_overrides(json.loads(raw) if raw else None)
+    finally:
+        client.close()
+
+
+def _refresh_loop() -> None:
+    while True:
+        try:
+            _load_from_redis()
+        except Exception as e:
+            logger.warning(f"[Tracing] Falha ao atualizar a política de amostragem: {e}")
+        time.sleep(POLICY_REFRESH_SECONDS)
+
+
+def _ensure_refresher() -> None:
+    """Uma thread por processo (workers prefork iniciam a sua após o fork)."""
+    global _refresher_pid
+    pid = os.getpid()
+    if _refresher_pid == pid:
+        return
+    _refresher_pid = pid
+    threading.Thread(target=_refresh_loop, name="tracing-policy", daemon=True).start()
+
+
+def _transaction_name(sampling_context: dict) -> str:
+    scope = sampling_context.get("asgi_scope")
+    if scope:
+        return scope.get("path", "")
+    job = sampling_context.get("celery_job")
+    if job:
+        return job.get("task", "")
+    return (sampling_context.get("transaction_context") or {}).get("name", "")
+
+
+def traces_sampler(sampling_context: dict) -> float:
+    """Decisão de cabeça: quem vira candidato a trace."""
+    parent = sampling_context.get("parent_sampled")
+    if parent is not None:
+        return 1.0 if parent else 0.0  # respeita a decisão do trace distribuído
+    return current_policy().head_rate(_transaction_name(sampling_context))
+
+
+def profiles_sampler(sampling_context: dict) -> float:
+    """Fração das transações instrumentadas que também são perfiladas."""
+    return current_policy().profiles_rate
+
+
+def _is_error(event: dict) -> bool:
+    contexts = event.get("contexts") or {}
+    status = (contexts.get("trace") or {}).get("status")
+    if status in ERROR_TRACE_STATUSES:
+        return True
+    status_code = (contexts.get("response") or {}).get("status_code")
+    return bool(status_code and status_code >= 500)
+
+
+def _duration_ms(event: dict) -> float:
+    from datetime import datetime
+
+    def _ts(value):
+        if isinstance(value, (int, float)):
+            return float(value)
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+    try:
+        return (_ts(event["timestamp"]) - _ts(event["start_timestamp"])) * 1000
+    except (KeyError, ValueError, TypeError):
+        return 0.0
+
+
+def before_send_transaction(event: dict, hint: dict) -> dict | None:
+    """Decisão de cauda: erros e lentas sempre; o resto na taxa base."""
+    policy = current_policy()
+    if _is_error(event) or _duration_ms(event) >= policy.slow_threshold_ms:
+        return event
+
+    name = event.get("transaction") or ""
+    tenant_id = (event.get("tags") or {}).get("tenant_id")
+    base = policy.tenant_rates.get(tenant_id, policy.route_rate(name)) if tenant_id else policy.route_rate(name)
+    head = policy.head_rate(name)
+    if head <= 0:
+        # Candidato por override de tenant ou por trace distribuído
+        return event if random.random() < base else None
+    return event if random.random() < min(1.0, base / head) else None
+
+
+def tag_tenant(tenant_id) -> None:
+    """Marca o escopo corrente com o tenant (usado pelo override por tenant)."""
+    sentry_sdk.set_tag("tenant_id", str(tenant_id))
+
+
+def sentry_options() -> dict:
+    """Opções de amostragem para o sentry_sdk.init (API e workers)."""
+    return {
+        "traces_sampler": traces_sampler,
+        "profiles_sampler": profiles_sampler,
+        "before_send_transaction": before_send_transaction,
+    }
@@ -1,30 +1,50 @@
 """
 Manager Show — Conexão Assíncrona com PostgreSQL (SQLAlchemy 2.0)
 
-Configura o engine assíncrono (asyncpg) e a fábrica de sessões.
+Configura o engine assíncrono (asyncpg) e a fábrica de sessões, além do
+engine opcional da réplica de leitura (ver app/core/read_routing.py).
 Toda operação de I/O com o banco DEVE usar await.
 """
 
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from app.config import get_settings
+from app.core.metrics import instrument_pool
+from app.core.post_commit import run_after_commit
+from app.core.query_counter import install_query_counter
+from app.core.read_routing import install_write_tracking, mark_primary_sticky, use_replica
+from app.core.rls import install_rls, scope_session
+from app.core.slow_queries import install_slow_query_recorder
+from app.core.storage_refs import install_storage_refs
 
 settings = get_settings()
 
+
+def build_engine(pool_size: int = 20, max_overflow: int = 10, url: str | None = None) -> AsyncEngine:
+    """Cria um engine assíncrono (asyncpg) com o pool dimensionado e instrumentado."""
+    engine = create_async_engine(
+        url or settings.database_url,
+        echo=settings.is_development,  # Loga SQL apenas em dev
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,  # Verifica conexão antes de usar (evita conexões mortas)
+    )
+    instrument_pool(engine)
+    install_query_counter(engine)
+    install_slow_query_recorder(engine)
+    return engine
+
+
 # Engine assíncrono — pool de conexões com PostgreSQL via asyncpg
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.is_development,  # Loga SQL apenas em dev
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verifica conexão antes de usar (evita conexões mortas)
-)
+engine = build_engine()
 
 # Fábrica de sessões assíncronas — cada request recebe uma sessão isolada
 async_session_factory = async_sessionmaker(
@@ -33,6 +53,34 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False,  # Permite acessar atributos após commit sem novo SELECT
 )
 
+# Réplica de leitura (opcional) — relatórios e listagens, ver read_session()
+replica_engine = build_engine(url=settings.database_replica_url) if settings.database_replica_url else None
+replica_session_factory = (
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+# Escopo de tenant por transação (no-op sem RLS_ENABLED)
+install_rls()
+# Sessões com escrita fixam as leituras do usuário no primário (no-op sem réplica)
+install_write_tracking()
+# ref_count do storage content-addressed acompanha as linhas que gravam a URL
+install_storage_refs()
+
+
+def rebind_engine(new_engine: AsyncEngine) -> AsyncEngine:
+    """
+    Troca o engine usado pela fábrica de sessões (ex.: worker Celery após
+    o fork, com pool próprio). Quem importou `async_session_factory` passa
+    a usar o novo engine automaticamente. Retorna o engine anterior.
+    """
+    global engine
+    previous = engine
+    engine = new_engine
+    async_session_factory.configure(bind=new_engine)
+    return previous
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -42,13 +90,43 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def meu_endpoint(db: AsyncSession = Depends(get_db)):
 
     A sessão é fechada automaticamente ao final do request (finally).
+    Efeitos registrados com app.core.post_commit.after_commit rodam
+    logo após o commit (e são descartados no rollback).
     """
     async with async_session_factory() as session:
         try:
             yield session
             await session.commit()
+            await mark_primary_sticky(session)
+            await run_after_commit(session)
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+@asynccontextmanager
+async def read_session(
+    primary: AsyncSession,
+    user_id=None,
+    tenant_id=None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sessão somente leitura: na réplica quando configurada, em dia e sem
+    escrita recente do usuário; senão a própria sessão do request
+    (`primary`, de get_db) — nunca uma segunda conexão no primário.
+
+    Indo para a réplica, a transação da autenticação é encerrada antes
+    (devolve a conexão ao pool) e a sessão da réplica recebe o mesmo
+    escopo de tenant (RLS) que o TenantId aplica na sessão do request.
+    """
+    if not await use_replica(replica_engine, user_id):
+        yield primary
+        return
+
+    await primary.commit()
+    async with replica_session_factory() as session:
+        if tenant_id is not None:
+            await scope_session(session, tenant_id)
+        yield session
@@ -183,3 +183,58 @@ class BudgetOverflowException(ManagerShowException):
             status_code=422,
             details=[{"budgeted": budgeted, "realized": realized}],
         )
+
+
+class InvalidDateRangeException(ManagerShowException):
+    """Intervalo de datas com início posterior ao fim."""
+
+    def __init__(self, date_from: str = "", date_to: str = "") -> None:
+        super().__init__(
+            error_code="INVALID_DATE_RANGE",
+            message="A data inicial deve ser anterior ou igual à data final.",
+            status_code=422,
+            details=[{"date_from": date_from, "date_to": date_to}],
+        )
+
+
+class MonthWithoutYearException(ManagerShowException):
+    """Filtro de mês informado sem o ano correspondente."""
+
+    def __init__(self, month: int = 0) -> None:
+        super().__init__(
+            error_code="MONTH_WITHOUT_YEAR",
+            message="Informe o ano junto com o mês.",
+            status_code=422,
+            details=[{"month": month}],
+        )
+
+
+# =============================================================================
+# Exceções de Storage (S3 / Minio)
+# =============================================================================
+
+
+class ContentDigestMismatchException(ManagerShowException):
+    """O SHA-256 informado pelo cliente não confere com o conteúdo recebido."""
+
+    def __init__(self, expected: str = "", received: str = "") -> None:
+        super().__init__(
+            error_code="CONTENT_DIGEST_MISMATCH",
+            message="O arquivo recebido não confere com o digest SHA-256 informado. Reenvie o arquivo.",
+            status_code=422,
+            details=[{"expected": expected, "received": received}],
+        )
+
+
+class StorageQuotaExceededException(ManagerShowException):
+    """Upload ultrapassaria o limite de armazenamento contratado (storage_limit_gb)."""
+
+    def __init__(self, limit_gb: int | None = None) -> None:
+        msg = "Limite de armazenamento do plano atingido. Adquira mais espaço na Lojinha para continuar enviando arquivos."
+        if limit_gb is not None:
+            msg = f"Limite de armazenamento do plano ({limit_gb}GB) atingido. Adquira mais espaço na Lojinha para continuar enviando arquivos."
+        super().__init__(
+            error_code="STORAGE_QUOTA_EXCEEDED",
+            message=msg,
+            status_code=403,
+        )
@@ -2,7 +2,7 @@
 Manager Show — Aplicação FastAPI Principal (main.py)
 
 Ponto de entrada da API. Configura:
-- Middleware CORS
+- Middleware CORS e de métricas (Prometheus)
 - Exception Handler global (respostas padronizadas em PT-BR)
 - Registro de todos os routers (Retaguarda + Client)
 - Swagger/Redoc com CDN alternativo (unpkg.com — cdn.jsdelivr.net bloqueado)
@@ -11,7 +11,7 @@ Ponto de entrada da API. Configura:
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import sentry_sdk
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
@@ -25,11 +25,12 @@ settings = get_settings()
 # Observabilidade: Sentry
 # =============================================================================
 if settings.sentry_dsn:
+    from app.core.tracing import sentry_options
+
     sentry_sdk.init(
         dsn=settings.sentry_dsn,
         environment=settings.app_env,
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
+        **sentry_options(),
     )
 
 # =============================================================================
@@ -106,6 +107,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# =============================================================================
+# Middleware de Métricas (Prometheus — RED por tag do router e plano;
+# contagem de SQL/N+1 por request)
+# =============================================================================
+
+from app.core.metrics import MetricsMiddleware  # noqa: E402
+from app.core.query_counter import QueryCounterMiddleware  # noqa: E402
+
+app.add_middleware(QueryCounterMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 
 # =============================================================================
 # Exception Handler Global (GUIA TÉCNICO)
@@ -158,6 +170,38 @@ async def generic_exception_handler(
     )
 
 
+# =============================================================================
+# Ciclo de Vida (recursos compartilhados)
+# =============================================================================
+
+@app.on_event("startup")
+async def publish_tracing_policy() -> None:
+    """Republica no Redis a política de amostragem salva pela retaguarda."""
+    from app.database import async_session_factory
+    from app.services.system_settings_service import SystemSettingsService
+
+    try:
+        async with async_session_factory() as db:
+            await SystemSettingsService.publish_tracing_policy(db)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"[Tracing] Política não publicada no startup: {e}")
+
+
+@app.on_event("startup")
+async def monitor_event_loop() -> None:
+    """Sentinela de lag do event loop (métrica managershow_event_loop_lag_seconds)."""
+    from app.core.metrics import start_event_loop_monitor
+    start_event_loop_monitor()
+
+
+@app.on_event("shutdown")
+async def shutdown_shared_clients() -> None:
+    """Fecha o pool HTTP compartilhado das integrações externas."""
+    from app.core.http_client import close_http_client
+    await close_http_client()
+
+
 # =============================================================================
 # Registro de Routers
 # =============================================================================
@@ -196,13 +240,39 @@ async def root() -> dict:
     }
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness_check() -> dict:
+    """Liveness: o processo responde (sem tocar dependências)."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["Health"])
 @app.get("/health", tags=["Health"])
-async def health_check() -> dict:
-    """Health check detalhado."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "redis": "connected",
-    }
+async def health_check() -> JSONResponse:
+    """
+    Readiness: probes concorrentes (banco, Redis, broker, storage) com
+    timeout e cache curto, mais a saturação do pool de conexões.
+    Retorna 503 quando o pod deve sair da rotação do balanceador.
+    """
+    from app.core.health import readiness_report
+
+    ready, report = await readiness_report()
+    return JSONResponse(status_code=200 if ready else 503, content=report)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> Response:
+    """
+    Métricas Prometheus (RED HTTP, pool do banco, cache, PDFs, APIs externas).
+    Exige `Authorization: Bearer <METRICS_TOKEN>` quando o token está configurado.
+    """
+    from app.core.metrics import render_latest
 
+    if settings.metrics_token and request.headers.get("Authorization") != f"Bearer {settings.metrics_token}":
+        return JSONResponse(
+            status_code=401,
+            content={"error": "UNAUTHORIZED", "message": "Token de métricas inválido.", "details": []},
+        )
 
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
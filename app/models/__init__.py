@@ -45,6 +45,9 @@ from app.models.show_crew import ShowCrew
 from app.models.show_execution_media import ShowExecutionMedia
 from app.models.saas_payment_log import SaaSPaymentLog
 from app.models.tenant_settings import TenantSettings
+from app.models.stored_object import StoredObject
+from app.models.tenant_storage_usage import TenantStorageUsage
+from app.models.outbox_message import OutboxDelivery, OutboxMessage, OutboxStatus
 from app.models.saas_catalog import (
     SaaS_Bundle,
     SaaS_Addon,
@@ -96,6 +99,11 @@ __all__ = [
     "ArtistCrew",
     "SaaSPaymentLog",
     "TenantSettings",
+    "StoredObject",
+    "TenantStorageUsage",
+    "OutboxDelivery",
+    "OutboxMessage",
+    "OutboxStatus",
     "SaaS_Bundle",
     "SaaS_Addon",
     "Tenant_Subscription_Log",
@@ -20,6 +20,15 @@ class ArtistCrew(Base, TenantMixin, TimestampMixin):
     base_diaria: Mapped[float] = mapped_column(Numeric(14, 2), default=0.00, comment="Valor padrão de diária")
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
+    # Contato (Information Push)
+    phone: Mapped[str | None] = mapped_column(String(20), nullable=True, comment="WhatsApp do membro")
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="Usuário do app (para Push FCM), se o membro tiver login",
+    )
+
     # Relacionamento
     artist: Mapped["Artist"] = relationship("Artist", back_populates="crew_members") # noqa: F821
 
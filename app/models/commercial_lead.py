@@ -9,7 +9,7 @@ import enum
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import Enum, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -35,6 +35,10 @@ class CommercialLead(TenantMixin, TimestampMixin, Base):
     """
 
     __tablename__ = "commercial_leads"
+    __table_args__ = (
+        # Funil: filtro por status, mais recentes primeiro
+        Index("ix_commercial_leads_tenant_status_created_at", "tenant_id", "status", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -19,7 +19,7 @@ import enum
 import uuid
 from datetime import date
 
-from sqlalchemy import Boolean, Date, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, Date, Enum, ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -98,6 +98,15 @@ class FinancialTransaction(TenantMixin, TimestampMixin, Base):
     """
 
     __tablename__ = "financial_transactions"
+    __table_args__ = (
+        # DRE/Cockpit: somas por show e tipo direto do índice (index-only scan)
+        Index(
+            "ix_financial_transactions_tenant_show_type",
+            "tenant_id", "show_id", "type",
+            postgresql_include=["budgeted_amount", "realized_amount"],
+        ),
+        Index("ix_financial_transactions_tenant_updated_at", "tenant_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
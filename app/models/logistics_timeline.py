@@ -10,7 +10,7 @@ notificações push para a equipe.
 
 import uuid
 
-from sqlalchemy import ForeignKey, String, Text, Time, Numeric
+from sqlalchemy import ForeignKey, Index, String, Text, Time, Numeric
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -26,6 +26,9 @@ class LogisticsTimeline(TenantMixin, TimestampMixin, Base):
     """
 
     __tablename__ = "logistics_timeline"
+    __table_args__ = (
+        Index("ix_logistics_timeline_tenant_updated_at", "tenant_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -0,0 +1,130 @@
+"""
+Manager Show — Model: OutboxMessage (Transactional Outbox)
+
+Mensagens de efeitos colaterais (WhatsApp, Push FCM) gravadas NA MESMA
+transação da mudança de negócio. Se a transação sofrer rollback, a
+mensagem some junto; se commitar, o relay (Celery Beat) garante a entrega.
+
+Ciclo de vida:
+    PENDENTE → DESPACHADA → ENTREGUE
+                    ↘ (falha) PENDENTE com backoff → ... → MORTA (dead-letter)
+
+Mensagens com vários destinatários (equipe inteira) registram cada entrega
+em outbox_deliveries: a nova tentativa só reenvia para quem falhou.
+"""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TenantMixin, TimestampMixin
+
+
+class OutboxStatus(str, enum.Enum):
+    """Situação de entrega da mensagem."""
+    PENDENTE = "PENDENTE"
+    DESPACHADA = "DESPACHADA"
+    ENTREGUE = "ENTREGUE"
+    MORTA = "MORTA"
+
+
+class OutboxMessage(TenantMixin, TimestampMixin, Base):
+    """Uma mensagem a ser entregue por um handler registrado para o `topic`."""
+
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # Índice parcial do relay: apenas mensagens ainda não entregues
+        Index(
+            "ix_outbox_messages_relay",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('PENDENTE', 'DESPACHADA')"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    topic: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Tipo do evento (ex.: daysheet.published)",
+    )
+    reference_id: Mapped[uuid.UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        nullable=True,
+        index=True,
+        comment="Entidade de origem (ex.: show_id) para consulta de status",
+    )
+    payload: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+    )
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus, name="outbox_status"),
+        default=OutboxStatus.PENDENTE,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    max_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=6,
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="Quando o relay pode (re)despachar a mensagem",
+    )
+    dispatched_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    delivered_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(topic={self.topic}, status={self.status}, attempts={self.attempts})>"
+
+
+class OutboxDelivery(Base):
+    """Entrega confirmada de uma mensagem a um destinatário (ex.: `push:<token>`)."""
+
+    __tablename__ = "outbox_deliveries"
+
+    message_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("outbox_messages.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    recipient: Mapped[str] = mapped_column(
+        String(512),
+        primary_key=True,
+        comment="Canal + destinatário (push:<fcm_token>, whatsapp:<crew_member_id>)",
+    )
+    delivered_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxDelivery(message_id={self.message_id}, recipient={self.recipient})>"
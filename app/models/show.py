@@ -24,6 +24,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Numeric,
     String,
     Text,
@@ -81,6 +82,13 @@ class Show(TenantMixin, TimestampMixin, Base):
     """
 
     __tablename__ = "shows"
+    __table_args__ = (
+        # Agenda (listagem/filtro por período) e agenda por artista
+        Index("ix_shows_tenant_date_show", "tenant_id", "date_show"),
+        Index("ix_shows_tenant_artist_date_show", "tenant_id", "artist_id", "date_show"),
+        # Sync incremental (pull por updated_at)
+        Index("ix_shows_tenant_updated_at", "tenant_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -10,7 +10,7 @@ Suporta dados offline-sync: os IDs chegam em batch do app mobile.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, func, Text
+from sqlalchemy import DateTime, ForeignKey, Index, func, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,6 +27,10 @@ class ShowCheckin(TenantMixin, Base):
     """
 
     __tablename__ = "show_checkins"
+    __table_args__ = (
+        # Check-in em batch: "este usuário já fez check-in neste show?"
+        Index("ix_show_checkins_show_user", "show_id", "user_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
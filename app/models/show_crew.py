@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import ForeignKey, Boolean, DateTime, func
+from sqlalchemy import ForeignKey, Boolean, DateTime, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base, TenantMixin
@@ -11,6 +11,10 @@ class ShowCrew(Base, TenantMixin):
     Rastreia se o membro da equipe visualizou o roteiro (Read Receipt).
     """
     __tablename__ = "show_crews"
+    __table_args__ = (
+        # Um vínculo por membro/show — permite UPSERT em lote no Information Push
+        UniqueConstraint("show_id", "crew_member_id", name="uq_show_crews_show_member"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     show_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("shows.id", ondelete="CASCADE"), nullable=False, index=True)
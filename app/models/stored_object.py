@@ -0,0 +1,74 @@
+"""
+Manager Show — Model: StoredObject (Índice de Conteúdo do Storage)
+
+Índice content-addressed dos arquivos enviados ao S3/Minio. Cada arquivo
+é identificado pelo SHA-256 do seu conteúdo dentro do bucket do tenant,
+de forma que o mesmo recibo reenviado pelo sync offline (ou o mesmo PDF
+de contrato subido duas vezes) seja armazenado uma única vez.
+
+O ref_count conta quantos registros de negócio apontam para o objeto
+(mantido pelo hook de flush em app/core/storage_refs.py). Objetos com
+ref_count <= 0 são removidos pelo Garbage Collector após a carência.
+"""
+
+import uuid
+
+from sqlalchemy import BigInteger, Index, Integer, String, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TenantMixin, TimestampMixin
+
+
+class StoredObject(TenantMixin, TimestampMixin, Base):
+    """
+    Objeto físico no bucket do tenant, endereçado pelo SHA-256.
+
+    Um mesmo digest só existe uma vez por tenant (UNIQUE tenant_id + sha256).
+    """
+
+    __tablename__ = "stored_objects"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "sha256", name="uq_stored_objects_tenant_sha256"),
+        # Índice parcial para o Garbage Collector (apenas objetos órfãos)
+        Index("ix_stored_objects_unreferenced", "updated_at", postgresql_where=text("ref_count <= 0")),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Digest SHA-256 (hex) do conteúdo",
+    )
+    bucket: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Bucket do tenant no Minio/S3",
+    )
+    object_key: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Chave do objeto dentro do bucket (sha256/ab/<digest>.ext)",
+    )
+    size_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+    )
+    content_type: Mapped[str | None] = mapped_column(
+        String(100),
+        nullable=True,
+    )
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Quantidade de registros que referenciam o objeto",
+    )
+
+    def __repr__(self) -> str:
+        return f"<StoredObject(sha256={self.sha256[:12]}, refs={self.ref_count})>"
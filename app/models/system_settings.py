@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy import String, Boolean
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
@@ -16,3 +16,8 @@ class SystemSettings(Base):
     evolution_api_key: Mapped[str] = mapped_column(String(255), nullable=True)
     evolution_instance_name: Mapped[str] = mapped_column(String(100), nullable=True)
     is_whatsapp_active: Mapped[bool] = mapped_column(Boolean, default=False)
+    tracing_policy: Mapped[dict | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Overrides da amostragem de traces (Sentry) — ver app/core/tracing.py",
+    )
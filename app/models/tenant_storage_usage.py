@@ -0,0 +1,55 @@
+"""
+Manager Show — Model: TenantStorageUsage (Ledger de Armazenamento)
+
+Contabilidade incremental dos bytes ocupados por cada tenant no Minio/S3.
+Atualizado a cada upload (novo objeto) e a cada remoção do Garbage
+Collector, permitindo checar a cota (Tenant.storage_limit_gb) em O(1)
+sem listar buckets. Uma reconciliação periódica corrige eventuais
+divergências comparando o ledger com a listagem real do bucket.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+
+class TenantStorageUsage(TimestampMixin, Base):
+    """Uma linha por tenant com o consumo atual de storage."""
+
+    __tablename__ = "tenant_storage_usage"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    used_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Bytes ocupados no bucket do tenant",
+    )
+    object_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    reconciled_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Última reconciliação com a listagem do bucket",
+    )
+    last_drift_bytes: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Diferença (bucket - ledger) encontrada na última reconciliação",
+    )
+
+    def __repr__(self) -> str:
+        return f"<TenantStorageUsage(tenant_id={self.tenant_id}, used_bytes={self.used_bytes})>"
@@ -9,7 +9,7 @@ Fluxo: ABERTO → EM_ATENDIMENTO → RESOLVIDO / FECHADO
 import enum
 import uuid
 
-from sqlalchemy import Enum, ForeignKey, String, Text
+from sqlalchemy import Enum, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -41,6 +41,15 @@ class Ticket(TimestampMixin, Base):
     """
 
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index("ix_tickets_tenant_status_created_at", "tenant_id", "status", "created_at"),
+        # Fila do Help Desk: apenas chamados ainda em aberto
+        Index(
+            "ix_tickets_open_queue",
+            "created_at",
+            postgresql_where=text("status IN ('ABERTO', 'EM_ATENDIMENTO')"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True),
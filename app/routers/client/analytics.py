@@ -6,7 +6,7 @@ from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CurrentUser, DbSession, TenantId
+from app.core.dependencies import CurrentUser, ReadDbSession, TenantId
 from app.core.tenant_filter import tenant_query
 from app.models.financial_transaction import FinancialTransaction, TransactionType
 from app.models.show import Show
@@ -34,7 +34,7 @@ class PerformanceDashboardResponse(BaseModel):
 @router.get("/performance/artists", response_model=PerformanceDashboardResponse)
 async def get_performance_by_artist(
     current_user: CurrentUser,
-    db: DbSession,
+    db: ReadDbSession,
     tenant_id: TenantId,
     start_date: date | None = None,
     end_date: date | None = None,
@@ -48,6 +48,15 @@ async def get_catalog(db: DbSession):
         ]
     }
 
+@router.get("/storage")
+async def get_storage_usage(
+    db: DbSession,
+    tenant_id: TenantId,
+    current_user: CurrentUser
+):
+    """Consumo de armazenamento do tenant frente ao limite do plano."""
+    return await StorageService.get_usage(db, tenant_id)
+
 @router.post("/buy-bundle")
 async def client_buy_bundle(
     req: PurchaseRequest,
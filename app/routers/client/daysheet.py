@@ -7,13 +7,24 @@ Timeline logística + finalização com notificação.
 import uuid
 
 from fastapi import APIRouter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from app.core.dependencies import CurrentUser, DbSession, TenantId
 from app.core.tenant_filter import tenant_query
 from app.exceptions import ShowNotFoundException
 from app.models.logistics_timeline import LogisticsTimeline
+from app.models.outbox_message import OutboxMessage
+from app.models.show_crew import ShowCrew
 from app.models.show import Show, ShowStatus
 from app.schemas.logistics_timeline import TimelineItemCreate, TimelineItemResponse
+from app.schemas.outbox import OutboxMessageResponse
+from app.schemas.show_crew import ShowCrewResponse
+from app.services.outbox_service import OutboxService
+from app.services.public_daysheet_service import PublicDaysheetService
+from app.services.read_receipt_service import ReadReceiptService
+from app.tasks.logistics import get_enrichment_status, schedule_timeline_enrichment
+from app.tasks.notifications import DAYSHEET_PUBLISHED_TOPIC
 
 router = APIRouter(prefix="/shows/{show_id}/daysheet", tags=["Client — Day Sheet"])
 
@@ -131,7 +142,13 @@ async def add_timeline_item(
     tenant_id: TenantId,
     current_user: CurrentUser,
 ) -> LogisticsTimeline:
-    """Adiciona um item à timeline do Day Sheet com inteligência climática."""
+    """
+    Adiciona um item à timeline do Day Sheet.
+
+    Retorna imediatamente: clima e rotas são preenchidos em background
+    (task enrich_show_timeline, com debounce por show). O cliente acompanha
+    via GET /daysheet/enrichment.
+    """
     # tenant_id injetado via dependência
 
     stmt = tenant_query(Show, tenant_id).where(Show.id == show_id)
@@ -140,27 +157,16 @@ async def add_timeline_item(
     if not show:
         raise ShowNotFoundException(show_id)
 
-    # Inicializar campos inteligentes
-    weather_data = {"temp": None, "condition": None}
-    
-    # 1. Busca Clima (Fase 27) - Se houver cidade definida
-    if show.location_city:
-        from app.services.logistics_service import LogisticsService
-        weather_data = await LogisticsService.get_weather_forecast(
-            show.location_city, 
-            show.date_show.isoformat()
-        )
-
     item = LogisticsTimeline(
         tenant_id=tenant_id,
         show_id=show_id,
-        weather_temp=weather_data["temp"],
-        weather_condition=weather_data["condition"],
         **payload.model_dump(),
     )
     db.add(item)
     await db.flush()
     await db.refresh(item)
+
+    schedule_timeline_enrichment(db, show_id, tenant_id)
     return item
 
 
@@ -192,9 +198,32 @@ async def update_timeline_item(
         
     await db.flush()
     await db.refresh(item)
+
+    # Título/ordem podem mudar os trechos de rota: reenriquece em background
+    schedule_timeline_enrichment(db, show_id, tenant_id)
     return item
 
 
+@router.get("/enrichment", summary="Timeline Enrichment Status")
+async def get_timeline_enrichment_status(
+    show_id: uuid.UUID,
+    db: DbSession,
+    tenant_id: TenantId,
+    current_user: CurrentUser,
+) -> dict:
+    """
+    Polling do enriquecimento em background (clima/rotas).
+    Estados: idle | pending | running | done | failed.
+    Quando `done`, o cliente recarrega o Day Sheet.
+    """
+    stmt = select(Show.id).where(Show.id == show_id, Show.tenant_id == tenant_id)
+    if not await db.scalar(stmt):
+        raise ShowNotFoundException(show_id)
+
+    status = await get_enrichment_status(show_id)
+    return {"show_id": str(show_id), **status}
+
+
 @router.post("/smart-sync", summary="Smart Logistics Sync", status_code=200)
 async def smart_sync_logistics(tenant_id: TenantId, 
     show_id: uuid.UUID,
@@ -205,6 +234,10 @@ async def smart_sync_logistics(tenant_id: TenantId,
     Sincronização Inteligente (Fase 27):
     - Calcula rotas (Google Maps) entre itens sequenciais.
     - Atualiza clima (OpenWeather) para todos os itens.
+
+    Enriquecimento em uma única passada: clima consultado uma vez por show,
+    todos os trechos resolvidos num Distance Matrix multi-origem/destino
+    (em paralelo com o clima) e UPDATE em lote das linhas da timeline.
     """
     # tenant_id injetado via dependência
     from app.services.logistics_service import LogisticsService
@@ -224,28 +257,9 @@ async def smart_sync_logistics(tenant_id: TenantId,
     tl_res = await db.execute(stmt_tl)
     items = tl_res.scalars().all()
 
-    # 2. Processamento em Lote
-    updated_count = 0
-    for i in range(len(items)):
-        item = items[i]
-        
-        # A) Atualiza Clima
-        weather = await LogisticsService.get_weather_forecast(show.location_city, show.date_show.isoformat())
-        item.weather_temp = weather["temp"]
-        item.weather_condition = weather["condition"]
-
-        # B) Calcula Rota (se houver um próximo item e for deslocamento)
-        if i < len(items) - 1:
-            next_item = items[i+1]
-            # Se o item atual ou o próximo for do tipo transporte/logística
-            if item.icon_type in ("flight", "van", "bus") or "Voo" in item.title or "Viagem" in item.title:
-                route = await LogisticsService.get_route_details(item.title, next_item.title)
-                item.route_distance = route["distance"]
-                item.route_duration = route["duration"]
-        
-        updated_count += 1
-
-    await db.flush()
+    # 2. Enriquecimento em lote (clima + rotas + UPDATE em lote)
+    updated_count = await LogisticsService.enrich_timeline(db, show, items)
+    PublicDaysheetService.schedule_rebuild(db, show_id)
 
     return {
         "show_id": str(show_id),
@@ -275,24 +289,81 @@ async def publish_daysheet(tenant_id: TenantId,
 
     # 2. Atualiza Status para EM_ESTRADA (Publicado)
     show.status = ShowStatus.EM_ESTRADA
-    await db.flush()
 
-    # 3. Disparo da Task Celery (Background)
-    try:
-        from app.tasks.notifications import notify_crew_about_daysheet
-        notify_crew_about_daysheet.delay(str(show_id), str(tenant_id))
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"Falha ao enfileirar task de notificação: {str(e)}")
-        # Não travamos a resposta se o worker falhar, mas logamos o erro
+    # 3. Evento no outbox (mesma transação): o relay entrega após o commit
+    message = await OutboxService.enqueue(
+        db,
+        tenant_id,
+        DAYSHEET_PUBLISHED_TOPIC,
+        {"show_id": str(show_id)},
+        reference_id=show_id,
+    )
 
     return {
         "show_id": str(show_id),
         "status": show.status.value,
-        "message": "Roteiro publicado e equipe notificada com sucesso!",
+        "notification_id": str(message.id),
+        "message": "Roteiro publicado! A equipe será notificada em instantes.",
     }
 
 
+@router.get(
+    "/notifications",
+    summary="Day Sheet Notification Status",
+    response_model=list[OutboxMessageResponse],
+)
+async def list_daysheet_notifications(
+    show_id: uuid.UUID,
+    db: DbSession,
+    tenant_id: TenantId,
+) -> list:
+    """Status de entrega das notificações disparadas para o show (mais recentes primeiro)."""
+    stmt = (
+        tenant_query(OutboxMessage, tenant_id)
+        .where(OutboxMessage.reference_id == show_id)
+        .order_by(OutboxMessage.created_at.desc())
+        .limit(50)
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+@router.get(
+    "/read-receipts",
+    summary="Day Sheet Read Receipts",
+    response_model=list[ShowCrewResponse],
+)
+async def list_read_receipts(
+    show_id: uuid.UUID,
+    db: DbSession,
+    tenant_id: TenantId,
+) -> list:
+    """
+    Quem da equipe já abriu o roteiro. Combina o estado persistido em
+    show_crews com as leituras ainda pendentes no Redis.
+    """
+    stmt = (
+        tenant_query(ShowCrew, tenant_id)
+        .where(ShowCrew.show_id == show_id)
+        .options(selectinload(ShowCrew.crew_member))
+    )
+    assignments = list((await db.execute(stmt)).scalars().all())
+    pending = await ReadReceiptService.merge_pending(assignments)
+
+    return [
+        ShowCrewResponse(
+            id=a.id,
+            show_id=a.show_id,
+            crew_member_id=a.crew_member_id,
+            read_receipt=a.read_receipt or a.id in pending,
+            read_at=a.read_at or pending.get(a.id),
+            member_name=a.crew_member.name if a.crew_member else None,
+            member_role=a.crew_member.role if a.crew_member else None,
+        )
+        for a in assignments
+    ]
+
+
 @router.post("/finalize", summary="Finalize Day Sheet", status_code=200)
 async def finalize_daysheet(tenant_id: TenantId, 
     show_id: uuid.UUID,
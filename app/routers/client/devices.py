@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Header, Depends, HTTPException
+from fastapi import APIRouter, Header, Depends, HTTPException, Query
 from sqlalchemy import select
 import uuid
 from datetime import datetime
@@ -79,3 +79,17 @@ async def unregister_device_token(
         await db.commit()
     
     return {"status": "success", "message": "Device token untracked."}
+
+@router.get("/push-metrics", status_code=200)
+async def get_push_metrics(
+    tenant_id: TenantId,
+    current_user: CurrentUser,
+    days: int = Query(7, ge=1, le=30),
+) -> dict:
+    """
+    Métricas diárias de entrega de Push (FCM) do escritório:
+    enviados, sucesso, falha e tokens mortos removidos.
+    """
+    from app.services.fcm_service import FCMService
+
+    return {"tenant_id": str(tenant_id), "days": await FCMService.get_metrics(tenant_id, days)}
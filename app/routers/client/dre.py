@@ -13,7 +13,7 @@ from dataclasses import asdict
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
 
-from app.core.dependencies import DbSession, TenantId
+from app.core.dependencies import ReadDbSession, TenantId
 from app.core.permissions import require_permissions
 from app.core.tenant_filter import tenant_query
 from app.exceptions import ShowNotFoundException
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/shows/{show_id}/dre", tags=["Client — DRE"])
 @router.get("/", summary="Get DRE")
 async def get_dre(tenant_id: TenantId, 
     show_id: uuid.UUID,
-    db: DbSession,
+    db: ReadDbSession,
     current_user: User = Depends(require_permissions("can_view_dre")),
 ) -> dict:
     """
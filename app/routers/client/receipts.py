@@ -2,17 +2,51 @@
 Manager Show — Router: Expense Receipts (Módulo 5/Fase 28)
 
 Gerencia o upload de fotos/arquivos de recibos para o S3.
+
+Storage content-addressed: o cliente pode calcular o SHA-256 do arquivo
+e consultar /receipts/claim ANTES de enviar os bytes. Reenvios do sync
+offline do mesmo recibo não geram nova transferência nem novo objeto.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException
+from pydantic import BaseModel, Field
+
 from app.core.dependencies import CurrentUser, DbSession, TenantId
+from app.exceptions import ManagerShowException, ResourceNotFoundException
 from app.services.s3_service import S3Service
 
 router = APIRouter(prefix="/receipts", tags=["Client — Receipts"])
 
+
+class ReceiptClaim(BaseModel):
+    """Digest do arquivo calculado no dispositivo."""
+    sha256: str = Field(..., min_length=64, max_length=64, pattern=r"^[0-9a-fA-F]{64}$")
+
+
+@router.post("/claim")
+async def claim_receipt(
+    data: ReceiptClaim,
+    db: DbSession,
+    tenant_id: TenantId,
+    current_user: CurrentUser,
+):
+    """
+    Short-circuit de upload: se o conteúdo já existe no storage do tenant,
+    retorna a URL (sem tocar no ref_count: a referência só conta quando a
+    URL é gravada num lançamento). 404 indica que o cliente deve seguir
+    com o upload normal.
+    """
+    url = await S3Service.claim_by_digest(db, tenant_id, data.sha256)
+    if not url:
+        raise ResourceNotFoundException("Arquivo", data.sha256)
+    return {"url": url, "deduplicated": True}
+
+
 @router.post("/upload", status_code=201)
-async def upload_receipt(tenant_id: TenantId, 
+async def upload_receipt(tenant_id: TenantId,
+    db: DbSession,
     file: UploadFile = File(...),
+    x_content_sha256: str | None = Header(None, alias="X-Content-SHA256"),
     current_user: CurrentUser = None,
 ):
     """
@@ -24,14 +58,19 @@ async def upload_receipt(tenant_id: TenantId,
     if file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail="Formato de arquivo não suportado. Use JPG, PNG ou PDF.")
 
-    # 2. Ler conteúdo e fazer upload
+    # 2. Ler conteúdo e fazer upload (deduplicado por SHA-256)
     try:
         content = await file.read()
-        file_url = await S3Service.upload_file(
+        file_url = await S3Service.upload_deduplicated(
+            db=db,
+            tenant_id=tenant_id,
             file_content=content,
             filename=file.filename,
-            content_type=file.content_type
+            content_type=file.content_type,
+            expected_digest=x_content_sha256,
         )
         return {"url": file_url}
+    except ManagerShowException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao fazer upload do arquivo: {str(e)}")
@@ -174,7 +174,9 @@ async def add_extra_expense(tenant_id: TenantId,
         validate_upload(receipt_file, MAX_FILE_SIZE_RECIBO)
         
         content = await receipt_file.read()
-        receipt_url = await S3Service.upload_file(
+        receipt_url = await S3Service.upload_deduplicated(
+            db=db,
+            tenant_id=tenant_id,
             file_content=content,
             filename=receipt_file.filename,
             content_type=receipt_file.content_type
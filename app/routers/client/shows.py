@@ -6,19 +6,22 @@ CRUD de shows com:
 - Cadastro on-the-fly de Contractor/Venue via objetos aninhados
 - Filtros de negociação obrigatórios no Pydantic
 - Simulador de viabilidade (GET /shows/simulate)
+- Calendário: mês/ano, intervalo (from/to) e visões semana/mês como
+  intervalos de date_show (usam o índice tenant_id + date_show)
 - Filtro obrigatório por tenant_id
 """
 
 import uuid
+from datetime import date, timedelta
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, Query, Request, File, UploadFile
 from sqlalchemy import func, select
 from app.core.limiter import limiter
 
-from app.core.dependencies import CurrentUser, DbSession, TenantId
+from app.core.dependencies import CurrentUser, DbSession, ReadDbSession, TenantId
 from app.core.permissions import require_permissions
-from app.exceptions import ShowNotFoundException
+from app.exceptions import InvalidDateRangeException, MonthWithoutYearException, ShowNotFoundException
 from app.models.contractor import Contractor
 from app.models.show import Show
 from app.models.venue import Venue
@@ -88,29 +91,82 @@ async def create_show(
     return show
 
 
+def _month_range(year: int, month: int) -> tuple[date, date]:
+    start = date(year, month, 1)
+    return start, date(year + month // 12, month % 12 + 1, 1)
+
+
+def calendar_range(
+    year: int | None = None,
+    month: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    view: str | None = None,
+    anchor: date | None = None,
+) -> tuple[date | None, date | None]:
+    """
+    Converte os filtros de calendário num intervalo semiaberto [início, fim)
+    de date_show — predicado sargável, ao contrário de extract(month/year).
+
+    Filtros combinados são intersectados; mês sem ano é rejeitado (422).
+    """
+    bounds: list[tuple[date | None, date | None]] = []
+    today = date.today()
+
+    if month and not year:
+        raise MonthWithoutYearException(month)
+    if month:
+        bounds.append(_month_range(year, month))
+    elif year:
+        bounds.append((date(year, 1, 1), date(year + 1, 1, 1)))
+
+    if view:
+        reference = anchor or today
+        if view == "week":
+            monday = reference - timedelta(days=reference.weekday())
+            bounds.append((monday, monday + timedelta(days=7)))
+        else:
+            bounds.append(_month_range(reference.year, reference.month))
+
+    if date_from and date_to and date_from > date_to:
+        raise InvalidDateRangeException(date_from.isoformat(), date_to.isoformat())
+    if date_from or date_to:
+        bounds.append((date_from, date_to + timedelta(days=1) if date_to else None))
+
+    start = max((s for s, _ in bounds if s), default=None)
+    end = min((e for _, e in bounds if e), default=None)
+    return start, end
+
+
 @router.get("/", response_model=PaginatedResponse[ShowResponse])
 async def list_shows(
-    db: DbSession,
+    db: ReadDbSession,
     tenant_id: TenantId,
     current_user: CurrentUser, # CORREÇÃO
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status: str | None = Query(None, description="Filtrar por status"),
     artist_id: uuid.UUID | None = Query(None, description="Filtrar por artista"),
-    month: int | None = Query(None, ge=1, le=12, description="Mês do show"),
+    month: int | None = Query(None, ge=1, le=12, description="Mês do show (exige year)"),
     year: int | None = Query(None, ge=2020, description="Ano do show"),
+    date_from: date | None = Query(None, alias="from", description="Data inicial (inclusive)"),
+    date_to: date | None = Query(None, alias="to", description="Data final (inclusive)"),
+    view: str | None = Query(None, pattern="^(week|month)$", description="Visão do calendário: week ou month"),
+    anchor: date | None = Query(None, description="Data de referência da visão (padrão: hoje)"),
 ) -> dict:
-    """Lista shows do tenant com paginação e filtros opcionais."""
+    """Lista shows do tenant com paginação e filtros opcionais (inclusive de calendário)."""
     filters = [Show.tenant_id == tenant_id]
 
     if status:
         filters.append(Show.status == status)
     if artist_id:
         filters.append(Show.artist_id == artist_id)
-    if month:
-        filters.append(func.extract("month", Show.date_show) == month)
-    if year:
-        filters.append(func.extract("year", Show.date_show) == year)
+
+    start, end = calendar_range(year, month, date_from, date_to, view, anchor)
+    if start:
+        filters.append(Show.date_show >= start)
+    if end:
+        filters.append(Show.date_show < end)
 
     # --- Filtro de Visibilidade (Nível 3: Escopo de Artista) ---
     if not current_user.has_global_artist_access:
@@ -302,6 +358,11 @@ async def update_show(
 
     await db.flush()
     await db.refresh(show)
+
+    # Cidade/UF/data/artista aparecem no roteiro público (Smart Share)
+    if update_data.keys() & {"location_city", "location_uf", "date_show", "artist_id"}:
+        from app.services.public_daysheet_service import PublicDaysheetService
+        PublicDaysheetService.schedule_rebuild(db, show_id)
     return show
 @router.post("/{show_id}/execution-media", status_code=201)
 async def upload_execution_media(
@@ -336,7 +397,9 @@ async def upload_execution_media(
                 continue
 
             content = await file.read()
-            url = await S3Service.upload_file(
+            url = await S3Service.upload_deduplicated(
+                db=db,
+                tenant_id=tenant_id,
                 file_content=content,
                 filename=file.filename,
                 content_type=file.content_type
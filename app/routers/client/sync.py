@@ -16,6 +16,7 @@ from app.models.show import Show
 from app.models.logistics_timeline import LogisticsTimeline
 from app.models.show_checkin import ShowCheckin
 from app.models.financial_transaction import FinancialTransaction
+from app.services.public_daysheet_service import PublicDaysheetService
 
 router = APIRouter(prefix="/sync", tags=["Client — Sync (Offline-First)"])
 
@@ -77,6 +78,9 @@ async def push_changes(
         "financial_transactions": FinancialTransaction
     }
 
+    # Shows cujo roteiro público precisa ser reconstruído após o commit
+    touched_shows: set[uuid.UUID] = set()
+
     for table_name, model in tables.items():
         if table_name not in changes:
             continue
@@ -103,6 +107,11 @@ async def push_changes(
                 # Insert
                 new_record = model(**record)
                 db.add(new_record)
+
+            if model is LogisticsTimeline:
+                touched_shows.add(existing.show_id if existing else new_record.show_id)
+            elif model is Show:
+                touched_shows.add(record_id)
         
         # 2. Tratar Deleções (Se o ID vier na lista de deletados)
         for record_id_str in table_changes.deleted:
@@ -111,7 +120,12 @@ async def push_changes(
             result = await db.execute(stmt)
             existing = result.scalar_one_or_none()
             if existing:
+                if model is LogisticsTimeline:
+                    touched_shows.add(existing.show_id)
                 await db.delete(existing)
         
     await db.commit()
+
+    for show_id in touched_shows:
+        PublicDaysheetService.schedule_rebuild(db, show_id)
     return {"status": "ok", "message": "Sincronização concluída com sucesso."}
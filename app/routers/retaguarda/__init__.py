@@ -22,6 +22,8 @@ from app.routers.retaguarda.plans import router as plans_router
 from app.routers.retaguarda.finance import router as finance_router
 from app.routers.retaguarda.audit import router as audit_router
 from app.routers.retaguarda.billing import router as billing_router
+from app.routers.retaguarda.outbox import router as outbox_router
+from app.routers.retaguarda.slow_queries import router as slow_queries_router
 
 router = APIRouter(prefix="/api/v1/retaguarda", tags=["Retaguarda"])
 
@@ -35,3 +37,5 @@ router.include_router(plans_router)
 router.include_router(finance_router)
 router.include_router(audit_router)
 router.include_router(billing_router)
+router.include_router(outbox_router)
+router.include_router(slow_queries_router)
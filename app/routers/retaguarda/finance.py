@@ -6,7 +6,7 @@ Métricas financeiras globais e faturamento via Asaas.
 
 from fastapi import APIRouter, Depends
 from app.core.auth import get_current_super_admin
-from app.core.dependencies import DbSession
+from app.core.dependencies import GlobalReadDbSession
 from sqlalchemy import select, func
 from app.models.tenant import Tenant, TenantStatus
 
@@ -17,7 +17,7 @@ router = APIRouter(
 )
 
 @router.get("/dashboard")
-async def get_finance_dashboard(db: DbSession):
+async def get_finance_dashboard(db: GlobalReadDbSession):
     """Retorna métricas MRR, Ativos e Churn."""
     # Simulação de cálculo de MRR baseada em planos (exemplo simplificado)
     # MRR = Sum(plan.price) for all active tenants
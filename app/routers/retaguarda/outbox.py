@@ -0,0 +1,71 @@
+"""
+Manager Show — Router: Outbox (Retaguarda)
+
+Monitoramento da fila transacional de notificações e reprocessamento
+do dead-letter (mensagens que esgotaram as tentativas).
+"""
+
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+
+from app.core.auth import get_current_super_admin
+from app.core.dependencies import DbSession
+from app.exceptions import ResourceNotFoundException
+from app.models.outbox_message import OutboxMessage, OutboxStatus
+from app.schemas.common import PaginatedResponse
+from app.schemas.outbox import OutboxMessageResponse
+from app.services.outbox_service import OutboxService
+
+router = APIRouter(
+    prefix="/outbox",
+    tags=["Retaguarda — Outbox"],
+    dependencies=[Depends(get_current_super_admin)]
+)
+
+
+@router.get("", response_model=PaginatedResponse[OutboxMessageResponse])
+async def list_outbox_messages(
+    db: DbSession,
+    status: OutboxStatus | None = Query(None, description="Ex.: MORTA para o dead-letter"),
+    topic: str | None = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+) -> dict:
+    """Lista mensagens do outbox com filtros e paginação."""
+    filters = []
+    if status:
+        filters.append(OutboxMessage.status == status)
+    if topic:
+        filters.append(OutboxMessage.topic == topic)
+
+    count_stmt = select(func.count()).select_from(OutboxMessage).where(*filters)
+    total = (await db.execute(count_stmt)).scalar() or 0
+
+    stmt = (
+        select(OutboxMessage)
+        .where(*filters)
+        .order_by(OutboxMessage.created_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    result = await db.execute(stmt)
+
+    return {
+        "items": result.scalars().all(),
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size
+    }
+
+
+@router.post("/{message_id}/requeue", response_model=OutboxMessageResponse)
+async def requeue_outbox_message(message_id: uuid.UUID, db: DbSession):
+    """Devolve uma mensagem do dead-letter para a fila (tentativas zeradas)."""
+    message = await db.get(OutboxMessage, message_id)
+    if not message or message.status != OutboxStatus.MORTA:
+        raise ResourceNotFoundException("Mensagem no dead-letter", message_id)
+
+    return await OutboxService.requeue(db, message)
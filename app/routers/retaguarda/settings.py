@@ -7,8 +7,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_super_admin
 from app.database import get_db
+from app.core.tracing import SamplingPolicy
 from app.models.system_settings import SystemSettings
+from app.schemas.system_settings import TracingPolicyResponse, TracingPolicyUpdate
 from app.services.evolution_api_service import EvolutionApiService
+from app.services.system_settings_service import SystemSettingsService
 
 router = APIRouter(
     prefix="/settings",
@@ -18,10 +21,11 @@ router = APIRouter(
 
 @router.get("/whatsapp")
 async def get_whatsapp_settings(db: AsyncSession = Depends(get_db)):
-    """Busca as configurações de WhatsApp e o status atual da instância."""
-    stmt = select(SystemSettings).limit(1)
-    result = await db.execute(stmt)
-    settings = result.scalar_one_or_none()
+    """
+    Busca as configurações de WhatsApp e o status atual da instância.
+    Configuração e status vêm do cache (status publicado pelo poller).
+    """
+    settings = await SystemSettingsService.get_whatsapp_config(db)
 
     if not settings:
         return {
@@ -32,14 +36,15 @@ async def get_whatsapp_settings(db: AsyncSession = Depends(get_db)):
             "status": "NOT_CONFIGURED"
         }
 
-    status = await EvolutionApiService.get_connection_state(settings)
-    
+    state = await SystemSettingsService.get_instance_state(settings)
+
     return {
         "is_whatsapp_active": settings.is_whatsapp_active,
         "evolution_api_url": settings.evolution_api_url,
         "evolution_api_key": settings.evolution_api_key,
         "evolution_instance_name": settings.evolution_instance_name,
-        "status": status
+        "status": state["status"],
+        "status_checked_at": state["checked_at"],
     }
 
 @router.patch("/whatsapp")
@@ -59,30 +64,28 @@ async def update_whatsapp_settings(data: dict, db: AsyncSession = Depends(get_db
     settings.evolution_instance_name = data.get("evolution_instance_name", settings.evolution_instance_name)
 
     await db.commit()
+    await SystemSettingsService.invalidate()
     return {"message": "Configurações atualizadas com sucesso"}
 
 @router.post("/whatsapp/instance")
 async def create_whatsapp_instance(db: AsyncSession = Depends(get_db)):
     """Cria a instância na Evolution API."""
-    stmt = select(SystemSettings).limit(1)
-    result = await db.execute(stmt)
-    settings = result.scalar_one_or_none()
-    
+    settings = await SystemSettingsService.get_whatsapp_config(db)
+
     if not settings:
         raise HTTPException(status_code=404, detail="Configurações não encontradas")
         
     success = await EvolutionApiService.create_instance(settings)
     if success:
+        await SystemSettingsService.refresh_instance_state(settings)
         return {"message": "Instância criada com sucesso"}
     raise HTTPException(status_code=400, detail="Falha ao criar instância")
 
 @router.get("/whatsapp/qrcode")
 async def get_whatsapp_qrcode(db: AsyncSession = Depends(get_db)):
     """Gera/Busca o QR Code para conexão."""
-    stmt = select(SystemSettings).limit(1)
-    result = await db.execute(stmt)
-    settings = result.scalar_one_or_none()
-    
+    settings = await SystemSettingsService.get_whatsapp_config(db)
+
     if not settings:
         raise HTTPException(status_code=404, detail="Configurações não encontradas")
         
@@ -94,14 +97,50 @@ async def get_whatsapp_qrcode(db: AsyncSession = Depends(get_db)):
 @router.post("/whatsapp/logout")
 async def logout_whatsapp_instance(db: AsyncSession = Depends(get_db)):
     """Desconecta a instância do WhatsApp."""
-    stmt = select(SystemSettings).limit(1)
-    result = await db.execute(stmt)
-    settings = result.scalar_one_or_none()
-    
+    settings = await SystemSettingsService.get_whatsapp_config(db)
+
     if not settings:
         raise HTTPException(status_code=404, detail="Configurações não encontradas")
         
     success = await EvolutionApiService.logout(settings)
     if success:
+        await SystemSettingsService.refresh_instance_state(settings)
         return {"message": "Desconectado com sucesso"}
     raise HTTPException(status_code=400, detail="Falha ao desconectar")
+
+def _tracing_response(overrides: dict | None) -> TracingPolicyResponse:
+    policy = SamplingPolicy.from_overrides(overrides)
+    return TracingPolicyResponse(
+        default_rate=policy.default_rate,
+        candidate_rate=policy.candidate_rate,
+        slow_threshold_ms=policy.slow_threshold_ms,
+        profiles_rate=policy.profiles_rate,
+        route_rates=policy.route_rates,
+        tenant_rates=policy.tenant_rates,
+        overrides=overrides or {},
+    )
+
+@router.get("/tracing", response_model=TracingPolicyResponse)
+async def get_tracing_policy(db: AsyncSession = Depends(get_db)):
+    """Política efetiva de amostragem de traces/profiles do Sentry."""
+    settings = (await db.execute(select(SystemSettings).limit(1))).scalar_one_or_none()
+    return _tracing_response(settings.tracing_policy if settings else None)
+
+@router.put("/tracing", response_model=TracingPolicyResponse)
+async def update_tracing_policy(data: TracingPolicyUpdate, db: AsyncSession = Depends(get_db)):
+    """
+    Substitui os overrides da amostragem. API e workers aplicam a nova
+    política em até 30s, sem restart.
+    """
+    stmt = select(SystemSettings).limit(1)
+    settings = (await db.execute(stmt)).scalar_one_or_none()
+
+    if not settings:
+        settings = SystemSettings()
+        db.add(settings)
+
+    settings.tracing_policy = data.model_dump(mode="json", exclude_none=True) or None
+
+    await db.commit()
+    overrides = await SystemSettingsService.publish_tracing_policy(db)
+    return _tracing_response(overrides)
@@ -0,0 +1,35 @@
+"""
+Manager Show — Router: Queries Lentas (Retaguarda)
+
+Ranking dos statements lentos registrados pelo hook de cursor
+(app/core/slow_queries.py), com o plano amostrado dos outliers.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core import slow_queries
+from app.core.auth import get_current_super_admin
+from app.schemas.slow_query import SlowQueryResponse
+
+router = APIRouter(
+    prefix="/slow-queries",
+    tags=["Retaguarda — Queries Lentas"],
+    dependencies=[Depends(get_current_super_admin)]
+)
+
+
+@router.get("", response_model=list[SlowQueryResponse])
+async def list_slow_queries(
+    limit: int = Query(20, ge=1, le=100),
+    order_by: Literal["total", "max"] = Query("total", description="Tempo total acumulado ou pior execução"),
+) -> list[dict]:
+    """Top ofensores por tempo total (ou máximo) acumulado."""
+    return await slow_queries.top_offenders(limit, order_by)
+
+
+@router.delete("", status_code=204)
+async def reset_slow_queries() -> None:
+    """Zera o ranking (ex.: após criar índices)."""
+    await slow_queries.reset()
@@ -9,6 +9,8 @@ class ArtistCrewBase(BaseModel):
     base_cache: Decimal = Field(default=Decimal("0.00"))
     base_diaria: Decimal = Field(default=Decimal("0.00"))
     is_active: bool = True
+    phone: str | None = Field(None, max_length=20)
+    user_id: UUID | None = None
 
 class ArtistCrewCreate(ArtistCrewBase):
     pass
@@ -19,6 +21,8 @@ class ArtistCrewUpdate(BaseModel):
     base_cache: Decimal | None = None
     base_diaria: Decimal | None = None
     is_active: bool | None = None
+    phone: str | None = Field(None, max_length=20)
+    user_id: UUID | None = None
 
 class ArtistCrewResponse(ArtistCrewBase):
     id: UUID
@@ -0,0 +1,28 @@
+"""
+Manager Show — Schemas: Outbox (Pydantic V2)
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.outbox_message import OutboxStatus
+
+
+class OutboxMessageResponse(BaseModel):
+    """Status de entrega de uma mensagem do outbox."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    tenant_id: UUID
+    topic: str
+    reference_id: UUID | None
+    status: OutboxStatus
+    attempts: int
+    max_attempts: int
+    next_attempt_at: datetime
+    dispatched_at: datetime | None
+    delivered_at: datetime | None
+    last_error: str | None
+    created_at: datetime
@@ -0,0 +1,20 @@
+"""
+Manager Show — Schemas: Queries Lentas (Pydantic V2)
+"""
+
+from pydantic import BaseModel
+
+
+class SlowQueryResponse(BaseModel):
+    """Formato de statement lento agregado (SQL normalizado, sem valores)."""
+    id: str
+    sql: str
+    params: str | None
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_tenant: str | None
+    last_origin: str | None
+    last_seen: str | None
+    plan: str | None = None
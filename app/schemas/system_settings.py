@@ -1,6 +1,6 @@
 import uuid
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Annotated, Optional
 
 class SystemSettingsBase(BaseModel):
     evolution_api_url: Optional[str] = None
@@ -16,3 +16,24 @@ class SystemSettingsResponse(SystemSettingsBase):
 
     class Config:
         from_attributes = True
+
+
+class TracingPolicyUpdate(BaseModel):
+    """Overrides da amostragem de traces; campos omitidos mantêm o padrão do ambiente."""
+    default_rate: Optional[float] = Field(None, ge=0, le=1)
+    candidate_rate: Optional[float] = Field(None, ge=0, le=1)
+    slow_threshold_ms: Optional[int] = Field(None, ge=0)
+    profiles_rate: Optional[float] = Field(None, ge=0, le=1)
+    route_rates: Optional[dict[str, Annotated[float, Field(ge=0, le=1)]]] = None
+    tenant_rates: Optional[dict[uuid.UUID, Annotated[float, Field(ge=0, le=1)]]] = None
+
+
+class TracingPolicyResponse(BaseModel):
+    """Política efetiva (padrões do ambiente + overrides salvos)."""
+    default_rate: float
+    candidate_rate: float
+    slow_threshold_ms: int
+    profiles_rate: float
+    route_rates: dict[str, float]
+    tenant_rates: dict[str, float]
+    overrides: dict
@@ -1,6 +1,7 @@
 import httpx
 import logging
 from typing import Optional, Dict, Any
+from app.core.http_client import get_http_client
 from app.models.system_settings import SystemSettings
 
 logger = logging.getLogger(__name__)
@@ -19,24 +20,24 @@ class EvolutionApiService:
         headers = {"apikey": settings.evolution_api_key}
 
         try:
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                response = await client.get(url, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # A Evolution API v2 retorna {"instance": {"state": "open"...}}
-                    raw_state = data.get("instance", {}).get("state", "close").lower()
-                    
-                    if raw_state == "open":
-                        return "CONNECTED"
-                    elif raw_state in ("close", "connecting", "refused"):
-                        return "DISCONNECTED"
+            # Poll frequente (health da instância): usa o pool compartilhado e instrumentado
+            response = await get_http_client().get(url, headers=headers, timeout=3.0)
+
+            if response.status_code == 200:
+                data = response.json()
+                # A Evolution API v2 retorna {"instance": {"state": "open"...}}
+                raw_state = data.get("instance", {}).get("state", "close").lower()
+
+                if raw_state == "open":
+                    return "CONNECTED"
+                elif raw_state in ("close", "connecting", "refused"):
                     return "DISCONNECTED"
-                elif response.status_code == 404:
-                    return "NOT_FOUND"
-                else:
-                    logger.error(f"Erro Evolution API ConnectionState ({response.status_code}): {response.text}")
-                    return "ERROR"
+                return "DISCONNECTED"
+            elif response.status_code == 404:
+                return "NOT_FOUND"
+            else:
+                logger.error(f"Erro Evolution API ConnectionState ({response.status_code}): {response.text}")
+                return "ERROR"
         except httpx.TimeoutException:
             logger.warning(f"Timeout na Evolution API ao buscar status: {settings.evolution_instance_name}")
             return "ERROR"
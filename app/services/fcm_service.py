@@ -1,12 +1,21 @@
 import firebase_admin # type: ignore
 from firebase_admin import credentials, messaging # type: ignore
 from app.config import get_settings
+import asyncio
 import logging
+import uuid
+from datetime import date, timedelta
 
 settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
+# Limite de tokens por chamada multicast do FCM
+MULTICAST_MAX_TOKENS = 500
+# Erros que indicam token morto (app desinstalado, token de outro projeto)
+DEAD_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+METRICS_TTL = 35 * 24 * 60 * 60
+
 class FCMService:
     """
     Manager Show — Firebase Cloud Messaging Service
@@ -69,7 +78,10 @@ class FCMService:
 
     @classmethod
     def send_multicast_notification(cls, tokens: list[str], title: str, body: str, data: dict | None = None, dry_run: bool = False):
-        """Dispara um Push de forma otimizada para várias pessoas ao mesmo tempo."""
+        """
+        Dispara um Push de forma otimizada para várias pessoas ao mesmo tempo.
+        Legado (síncrono, sem limpeza de tokens): prefira `send_batch`/`push_to_tenant`.
+        """
         if not tokens:
             return None
             
@@ -93,3 +105,162 @@ class FCMService:
         except Exception as e:
             logger.error(f"FCM Service: Error sending Multicast Push message: {e}")
             return None
+
+    # =========================================================================
+    # Envio em lote (async) com limpeza de tokens mortos e métricas
+    # =========================================================================
+
+    @classmethod
+    def _send_chunk(cls, tokens: list[str], title: str, body: str, data: dict | None, dry_run: bool) -> dict:
+        """
+        Uma chamada multicast (<= 500 tokens) com análise por token.
+        `failed_tokens`: falhas transitórias (reenviáveis); tokens mortos à parte.
+        """
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(title=title, body=body),
+            data=data or {},
+            tokens=tokens,
+        )
+        try:
+            response = messaging.send_each_for_multicast(message, dry_run=dry_run)
+        except Exception as e:
+            logger.error(f"FCM Service: Error sending batch of {len(tokens)} tokens: {e}")
+            return {"success": 0, "failure": len(tokens), "dead_tokens": [], "failed_tokens": list(tokens)}
+
+        dead_tokens = []
+        failed_tokens = []
+        for token, resp in zip(tokens, response.responses):
+            if resp.success:
+                continue
+            if isinstance(resp.exception, DEAD_TOKEN_ERRORS):
+                dead_tokens.append(token)
+            else:
+                failed_tokens.append(token)
+
+        return {
+            "success": response.success_count,
+            "failure": response.failure_count,
+            "dead_tokens": dead_tokens,
+            "failed_tokens": failed_tokens,
+        }
+
+    @classmethod
+    async def send_batch(
+        cls,
+        tokens: list[str],
+        title: str,
+        body: str,
+        data: dict | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Envia a mesma notificação para todos os tokens de um evento, agrupando
+        em chamadas de até 500 tokens (em paralelo, SDK síncrono em threads).
+
+        Retorna {"success", "failure", "dead_tokens", "failed_tokens"} consolidado.
+        """
+        tokens = list(dict.fromkeys(tokens))
+        result = {"success": 0, "failure": 0, "dead_tokens": [], "failed_tokens": []}
+        if not tokens:
+            return result
+
+        if not cls._initialized and not dry_run:
+            # Nada foi enviado: todos os tokens voltam como falha (reenviáveis)
+            logger.error("FCM Service: Cannot send batch push. Firebase is not initialized.")
+            result["failure"] = len(tokens)
+            result["failed_tokens"] = tokens
+            return result
+
+        chunks = [tokens[i:i + MULTICAST_MAX_TOKENS] for i in range(0, len(tokens), MULTICAST_MAX_TOKENS)]
+        partials = await asyncio.gather(
+            *(asyncio.to_thread(cls._send_chunk, chunk, title, body, data, dry_run) for chunk in chunks)
+        )
+        for partial in partials:
+            result["success"] += partial["success"]
+            result["failure"] += partial["failure"]
+            result["dead_tokens"].extend(partial["dead_tokens"])
+            result["failed_tokens"].extend(partial["failed_tokens"])
+
+        logger.info(
+            f"FCM Service: Batch push sent. Target {len(tokens)} devices in {len(chunks)} call(s). "
+            f"Success: {result['success']}, Failure: {result['failure']}, Dead: {len(result['dead_tokens'])}"
+        )
+        return result
+
+    @classmethod
+    async def push_to_tenant(
+        cls,
+        db,
+        tenant_id: uuid.UUID,
+        tokens: list[str],
+        title: str,
+        body: str,
+        data: dict | None = None,
+    ) -> dict:
+        """
+        Envio completo de um evento: lote FCM, remoção dos tokens mortos
+        em device_tokens (sem commit — transação do chamador) e métricas
+        de entrega do tenant.
+        """
+        from sqlalchemy import delete
+
+        from app.models.device_token import DeviceToken
+
+        cls.initialize()
+        result = await cls.send_batch(tokens, title, body, data)
+
+        if result["dead_tokens"]:
+            await db.execute(
+                delete(DeviceToken).where(
+                    DeviceToken.tenant_id == tenant_id,
+                    DeviceToken.fcm_token.in_(result["dead_tokens"]),
+                )
+            )
+            logger.info(f"FCM Service: {len(result['dead_tokens'])} dead token(s) pruned for tenant {tenant_id}.")
+
+        await cls.record_metrics(tenant_id, result)
+        return result
+
+    @staticmethod
+    def _metrics_key(tenant_id: uuid.UUID | str, day: date) -> str:
+        return f"fcm:metrics:{tenant_id}:{day.isoformat()}"
+
+    @classmethod
+    async def record_metrics(cls, tenant_id: uuid.UUID, result: dict) -> None:
+        """Contadores diários de entrega por tenant (Redis, 35 dias)."""
+        from app.redis import redis_client
+
+        key = cls._metrics_key(tenant_id, date.today())
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, "sent", result["success"] + result["failure"])
+                pipe.hincrby(key, "success", result["success"])
+                pipe.hincrby(key, "failure", result["failure"])
+                pipe.hincrby(key, "pruned", len(result["dead_tokens"]))
+                pipe.expire(key, METRICS_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"FCM Service: Failed to record delivery metrics: {e}")
+
+    @classmethod
+    async def get_metrics(cls, tenant_id: uuid.UUID, days: int = 7) -> list[dict]:
+        """Métricas diárias de entrega do tenant (mais recente primeiro)."""
+        from app.redis import redis_client
+
+        today = date.today()
+        day_list = [today - timedelta(days=i) for i in range(days)]
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for day in day_list:
+                pipe.hgetall(cls._metrics_key(tenant_id, day))
+            raw = await pipe.execute()
+
+        return [
+            {
+                "date": day.isoformat(),
+                "sent": int(counters.get("sent", 0)),
+                "success": int(counters.get("success", 0)),
+                "failure": int(counters.get("failure", 0)),
+                "pruned": int(counters.get("pruned", 0)),
+            }
+            for day, counters in zip(day_list, raw)
+        ]
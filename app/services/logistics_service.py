@@ -2,23 +2,200 @@
 Manager Show — Service: Logistics (Integração Google e OpenWeather)
 
 Este serviço gerencia chamadas externas para prover inteligência ao roteiro.
+
+Todas as consultas passam pelo cache Redis (app.core.cache) e usam o
+client HTTP pooled (app.core.http_client):
+- Clima: chave (cidade, dia) — fresco por 30 min, stale por mais 2h.
+- Rotas: chave (origem, destino) — fresco por 7 dias, stale por mais 7.
+- Falhas: cache negativo de 5 min (API fora do ar não custa o timeout
+  em todo GET de Day Sheet).
 """
 
-import httpx
+import asyncio
+import hashlib
+import logging
+import unicodedata
 from decimal import Decimal
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.config import get_settings
+from app.core.cache import get_many, get_or_fetch, store
+from app.core.http_client import get_http_client
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+WEATHER_TTL = 30 * 60
+WEATHER_STALE_TTL = 2 * 60 * 60
+ROUTE_TTL = 7 * 24 * 60 * 60
+ROUTE_STALE_TTL = 7 * 24 * 60 * 60
+NEGATIVE_TTL = 5 * 60
+
+# Limites do Distance Matrix por requisição server-side
+MATRIX_MAX_PLACES = 25
+MATRIX_MAX_ELEMENTS = 100
+
+EMPTY_ROUTE = {"distance": None, "duration": None}
+EMPTY_WEATHER = {"temp": None, "condition": None}
+
+
+def _normalize(value: str) -> str:
+    """Normaliza texto para chave de cache ('São Paulo ' -> 'sao paulo')."""
+    text = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode()
+    return " ".join(text.lower().split())
+
+
+def _is_empty(data: dict) -> bool:
+    return all(v is None for v in data.values())
+
 
 class LogisticsService:
+    @staticmethod
+    def weather_cache_key(city: str, date_str: str) -> str:
+        return f"logistics:weather:{_normalize(city)}:{(date_str or '')[:10]}"
+
+    @staticmethod
+    def route_cache_key(origin: str, destination: str) -> str:
+        digest = hashlib.sha1(f"{_normalize(origin)}|{_normalize(destination)}".encode()).hexdigest()
+        return f"logistics:route:{digest}"
+
     @staticmethod
     async def get_route_details(origin: str, destination: str) -> dict:
         """
         Consulta o Google Distance Matrix API para obter distância e tempo.
         """
         if not settings.google_maps_api_key or settings.google_maps_api_key == "":
-            return {"distance": None, "duration": None}
+            return dict(EMPTY_ROUTE)
+
+        return await get_or_fetch(
+            LogisticsService.route_cache_key(origin, destination),
+            lambda: LogisticsService._fetch_route(origin, destination),
+            ttl=ROUTE_TTL,
+            stale_ttl=ROUTE_STALE_TTL,
+            negative_ttl=NEGATIVE_TTL,
+            is_negative=_is_empty,
+        )
+
+    @staticmethod
+    async def get_routes_batch(legs: list[tuple[str, str]]) -> list[dict]:
+        """
+        Resolve vários trechos (origem, destino) de uma vez:
+        1. Lê todos os trechos do cache num único MGET.
+        2. Agrupa os misses em requisições multi-origem/multi-destino do
+           Distance Matrix (respeitando 25 locais e 100 elementos), executadas
+           em paralelo — uma timeline típica cabe numa única chamada.
+        3. Grava cada trecho no cache individualmente.
+
+        Retorna a lista de resultados na mesma ordem de `legs`.
+        """
+        if not legs:
+            return []
+        if not settings.google_maps_api_key or settings.google_maps_api_key == "":
+            return [dict(EMPTY_ROUTE) for _ in legs]
+
+        keys = [LogisticsService.route_cache_key(o, d) for o, d in legs]
+        results: list[dict | None] = await get_many(keys)
+
+        # Trechos repetidos na timeline são consultados uma única vez
+        pending: dict[tuple[str, str], list[int]] = {}
+        for idx, cached in enumerate(results):
+            if cached is None:
+                pending.setdefault(legs[idx], []).append(idx)
+
+        chunks = LogisticsService._chunk_matrix_legs(list(pending))
+        fetched = await asyncio.gather(*(LogisticsService._fetch_route_matrix(c) for c in chunks))
+
+        for chunk, chunk_results in zip(chunks, fetched):
+            for leg, route in zip(chunk, chunk_results):
+                for idx in pending[leg]:
+                    results[idx] = route
+                await store(
+                    LogisticsService.route_cache_key(*leg),
+                    route,
+                    ttl=ROUTE_TTL,
+                    stale_ttl=ROUTE_STALE_TTL,
+                    negative_ttl=NEGATIVE_TTL,
+                    is_negative=_is_empty,
+                )
+
+        return [r if r is not None else dict(EMPTY_ROUTE) for r in results]
+
+    @staticmethod
+    async def get_weather_forecast(city: str, date_str: str) -> dict:
+        """
+        Consulta o OpenWeather para obter previsão.
+        Nota: A API gratuita de 5 dias/3 horas é limitada.
+        Para simplificar, buscamos o 'current' se for hoje ou o 'forecast'.
+        """
+        if not settings.openweather_api_key or settings.openweather_api_key == "":
+            return dict(EMPTY_WEATHER)
+        if not city:
+            return dict(EMPTY_WEATHER)
+
+        return await get_or_fetch(
+            LogisticsService.weather_cache_key(city, date_str),
+            lambda: LogisticsService._fetch_weather(city),
+            ttl=WEATHER_TTL,
+            stale_ttl=WEATHER_STALE_TTL,
+            negative_ttl=NEGATIVE_TTL,
+            is_negative=_is_empty,
+        )
+
+    @staticmethod
+    async def enrich_timeline(db: AsyncSession, show, items: list) -> int:
+        """
+        Enriquece a timeline inteira de um show em uma única passada:
+        clima consultado uma vez por show, todos os trechos de deslocamento
+        resolvidos em lote (em paralelo com o clima) e UPDATE em lote das
+        linhas (executemany por chave primária). Retorna o nº de itens.
+        """
+        from app.models.logistics_timeline import LogisticsTimeline
 
+        if not items:
+            return 0
+
+        # Trechos de deslocamento (item atual -> próximo item)
+        legs: list[tuple[str, str]] = []
+        leg_item_ids = []
+        for item, next_item in zip(items, items[1:]):
+            # Se o item atual for do tipo transporte/logística
+            if item.icon_type in ("flight", "van", "bus") or "Voo" in item.title or "Viagem" in item.title:
+                legs.append((item.title, next_item.title))
+                leg_item_ids.append(item.id)
+
+        weather, routes = await asyncio.gather(
+            LogisticsService.get_weather_forecast(
+                show.location_city,
+                show.date_show.isoformat() if show.date_show else "",
+            ),
+            LogisticsService.get_routes_batch(legs),
+        )
+        route_by_item = dict(zip(leg_item_ids, routes))
+
+        rows = []
+        for item in items:
+            row = {
+                "id": item.id,
+                "weather_temp": weather["temp"],
+                "weather_condition": weather["condition"],
+            }
+            route = route_by_item.get(item.id)
+            if route:
+                row["route_distance"] = route["distance"]
+                row["route_duration"] = route["duration"]
+            rows.append(row)
+
+        await db.execute(update(LogisticsTimeline), rows)
+        return len(rows)
+
+    # =========================================================================
+    # Chamadas externas (sem cache)
+    # =========================================================================
+
+    @staticmethod
+    async def _fetch_route(origin: str, destination: str) -> dict:
         url = "https://maps.googleapis.com/maps/api/distancematrix/json"
         params = {
             "origins": origin,
@@ -29,33 +206,86 @@ class LogisticsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                data = response.json()
+            response = await get_http_client().get(url, params=params)
+            data = response.json()
+
+            if data["status"] == "OK":
+                element = data["rows"][0]["elements"][0]
+                if element["status"] == "OK":
+                    return {
+                        "distance": element["distance"]["text"],
+                        "duration": element["duration"]["text"]
+                    }
+        except Exception as e:
+            # Silently fail to not break the app workflow
+            logger.warning(f"Erro Google Maps: {str(e)}")
+
+        return dict(EMPTY_ROUTE)
+
+    @staticmethod
+    def _chunk_matrix_legs(legs: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+        """Agrupa trechos de forma que origens x destinos caibam numa requisição."""
+        chunks: list[list[tuple[str, str]]] = []
+        current: list[tuple[str, str]] = []
+        origins: set[str] = set()
+        destinations: set[str] = set()
+
+        for origin, destination in legs:
+            new_origins = origins | {origin}
+            new_destinations = destinations | {destination}
+            fits = (
+                len(new_origins) <= MATRIX_MAX_PLACES
+                and len(new_destinations) <= MATRIX_MAX_PLACES
+                and len(new_origins) * len(new_destinations) <= MATRIX_MAX_ELEMENTS
+            )
+            if current and not fits:
+                chunks.append(current)
+                current, new_origins, new_destinations = [], {origin}, {destination}
+            current.append((origin, destination))
+            origins, destinations = new_origins, new_destinations
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    async def _fetch_route_matrix(legs: list[tuple[str, str]]) -> list[dict]:
+        """Uma chamada ao Distance Matrix para vários trechos (lê só os pares pedidos)."""
+        origins = list(dict.fromkeys(o for o, _ in legs))
+        destinations = list(dict.fromkeys(d for _, d in legs))
+
+        url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+        params = {
+            "origins": "|".join(origins),
+            "destinations": "|".join(destinations),
+            "key": settings.google_maps_api_key,
+            "mode": "driving",
+            "language": "pt-BR"
+        }
+
+        try:
+            response = await get_http_client().get(url, params=params)
+            data = response.json()
 
-                if data["status"] == "OK":
-                    element = data["rows"][0]["elements"][0]
+            if data["status"] == "OK":
+                routes = []
+                for origin, destination in legs:
+                    element = data["rows"][origins.index(origin)]["elements"][destinations.index(destination)]
                     if element["status"] == "OK":
-                        return {
+                        routes.append({
                             "distance": element["distance"]["text"],
                             "duration": element["duration"]["text"]
-                        }
+                        })
+                    else:
+                        routes.append(dict(EMPTY_ROUTE))
+                return routes
         except Exception as e:
-            # Silently fail to not break the app workflow
-            print(f"Erro Google Maps: {str(e)}")
-        
-        return {"distance": None, "duration": None}
+            logger.warning(f"Erro Google Maps (matrix): {str(e)}")
 
-    @staticmethod
-    async def get_weather_forecast(city: str, date_str: str) -> dict:
-        """
-        Consulta o OpenWeather para obter previsão.
-        Nota: A API gratuita de 5 dias/3 horas é limitada. 
-        Para simplificar, buscamos o 'current' se for hoje ou o 'forecast'.
-        """
-        if not settings.openweather_api_key or settings.openweather_api_key == "":
-            return {"temp": None, "condition": None}
+        return [dict(EMPTY_ROUTE) for _ in legs]
 
+    @staticmethod
+    async def _fetch_weather(city: str) -> dict:
         url = "https://api.openweathermap.org/data/2.5/weather"
         params = {
             "q": f"{city},BR",
@@ -65,16 +295,15 @@ class LogisticsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                data = response.json()
+            response = await get_http_client().get(url, params=params)
+            data = response.json()
 
-                if response.status_code == 200:
-                    return {
-                        "temp": float(data["main"]["temp"]),
-                        "condition": data["weather"][0]["description"].capitalize()
-                    }
+            if response.status_code == 200:
+                return {
+                    "temp": float(data["main"]["temp"]),
+                    "condition": data["weather"][0]["description"].capitalize()
+                }
         except Exception as e:
-            print(f"Erro OpenWeather: {str(e)}")
-        
-        return {"temp": None, "condition": None}
+            logger.warning(f"Erro OpenWeather: {str(e)}")
+
+        return dict(EMPTY_WEATHER)
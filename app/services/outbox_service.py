@@ -0,0 +1,272 @@
+"""
+Manager Show — Service: Outbox (Entrega Confiável de Notificações)
+
+Implementa o padrão Transactional Outbox:
+- enqueue(): grava a mensagem na sessão do request (mesma transação da
+  mudança de negócio). O hot path da API nunca toca o broker.
+- relay_batch(): chamado pelo Celery Beat; reivindica um lote com
+  FOR UPDATE SKIP LOCKED, marca como DESPACHADA (contando a tentativa já
+  no commit do relay) e publica no Celery.
+- deliver(): executado pelo worker; trava a linha, roda o handler do
+  tópico e registra ENTREGUE ou agenda retry com backoff exponencial.
+  Esgotadas as tentativas, a mensagem vai para o dead-letter (MORTA).
+
+Entrega "exactly-once-ish": a linha travada durante a execução e o
+status checado antes do handler impedem entregas concorrentes/duplicadas;
+um crash do worker após o envio externo e antes do commit ainda pode
+gerar uma repetição (at-least-once nesse caso extremo).
+
+Mensagens para vários destinatários: o handler consulta `delivered()`,
+envia só aos pendentes, grava os sucessos com `record_delivery()` e
+levanta PartialDeliveryError com os que falharam. Os sucessos são
+mantidos e a nova tentativa reenvia apenas para os que falharam.
+"""
+
+import logging
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.outbox_message import OutboxDelivery, OutboxMessage, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+RELAY_BATCH_SIZE = 100
+# Mensagem despachada sem confirmação após esse prazo volta para o relay
+# (broker perdeu a mensagem ou o worker morreu no meio da entrega)
+DISPATCH_TIMEOUT = timedelta(minutes=5)
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+OutboxHandler = Callable[[AsyncSession, OutboxMessage], Awaitable[None]]
+
+
+class PartialDeliveryError(Exception):
+    """Parte dos destinatários falhou; as entregas registradas são preservadas."""
+
+    def __init__(self, failed: dict[str, str]):
+        self.failed = failed
+        sample = "; ".join(f"{recipient}: {error}" for recipient, error in list(failed.items())[:5])
+        super().__init__(f"{len(failed)} destinatário(s) com falha — {sample}")
+
+
+class OutboxService:
+    """Fila transacional de efeitos colaterais (WhatsApp, Push FCM)."""
+
+    _handlers: dict[str, OutboxHandler] = {}
+
+    @classmethod
+    def handler(cls, topic: str) -> Callable[[OutboxHandler], OutboxHandler]:
+        """
+        Registra o handler de um tópico. O handler recebe a sessão da
+        entrega (sem commitar) e a mensagem; exceção = falha com retry.
+        """
+        def decorator(func: OutboxHandler) -> OutboxHandler:
+            cls._handlers[topic] = func
+            return func
+        return decorator
+
+    @staticmethod
+    async def enqueue(
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        topic: str,
+        payload: dict,
+        reference_id: uuid.UUID | None = None,
+    ) -> OutboxMessage:
+        """Grava a mensagem na transação corrente (o commit é do chamador)."""
+        message = OutboxMessage(
+            tenant_id=tenant_id,
+            topic=topic,
+            payload=payload,
+            reference_id=reference_id,
+        )
+        db.add(message)
+        await db.flush()
+        return message
+
+    @staticmethod
+    async def dead_letter(
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        topic: str,
+        payload: dict,
+        error: str,
+        reference_id: uuid.UUID | None = None,
+    ) -> OutboxMessage:
+        """
+        Grava uma falha ocorrida fora do outbox (ex.: texto descartado pela
+        fila do WhatsApp) direto no dead-letter. O `requeue()` da Retaguarda
+        a entrega pelo handler do tópico. O commit é do chamador.
+        """
+        message = OutboxMessage(
+            tenant_id=tenant_id,
+            topic=topic,
+            payload=payload,
+            reference_id=reference_id,
+            status=OutboxStatus.MORTA,
+            last_error=error[:2000],
+        )
+        db.add(message)
+        await db.flush()
+        return message
+
+    @staticmethod
+    async def delivered(db: AsyncSession, message: OutboxMessage) -> set[str]:
+        """Destinatários que já receberam a mensagem em tentativas anteriores."""
+        stmt = select(OutboxDelivery.recipient).where(OutboxDelivery.message_id == message.id)
+        return set((await db.execute(stmt)).scalars().all())
+
+    @staticmethod
+    async def record_delivery(db: AsyncSession, message: OutboxMessage, recipients: list[str]) -> None:
+        """Registra entregas bem-sucedidas (idempotente por destinatário)."""
+        if not recipients:
+            return
+        stmt = pg_insert(OutboxDelivery).values(
+            [{"message_id": message.id, "recipient": recipient} for recipient in dict.fromkeys(recipients)]
+        )
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=["message_id", "recipient"]))
+
+    @staticmethod
+    async def relay_batch(db: AsyncSession, limit: int = RELAY_BATCH_SIZE) -> int:
+        """
+        Despacha um lote de mensagens vencidas para o Celery.
+        Retorna o nº de mensagens publicadas no broker.
+        """
+        from app.tasks.outbox import deliver_outbox_message
+
+        now = datetime.now(timezone.utc)
+        # Despachada sem confirmação e sem tentativas restantes: o worker
+        # morreu em todas (OOM, SIGKILL, time limit) → dead-letter
+        await db.execute(
+            update(OutboxMessage)
+            .where(
+                OutboxMessage.status == OutboxStatus.DESPACHADA,
+                OutboxMessage.next_attempt_at <= now,
+                OutboxMessage.attempts >= OutboxMessage.max_attempts,
+            )
+            .values(status=OutboxStatus.MORTA, last_error="Entrega não confirmada pelo worker (timeout de despacho)")
+        )
+
+        stmt = (
+            select(OutboxMessage.id)
+            .where(
+                OutboxMessage.status.in_([OutboxStatus.PENDENTE, OutboxStatus.DESPACHADA]),
+                OutboxMessage.next_attempt_at <= now,
+            )
+            .order_by(OutboxMessage.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list((await db.execute(stmt)).scalars().all())
+        if not ids:
+            return 0
+
+        await db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids))
+            .values(
+                status=OutboxStatus.DESPACHADA,
+                dispatched_at=now,
+                next_attempt_at=now + DISPATCH_TIMEOUT,
+                # Conta a tentativa antes do handler: um worker morto no meio
+                # da entrega não desfaz o incremento
+                attempts=OutboxMessage.attempts + 1,
+            )
+        )
+        # Commit antes de publicar: o worker só encontra a linha como DESPACHADA
+        await db.commit()
+
+        failed: list[uuid.UUID] = []
+        for message_id in ids:
+            try:
+                deliver_outbox_message.delay(str(message_id))
+            except Exception as e:
+                logger.error(f"[Outbox] Falha ao publicar mensagem {message_id} no broker: {str(e)}")
+                failed.append(message_id)
+
+        if failed:
+            # Devolve ao relay na próxima rodada (sem esperar o DISPATCH_TIMEOUT)
+            await db.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(failed), OutboxMessage.status == OutboxStatus.DESPACHADA)
+                .values(status=OutboxStatus.PENDENTE, next_attempt_at=now, attempts=OutboxMessage.attempts - 1)
+            )
+            await db.commit()
+
+        return len(ids) - len(failed)
+
+    @staticmethod
+    async def deliver(db: AsyncSession, message_id: uuid.UUID) -> OutboxStatus | None:
+        """
+        Entrega uma mensagem despachada. Retorna o status final, ou None se
+        a mensagem já foi entregue/está sendo entregue por outro worker.
+        """
+        stmt = (
+            select(OutboxMessage)
+            .where(OutboxMessage.id == message_id, OutboxMessage.status == OutboxStatus.DESPACHADA)
+            .with_for_update(skip_locked=True)
+        )
+        message = (await db.execute(stmt)).scalar_one_or_none()
+        if not message:
+            return None
+
+        # A tentativa já foi contada pelo relay_batch
+        handler = OutboxService._handlers.get(message.topic)
+        try:
+            if handler is None:
+                raise LookupError(f"Nenhum handler registrado para o tópico '{message.topic}'")
+            # Savepoint: escritas do handler são descartadas se ele falhar —
+            # exceto na falha parcial, que preserva as entregas já registradas
+            partial = None
+            async with db.begin_nested():
+                try:
+                    await handler(db, message)
+                except PartialDeliveryError as e:
+                    partial = e
+            if partial:
+                raise partial
+        except Exception as e:
+            OutboxService._schedule_retry(message, e)
+        else:
+            message.status = OutboxStatus.ENTREGUE
+            message.delivered_at = datetime.now(timezone.utc)
+            message.last_error = None
+
+        await db.flush()
+        return message.status
+
+    @staticmethod
+    def _schedule_retry(message: OutboxMessage, error: Exception) -> None:
+        """Backoff exponencial com jitter; esgotadas as tentativas → MORTA."""
+        message.last_error = f"{type(error).__name__}: {error}"[:2000]
+        if message.attempts >= message.max_attempts:
+            message.status = OutboxStatus.MORTA
+            logger.error(
+                f"[Outbox] Mensagem {message.id} ({message.topic}) movida para dead-letter "
+                f"após {message.attempts} tentativas: {message.last_error}"
+            )
+            return
+
+        delay = min(BACKOFF_BASE_SECONDS * 2 ** (message.attempts - 1), BACKOFF_MAX_SECONDS)
+        delay = delay * random.uniform(0.8, 1.2)
+        message.status = OutboxStatus.PENDENTE
+        message.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        logger.warning(
+            f"[Outbox] Falha na entrega {message.id} ({message.topic}), tentativa "
+            f"{message.attempts}/{message.max_attempts}. Retry em {int(delay)}s: {message.last_error}"
+        )
+
+    @staticmethod
+    async def requeue(db: AsyncSession, message: OutboxMessage) -> OutboxMessage:
+        """Reprocessa uma mensagem do dead-letter (zera as tentativas)."""
+        message.status = OutboxStatus.PENDENTE
+        message.attempts = 0
+        message.next_attempt_at = datetime.now(timezone.utc)
+        await db.flush()
+        return message
@@ -7,6 +7,8 @@ from fastapi import HTTPException
 
 from decimal import Decimal
 
+from app.core.metrics import observe_pdf_render
+
 # Configuração do Jinja2
 TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
 
@@ -52,7 +54,8 @@ class PDFService:
 
             # 2. Converte para PDF
             result = io.BytesIO()
-            pisa_status = pisa.CreatePDF(rendered_html, dest=result)
+            with observe_pdf_render("template"):
+                pisa_status = pisa.CreatePDF(rendered_html, dest=result)
             
             if pisa_status.err:
                 raise HTTPException(status_code=500, detail="Erro interno ao gerar o arquivo PDF dinâmico.")
@@ -63,13 +66,14 @@ class PDFService:
             raise HTTPException(status_code=500, detail=f"Erro no motor dinâmico de PDF: {str(e)}")
 
     @staticmethod
-    def generate_pdf(html_content: str) -> io.BytesIO:
+    def generate_pdf(html_content: str, document: str = "html") -> io.BytesIO:
         """
         Converte conteúdo HTML em PDF usando xhtml2pdf.
-        Retorna um stream de bytes.
+        Retorna um stream de bytes. `document` rotula a métrica de duração.
         """
         result = io.BytesIO()
-        pisa_status = pisa.CreatePDF(html_content, dest=result)
+        with observe_pdf_render(document):
+            pisa_status = pisa.CreatePDF(html_content, dest=result)
         
         if pisa_status.err:
             raise HTTPException(status_code=500, detail="Erro interno ao gerar o arquivo PDF.")
@@ -95,23 +99,23 @@ class PDFService:
     def get_contract_pdf(cls, show_data: dict) -> io.BytesIO:
         """Gera o PDF do contrato usando o template externo."""
         html = cls.render_template("contract_template.html", show_data)
-        return cls.generate_pdf(html)
+        return cls.generate_pdf(html, document="contract")
 
     @classmethod
     def get_daysheet_pdf(cls, show_data: dict, team: list) -> io.BytesIO:
         """Gera o PDF do Day Sheet usando o template externo."""
         context = {**show_data, "team": team}
         html = cls.render_template("daysheet_template.html", context)
-        return cls.generate_pdf(html)
+        return cls.generate_pdf(html, document="daysheet")
 
     @classmethod
     def get_availability_pdf(cls, context: dict) -> io.BytesIO:
         """Gera o PDF da Declaração de Disponibilidade."""
         html = cls.render_template("declaracao_disponibilidade.html", context)
-        return cls.generate_pdf(html)
+        return cls.generate_pdf(html, document="availability")
 
     @classmethod
     def get_proposal_pdf(cls, context: dict) -> io.BytesIO:
         """Gera o PDF da Carta Proposta Comercial."""
         html = cls.render_template("carta_proposta.html", context)
-        return cls.generate_pdf(html)
+        return cls.generate_pdf(html, document="proposal")
@@ -0,0 +1,165 @@
+"""
+Manager Show — Service: Day Sheet Público (Documento Pré-Computado)
+
+O roteiro compartilhado via Smart Share é aberto por toda a equipe ao
+mesmo tempo (festival = centenas de acessos no mesmo minuto). O documento
+público é montado UMA vez — quando a timeline muda (fim do enriquecimento),
+no smart-sync, no sync offline ou na publicação — e guardado no Redis já
+serializado, junto com sua versão (SHA-256 do corpo = ETag forte).
+
+O endpoint público vira uma única leitura no Redis; em miss, o documento
+é reconstruído (single-flight por processo, numa sessão própria) e gravado.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.metrics import record_cache_lookup
+from app.core.post_commit import after_commit, send_task
+from app.models.logistics_timeline import LogisticsTimeline
+from app.models.show import Show
+from app.redis import redis_client
+from app.services.logistics_service import LogisticsService
+
+logger = logging.getLogger(__name__)
+
+# Rede de segurança para alterações do show fora da timeline
+DOCUMENT_TTL = 60 * 60
+REBUILD_DEBOUNCE_SECONDS = 2
+CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _document_key(show_id: uuid.UUID | str) -> str:
+    return f"public:daysheet:{show_id}"
+
+
+class PublicDaysheetService:
+    @staticmethod
+    async def get(show_id: uuid.UUID) -> tuple[str, str] | None:
+        """
+        Retorna (etag, corpo JSON) do roteiro público, ou None se o show não
+        existir. Caminho quente: um único GET no Redis.
+
+        No miss, a reconstrução compartilhada entre os requests simultâneos
+        abre a própria sessão: ela sobrevive ao request que a iniciou (shield)
+        e não usa a sessão de nenhum deles.
+        """
+        try:
+            raw = await redis_client.get(_document_key(show_id))
+        except Exception as e:
+            logger.warning(f"[Public DaySheet] Redis indisponível: {e}")
+            raw = None
+        if raw:
+            record_cache_lookup(_document_key(show_id), "hit")
+            etag, _, body = raw.partition("\n")
+            return etag, body
+
+        record_cache_lookup(_document_key(show_id), "miss")
+        key = str(show_id)
+        task = _inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(PublicDaysheetService._rebuild_detached(show_id))
+            _inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: _inflight.pop(k, None))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _rebuild_detached(show_id: uuid.UUID) -> tuple[str, str] | None:
+        """Reconstrução do single-flight, em sessão dedicada."""
+        from app.database import async_session_factory
+
+        async with async_session_factory() as db:
+            return await PublicDaysheetService.rebuild(db, show_id)
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, show_id: uuid.UUID) -> tuple[str, str] | None:
+        """Monta o documento a partir do banco e grava no Redis."""
+        document = await PublicDaysheetService.build_document(db, show_id)
+        if document is None:
+            await PublicDaysheetService.invalidate(show_id)
+            return None
+
+        body = json.dumps(document, default=str, ensure_ascii=False, separators=(",", ":"))
+        etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+        try:
+            await redis_client.set(_document_key(show_id), f"{etag}\n{body}", ex=DOCUMENT_TTL)
+        except Exception as e:
+            logger.warning(f"[Public DaySheet] Falha ao gravar documento do show {show_id}: {e}")
+        return etag, body
+
+    @staticmethod
+    async def build_document(db: AsyncSession, show_id: uuid.UUID) -> dict | None:
+        """Show + artista (carregado explicitamente) + timeline + clima."""
+        stmt = select(Show).where(Show.id == show_id).options(selectinload(Show.artist))
+        show = (await db.execute(stmt)).scalar_one_or_none()
+        if not show:
+            return None
+
+        stmt_timeline = (
+            select(LogisticsTimeline)
+            .where(LogisticsTimeline.show_id == show_id)
+            .order_by(LogisticsTimeline.order, LogisticsTimeline.time)
+        )
+        timeline = (await db.execute(stmt_timeline)).scalars().all()
+
+        weather = await LogisticsService.get_weather_forecast(
+            show.location_city,
+            show.date_show.isoformat() if show.date_show else "",
+        )
+
+        return {
+            "show": {
+                "id": show.id,
+                "city": show.location_city,
+                "uf": show.location_uf,
+                "date": show.date_show,
+                "artist": show.artist.name if show.artist else "Artista",
+            },
+            "timeline": [
+                {
+                    "id": item.id,
+                    "time": item.time.strftime("%H:%M") if item.time else None,
+                    "title": item.title,
+                    "description": item.description or item.title,
+                    "type": item.icon_type,
+                    "route_distance": item.route_distance,
+                    "route_duration": item.route_duration,
+                } for item in timeline
+            ],
+            "weather": weather,
+            "generated_at": datetime.now(timezone.utc),
+        }
+
+    @staticmethod
+    async def invalidate(show_id: uuid.UUID) -> None:
+        try:
+            await redis_client.delete(_document_key(show_id))
+        except Exception as e:
+            logger.warning(f"[Public DaySheet] Falha ao invalidar show {show_id}: {e}")
+
+    @staticmethod
+    def schedule_rebuild(db: AsyncSession, show_id: uuid.UUID) -> None:
+        """
+        Reconstrói em background, agendado só depois do commit do request
+        (app.core.post_commit) — o countdown curto apenas agrupa edições.
+        Nunca propaga erro para a escrita do produtor.
+        """
+        from app.tasks.logistics import build_public_daysheet
+
+        async def _schedule() -> None:
+            try:
+                await send_task(build_public_daysheet, [str(show_id)], countdown=REBUILD_DEBOUNCE_SECONDS)
+            except Exception as e:
+                logger.error(f"[Public DaySheet] Falha ao agendar reconstrução do show {show_id}: {e}")
+
+        after_commit(db, _schedule)
@@ -0,0 +1,124 @@
+"""
+Manager Show — Service: Read Receipts (Smart Share)
+
+O pixel/link do roteiro público é aberto muitas vezes (a equipe reabre o
+link, apps de mensagem fazem prefetch). Em vez de um UPDATE + commit por
+acesso:
+- record(): valida o token (Redis, senão show_crews pelo índice único) e
+  grava só a PRIMEIRA leitura no Redis, marcando o token como pendente de
+  persistência num único script Lua (SET NX + SADD atômicos). Tokens
+  desconhecidos não escrevem nada: o pixel público não faz o Redis crescer.
+- flush(): task periódica grava os pendentes em show_crews num único
+  UPDATE em lote — o volume de escrita no banco independe do tráfego.
+- merge_pending(): o painel do produtor combina o estado do banco com as
+  leituras ainda não persistidas.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.show_crew import ShowCrew
+from app.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+PENDING_SET_KEY = "receipts:pending"
+# Mantém a primeira leitura bem além do intervalo do flush (fallback do painel)
+FIRST_READ_TTL = 7 * 24 * 60 * 60
+FLUSH_BATCH_SIZE = 1000
+
+# Primeira leitura + pendência de flush atômicas; retorna o horário registrado
+_RECORD_LUA = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    if ARGV[3] == '1' then
+        redis.call('SADD', KEYS[2], ARGV[4])
+    end
+    return ARGV[1]
+end
+return redis.call('GET', KEYS[1])
+"""
+
+_record_script = redis_client.register_script(_RECORD_LUA)
+
+
+def _first_read_key(token: uuid.UUID | str) -> str:
+    return f"receipts:first:{token}"
+
+
+class ReadReceiptService:
+    @staticmethod
+    async def record(db: AsyncSession, token: uuid.UUID) -> datetime | None:
+        """
+        Registra a leitura; retorna o horário da primeira leitura do token,
+        ou None se o token não pertence a nenhum vínculo.
+        """
+        key = _first_read_key(token)
+        first = await redis_client.get(key)
+        if first:
+            return datetime.fromisoformat(first)
+
+        stmt = select(ShowCrew.read_receipt, ShowCrew.read_at).where(ShowCrew.token == token)
+        assignment = (await db.execute(stmt)).first()
+        if assignment is None:
+            return None
+
+        # Já persistida: só cacheia o horário (evita o banco nas próximas aberturas)
+        pending = not assignment.read_receipt
+        read_at = assignment.read_at if not pending and assignment.read_at else datetime.now(timezone.utc)
+        first = await _record_script(
+            keys=[key, PENDING_SET_KEY],
+            args=[read_at.isoformat(), FIRST_READ_TTL, "1" if pending else "0", str(token)],
+        )
+        return datetime.fromisoformat(first)
+
+    @staticmethod
+    async def flush(db: AsyncSession, batch_size: int = FLUSH_BATCH_SIZE) -> int:
+        """
+        Persiste um lote de leituras pendentes (sem commit — do chamador).
+        Retorna o nº de tokens processados no lote.
+        """
+        tokens = await redis_client.spop(PENDING_SET_KEY, batch_size)
+        if not tokens:
+            return 0
+
+        try:
+            read_ats = await redis_client.mget([_first_read_key(t) for t in tokens])
+            rows = [
+                {"b_token": uuid.UUID(token), "b_read_at": datetime.fromisoformat(read_at)}
+                for token, read_at in zip(tokens, read_ats)
+                if read_at
+            ]
+            if rows:
+                table = ShowCrew.__table__
+                stmt = (
+                    update(table)
+                    .where(table.c.token == bindparam("b_token"), table.c.read_receipt.is_(False))
+                    .values(read_receipt=True, read_at=bindparam("b_read_at"))
+                )
+                await db.execute(stmt, rows)
+        except Exception:
+            # Devolve o lote para a próxima rodada
+            await redis_client.sadd(PENDING_SET_KEY, *tokens)
+            raise
+
+        return len(tokens)
+
+    @staticmethod
+    async def merge_pending(assignments: list[ShowCrew]) -> dict[uuid.UUID, datetime]:
+        """
+        Leituras ainda não persistidas dos vínculos informados
+        (apenas os que constam como não lidos no banco).
+        """
+        unread = [a for a in assignments if not a.read_receipt]
+        if not unread:
+            return {}
+        values = await redis_client.mget([_first_read_key(a.token) for a in unread])
+        return {
+            a.id: datetime.fromisoformat(value)
+            for a, value in zip(unread, values)
+            if value
+        }
@@ -1,21 +1,51 @@
 """
 Manager Show — Service: Cloud Storage (S3 / Minio)
+
+Dois modos de upload:
+- upload_file: chave aleatória (uuid4) no bucket global (legado).
+- upload_deduplicated: content-addressed (SHA-256) no bucket do tenant,
+  indexado em StoredObject com contagem de referências. O mesmo conteúdo
+  é transferido e armazenado uma única vez por tenant, e apenas objetos
+  novos consomem a cota do ledger (TenantStorageUsage).
+
+Upload e claim não contam referências: o ref_count acompanha as linhas
+que gravam a URL (app.core.storage_refs, hook de flush da sessão).
 """
 
+import hashlib
+import logging
 import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+
 from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.config import get_settings
+from app.core.metrics import instrument_s3_client
+from app.exceptions import ContentDigestMismatchException
+from app.models.stored_object import StoredObject
+from app.services.storage_service import StorageService
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Objetos órfãos só são apagados após este período (protege uploads em voo)
+GC_GRACE_PERIOD = timedelta(hours=24)
+# Limite do DeleteObjects da API S3
+S3_DELETE_BATCH = 1000
+
 
 class S3Service:
     @staticmethod
-    async def upload_file(file_content: bytes, filename: str, content_type: str | None = None) -> str:
-        """
-        Realiza o upload de um arquivo para o bucket S3 (Minio).
-        Retorna a URL pública/acesso do arquivo.
-        """
+    @asynccontextmanager
+    async def client():
+        """Cliente S3 (aiobotocore) configurado para o Minio, com latência medida."""
         session = get_session()
         async with session.create_client(
             's3',
@@ -25,9 +55,29 @@ class S3Service:
             aws_secret_access_key=settings.s3_secret_key,
             use_ssl=settings.s3_use_ssl,
         ) as client:
+            instrument_s3_client(client)
+            yield client
+
+    @staticmethod
+    def public_url(bucket: str, key: str) -> str:
+        """URL de acesso do objeto (ajustada para Minio Cloud)."""
+        return f"{settings.s3_endpoint}/{bucket}/{key}"
+
+    @staticmethod
+    def compute_digest(file_content: bytes) -> str:
+        """SHA-256 (hex) do conteúdo — identidade do objeto no storage."""
+        return hashlib.sha256(file_content).hexdigest()
+
+    @staticmethod
+    async def upload_file(file_content: bytes, filename: str, content_type: str | None = None) -> str:
+        """
+        Realiza o upload de um arquivo para o bucket S3 (Minio).
+        Retorna a URL pública/acesso do arquivo.
+        """
+        async with S3Service.client() as client:
             file_ext = Path(filename).suffix
             unique_filename = f"{uuid.uuid4()}{file_ext}"
-            
+
             # Realizar Upload
             await client.put_object(
                 Bucket=settings.s3_bucket,
@@ -35,20 +85,176 @@ class S3Service:
                 Body=file_content,
                 ContentType=content_type or 'application/octet-stream'
             )
-            
-            # Retornar URL do arquivo (ajustada para Minio Cloud)
-            return f"{settings.s3_endpoint}/{settings.s3_bucket}/{unique_filename}"
+
+            return S3Service.public_url(settings.s3_bucket, unique_filename)
 
     @staticmethod
     async def delete_file(file_key: str):
         """Remove um arquivo do bucket S3."""
-        session = get_session()
-        async with session.create_client(
-            's3',
-            region_name=settings.s3_region,
-            endpoint_url=settings.s3_endpoint,
-            aws_access_key_id=settings.s3_access_key,
-            aws_secret_access_key=settings.s3_secret_key,
-            use_ssl=settings.s3_use_ssl,
-        ) as client:
+        async with S3Service.client() as client:
             await client.delete_object(Bucket=settings.s3_bucket, Key=file_key)
+
+    # =========================================================================
+    # Content-Addressed Storage (Deduplicação por SHA-256)
+    # =========================================================================
+
+    @staticmethod
+    async def claim_by_digest(db: AsyncSession, tenant_id: uuid.UUID, digest: str) -> str | None:
+        """
+        Se o tenant já possui um objeto com este digest, retorna a URL —
+        nenhum byte precisa ser transferido. A referência só é contada
+        quando uma linha gravar a URL; aqui apenas renova o período de
+        carência do GC. Retorna None quando o conteúdo ainda não existe.
+        """
+        stmt = (
+            update(StoredObject)
+            .where(
+                StoredObject.tenant_id == tenant_id,
+                StoredObject.sha256 == digest.lower(),
+            )
+            .values(updated_at=func.now())
+            .returning(StoredObject.bucket, StoredObject.object_key)
+        )
+        row = (await db.execute(stmt)).first()
+        if not row:
+            return None
+        return S3Service.public_url(row.bucket, row.object_key)
+
+    @staticmethod
+    async def upload_deduplicated(
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        file_content: bytes,
+        filename: str,
+        content_type: str | None = None,
+        expected_digest: str | None = None,
+    ) -> str:
+        """
+        Upload content-addressed no bucket do tenant.
+
+        - Valida o digest enviado pelo cliente (se houver).
+        - Conteúdo já existente: retorna a URL (sem PUT).
+        - Conteúdo novo: PUT em sha256/<ab>/<digest><ext> e registro no
+          índice com ref_count 0 — a linha que salvar a URL conta a referência.
+
+        A chave é determinística, então dois uploads concorrentes do mesmo
+        conteúdo gravam o mesmo objeto e o UPSERT consolida o registro.
+        """
+        digest = S3Service.compute_digest(file_content)
+        if expected_digest and expected_digest.lower() != digest:
+            raise ContentDigestMismatchException(expected=expected_digest, received=digest)
+
+        existing_url = await S3Service.claim_by_digest(db, tenant_id, digest)
+        if existing_url:
+            logger.info(f"[Storage] Upload deduplicado para tenant {tenant_id} (sha256={digest[:12]}).")
+            return existing_url
+
+        # Cota: reserva os bytes no ledger antes da transferência (O(1))
+        await StorageService.reserve_bytes(db, tenant_id, len(file_content))
+
+        bucket = StorageService.tenant_bucket_name(tenant_id)
+        key = f"sha256/{digest[:2]}/{digest}{Path(filename).suffix.lower()}"
+
+        async with S3Service.client() as client:
+            await S3Service._put_object(client, bucket, key, file_content, content_type)
+
+        stmt = (
+            pg_insert(StoredObject)
+            .values(
+                id=uuid.uuid4(),
+                tenant_id=tenant_id,
+                sha256=digest,
+                bucket=bucket,
+                object_key=key,
+                size_bytes=len(file_content),
+                content_type=content_type,
+                ref_count=0,
+            )
+            .on_conflict_do_update(
+                constraint="uq_stored_objects_tenant_sha256",
+                set_={"updated_at": func.now()},
+            )
+            .returning(
+                StoredObject.bucket,
+                StoredObject.object_key,
+                literal_column("(xmax = 0)").label("inserted"),
+            )
+        )
+        row = (await db.execute(stmt)).one()
+        if not row.inserted:
+            # Upload concorrente do mesmo conteúdo venceu: a reserva foi em dobro
+            await StorageService.release_bytes(db, tenant_id, len(file_content))
+        return S3Service.public_url(row.bucket, row.object_key)
+
+    @staticmethod
+    async def collect_garbage(
+        db: AsyncSession,
+        grace_period: timedelta = GC_GRACE_PERIOD,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Garbage Collector: remove do bucket e do índice os objetos sem
+        referências há mais de `grace_period`.
+
+        As linhas ficam bloqueadas (FOR UPDATE SKIP LOCKED) até o commit do
+        chamador — um claim concorrente espera e, não encontrando mais a
+        linha, refaz o upload normalmente.
+        """
+        cutoff = datetime.now(timezone.utc) - grace_period
+        stmt = (
+            select(StoredObject)
+            .where(StoredObject.ref_count <= 0, StoredObject.updated_at < cutoff)
+            .order_by(StoredObject.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        orphans = (await db.execute(stmt)).scalars().all()
+        if not orphans:
+            return 0
+
+        by_bucket: dict[str, list[StoredObject]] = defaultdict(list)
+        for obj in orphans:
+            by_bucket[obj.bucket].append(obj)
+
+        removed = 0
+        async with S3Service.client() as client:
+            for bucket, objects in by_bucket.items():
+                for start in range(0, len(objects), S3_DELETE_BATCH):
+                    chunk = objects[start:start + S3_DELETE_BATCH]
+                    response = await client.delete_objects(
+                        Bucket=bucket,
+                        Delete={"Objects": [{"Key": o.object_key} for o in chunk], "Quiet": True},
+                    )
+                    failed = {
+                        err["Key"] for err in response.get("Errors", [])
+                        if err.get("Code") != "NoSuchKey"
+                    }
+                    for obj in chunk:
+                        if obj.object_key in failed:
+                            logger.error(f"[Storage GC] Falha ao remover {bucket}/{obj.object_key}.")
+                            continue
+                        await db.delete(obj)
+                        await StorageService.release_bytes(db, obj.tenant_id, obj.size_bytes)
+                        removed += 1
+
+        await db.flush()
+        logger.info(f"[Storage GC] {removed} objeto(s) sem referência removido(s).")
+        return removed
+
+    @staticmethod
+    async def _put_object(client, bucket: str, key: str, body: bytes, content_type: str | None) -> None:
+        """PUT com criação tardia do bucket do tenant (tenants ainda não provisionados)."""
+        params = {
+            "Bucket": bucket,
+            "Key": key,
+            "Body": body,
+            "ContentType": content_type or 'application/octet-stream',
+        }
+        try:
+            await client.put_object(**params)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'NoSuchBucket':
+                raise
+            logger.info(f"[Storage] Bucket {bucket} inexistente. Criando sob demanda.")
+            await client.create_bucket(Bucket=bucket)
+            await client.put_object(**params)
@@ -3,30 +3,47 @@ Manager Show — Service: Storage Service (Minio/S3)
 Gerencia o provisionamento físico de Buckets Multi-Tenant e Cotas.
 """
 
+import asyncio
 import logging
+from datetime import datetime, timezone
 from uuid import UUID
 from aiobotocore.session import get_session
 import boto3
 from botocore.exceptions import ClientError
+from sqlalchemy import BigInteger, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.exceptions import StorageQuotaExceededException
+from app.models.tenant import Tenant
+from app.models.tenant_storage_usage import TenantStorageUsage
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+GB = 1024 * 1024 * 1024
+# Buckets listados em paralelo na reconciliação
+RECONCILE_CONCURRENCY = 8
+
 class StorageService:
     """
     Serviço core para isolamento de arquivos focado em Multi-Tenancy.
     Cada tenant ('ARTIST' ou 'AGENCY') possuirá seu próprio bucket.
     """
 
+    @staticmethod
+    def tenant_bucket_name(tenant_id: UUID) -> str:
+        """Nome canônico do bucket isolado do tenant."""
+        return f"tenant-{str(tenant_id)}"
+
     @staticmethod
     async def provision_tenant_bucket(tenant_id: UUID, storage_limit_gb: int):
         """
         Cria o bucket para o tenant se não existir, e ajusta a Quota (limite) 
         para que o Minio bloqueie fisicamente uploads além desse limite.
         """
-        bucket_name = f"tenant-{str(tenant_id)}"
+        bucket_name = StorageService.tenant_bucket_name(tenant_id)
         
         session = get_session()
         async with session.create_client(
@@ -51,18 +68,188 @@ class StorageService:
                     logger.error(f"Erro ao acessar Minio: {error_code}")
                     raise e
             
-            # 3. Aplicar Quota no Minio (Lógica Específica Minio Admin)
-            # Como a boto3 padrão não envia quotas nativas do Minio (S3 não tem quota por bucket nativamente),
-            # em um ambiente de produção com Minio, utilizar-se-ia a REST API do MinioAdmin 
-            # ou a lib oficial `minio.MinioAdmin`.
-            # Aqui simulamos o envio da instrução de quota limit para manter a coerência da arquitetura
-            _storage_limit_bytes = storage_limit_gb * 1024 * 1024 * 1024
-            
-            # TODO: Implementar bind direto na API Admin do Minio: `mc admin bucket quota set myminio/{bucket_name} hard {_storage_limit_bytes}`
-            logger.info(f"[MINIO QUOTA] Limite Hard setado para {bucket_name}: {storage_limit_gb}GB ({_storage_limit_bytes} bytes).")
+            # 3. Quota
+            # S3 não tem quota nativa por bucket. O limite é aplicado pela aplicação
+            # no momento do upload, via ledger incremental (reserve_bytes), lendo
+            # Tenant.storage_limit_gb — nenhuma instrução extra ao Minio é necessária.
+            _storage_limit_bytes = storage_limit_gb * GB
+            logger.info(f"[QUOTA] Limite de {bucket_name}: {storage_limit_gb}GB ({_storage_limit_bytes} bytes).")
             
             return {
                 "bucket": bucket_name,
                 "quota_gb": storage_limit_gb,
                 "status": "provisioned"
             }
+
+    # =========================================================================
+    # Ledger de Uso (Cota em O(1))
+    # =========================================================================
+
+    @staticmethod
+    async def reserve_bytes(db: AsyncSession, tenant_id: UUID, size_bytes: int) -> int:
+        """
+        Reserva `size_bytes` no ledger do tenant, validando a cota no mesmo
+        statement (UPSERT condicional) — sem listar buckets e sem corrida
+        entre uploads simultâneos. Retorna o total usado após a reserva.
+
+        A reserva participa da transação do request: se o upload falhar e
+        a sessão sofrer rollback, o ledger volta ao valor anterior.
+        """
+        limit_bytes = cast(Tenant.storage_limit_gb, BigInteger) * GB
+        size = literal(size_bytes, BigInteger)
+
+        source = select(
+            literal(tenant_id, PG_UUID(as_uuid=True)),
+            size,
+            literal(1),
+            literal(0, BigInteger),
+        ).where(Tenant.id == tenant_id, size <= limit_bytes)
+
+        stmt = pg_insert(TenantStorageUsage).from_select(
+            ["tenant_id", "used_bytes", "object_count", "last_drift_bytes"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TenantStorageUsage.tenant_id],
+            set_={
+                "used_bytes": TenantStorageUsage.used_bytes + stmt.excluded.used_bytes,
+                "object_count": TenantStorageUsage.object_count + 1,
+                "updated_at": func.now(),
+            },
+            where=(
+                TenantStorageUsage.used_bytes + stmt.excluded.used_bytes
+                <= select(limit_bytes).where(Tenant.id == tenant_id).scalar_subquery()
+            ),
+        ).returning(TenantStorageUsage.used_bytes)
+
+        used = (await db.execute(stmt)).scalar_one_or_none()
+        if used is None:
+            limit_gb = await db.scalar(select(Tenant.storage_limit_gb).where(Tenant.id == tenant_id))
+            logger.warning(f"[QUOTA] Upload de {size_bytes} bytes recusado para tenant {tenant_id}.")
+            raise StorageQuotaExceededException(limit_gb)
+        return used
+
+    @staticmethod
+    async def release_bytes(db: AsyncSession, tenant_id: UUID, size_bytes: int, objects: int = 1) -> None:
+        """Devolve bytes ao ledger (remoção de objeto ou reserva não utilizada)."""
+        stmt = (
+            update(TenantStorageUsage)
+            .where(TenantStorageUsage.tenant_id == tenant_id)
+            .values(
+                used_bytes=func.greatest(TenantStorageUsage.used_bytes - size_bytes, 0),
+                object_count=func.greatest(TenantStorageUsage.object_count - objects, 0),
+            )
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def get_usage(db: AsyncSession, tenant_id: UUID) -> dict:
+        """Consumo atual x limite contratado (uma única query)."""
+        stmt = (
+            select(
+                Tenant.storage_limit_gb,
+                func.coalesce(TenantStorageUsage.used_bytes, 0).label("used_bytes"),
+                func.coalesce(TenantStorageUsage.object_count, 0).label("object_count"),
+                TenantStorageUsage.reconciled_at,
+            )
+            .outerjoin(TenantStorageUsage, TenantStorageUsage.tenant_id == Tenant.id)
+            .where(Tenant.id == tenant_id)
+        )
+        row = (await db.execute(stmt)).one()
+        limit_bytes = row.storage_limit_gb * GB
+        return {
+            "used_bytes": row.used_bytes,
+            "limit_bytes": limit_bytes,
+            "limit_gb": row.storage_limit_gb,
+            "object_count": row.object_count,
+            "usage_percent": round(row.used_bytes / limit_bytes * 100, 2) if limit_bytes else 0,
+            "reconciled_at": row.reconciled_at,
+        }
+
+    # =========================================================================
+    # Reconciliação (Ledger x Listagem Real do Bucket)
+    # =========================================================================
+
+    @staticmethod
+    async def measure_bucket(client, bucket_name: str) -> tuple[int, int]:
+        """Soma (bytes, objetos) de um bucket via list_objects_v2 paginado."""
+        total_bytes = 0
+        total_objects = 0
+        paginator = client.get_paginator("list_objects_v2")
+        try:
+            async for page in paginator.paginate(Bucket=bucket_name, PaginationConfig={"PageSize": 1000}):
+                for obj in page.get("Contents", []):
+                    total_bytes += obj["Size"]
+                    total_objects += 1
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'NoSuchBucket':
+                raise
+        return total_bytes, total_objects
+
+    @staticmethod
+    async def reconcile_usage(db: AsyncSession, concurrency: int = RECONCILE_CONCURRENCY) -> list[dict]:
+        """
+        Compara o ledger de todos os tenants com a listagem real dos buckets
+        (buckets listados em paralelo, cada um paginado) e corrige a diferença.
+
+        A correção é aplicada como delta (used_bytes + drift, object_count +
+        drift de objetos) sobre o snapshot lido antes da listagem, preservando
+        reservas e liberações concorrentes feitas durante a reconciliação.
+        Retorna os tenants com divergência.
+        """
+        from app.services.s3_service import S3Service
+
+        tenant_ids = (await db.execute(select(Tenant.id))).scalars().all()
+        snapshot = {
+            row.tenant_id: (row.used_bytes, row.object_count)
+            for row in await db.execute(
+                select(TenantStorageUsage.tenant_id, TenantStorageUsage.used_bytes, TenantStorageUsage.object_count)
+            )
+        }
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with S3Service.client() as client:
+            async def _measure(tenant_id: UUID):
+                async with semaphore:
+                    return await StorageService.measure_bucket(client, StorageService.tenant_bucket_name(tenant_id))
+
+            measurements = await asyncio.gather(*(_measure(t) for t in tenant_ids), return_exceptions=True)
+
+        now = datetime.now(timezone.utc)
+        drifts = []
+        for tenant_id, measured in zip(tenant_ids, measurements):
+            if isinstance(measured, Exception):
+                logger.error(f"[QUOTA] Falha ao listar bucket do tenant {tenant_id}: {measured}")
+                continue
+
+            listed_bytes, listed_objects = measured
+            snapshot_bytes, snapshot_objects = snapshot.get(tenant_id, (0, 0))
+            drift = listed_bytes - snapshot_bytes
+            object_drift = listed_objects - snapshot_objects
+
+            stmt = pg_insert(TenantStorageUsage).values(
+                tenant_id=tenant_id,
+                used_bytes=listed_bytes,
+                object_count=listed_objects,
+                reconciled_at=now,
+                last_drift_bytes=drift,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TenantStorageUsage.tenant_id],
+                set_={
+                    "used_bytes": func.greatest(TenantStorageUsage.used_bytes + drift, 0),
+                    "object_count": func.greatest(TenantStorageUsage.object_count + object_drift, 0),
+                    "reconciled_at": now,
+                    "last_drift_bytes": drift,
+                    "updated_at": func.now(),
+                },
+            )
+            await db.execute(stmt)
+
+            if drift:
+                logger.warning(f"[QUOTA] Divergência de {drift} bytes no ledger do tenant {tenant_id}. Corrigido.")
+                drifts.append({"tenant_id": str(tenant_id), "drift_bytes": drift, "listed_bytes": listed_bytes})
+
+        await db.flush()
+        return drifts
@@ -0,0 +1,198 @@
+"""
+Manager Show — Service: SystemSettings (Cache de Configuração Global)
+
+A configuração da Evolution API muda raramente, mas é lida a cada
+mensagem de WhatsApp. Leitura em duas camadas:
+1. Cache em processo (LOCAL_TTL segundos) — zero I/O no caminho quente.
+2. Redis (REDIS_TTL) — compartilhado entre pods e workers.
+3. Postgres apenas no miss.
+
+`invalidate()` é chamado após `update_whatsapp_settings`: limpa o Redis e
+o cache local do processo; os demais processos convergem em até LOCAL_TTL.
+
+A `evolution_api_key` nunca vai para o Redis: lá fica só a parte pública
+da configuração e uma impressão digital (SHA-256 truncado) da chave. A
+chave em si vem do Postgres e fica apenas na memória do processo,
+reaproveitada enquanto a impressão digital publicada não mudar.
+
+O estado da instância (connectionState) é consultado pelo poller
+`poll_evolution_instance_state` (Celery Beat) e lido do Redis pela tela
+de configurações, sem chamada remota a cada GET.
+
+Os overrides da amostragem de traces (`tracing_policy`) são publicados
+no Redis sem TTL — cada processo os relê periodicamente (app/core/tracing.py).
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, replace
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.system_settings import SystemSettings
+from app.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+CONFIG_KEY = "system_settings:whatsapp"
+STATE_KEY = "system_settings:whatsapp:state"
+LOCAL_TTL = 15
+REDIS_TTL = 60 * 60
+# Estado expira se o poller parar (a tela volta a consultar ao vivo)
+STATE_TTL = 3 * 60
+
+
+@dataclass(frozen=True)
+class WhatsAppConfig:
+    """Snapshot imutável da configuração (mesmos atributos do model)."""
+    evolution_api_url: str | None
+    evolution_api_key: str | None
+    evolution_instance_name: str | None
+    is_whatsapp_active: bool
+
+    @classmethod
+    def from_model(cls, settings: SystemSettings) -> "WhatsAppConfig":
+        return cls(
+            evolution_api_url=settings.evolution_api_url,
+            evolution_api_key=settings.evolution_api_key,
+            evolution_instance_name=settings.evolution_instance_name,
+            is_whatsapp_active=bool(settings.is_whatsapp_active),
+        )
+
+
+def _key_fingerprint(key: str | None) -> str:
+    return hashlib.sha256((key or "").encode()).hexdigest()[:16]
+
+
+# (expira_em, config) — None em config significa "não configurado"
+_local: tuple[float, WhatsAppConfig | None] | None = None
+# (impressão digital, chave) — a API key só existe na memória do processo
+_secret: tuple[str, str | None] | None = None
+
+
+class SystemSettingsService:
+    @staticmethod
+    async def get_whatsapp_config(db: AsyncSession) -> WhatsAppConfig | None:
+        """Configuração da Evolution API (processo → Redis → Postgres)."""
+        global _local
+        now = time.monotonic()
+        if _local is not None and now < _local[0]:
+            return _local[1]
+
+        cached = await SystemSettingsService._read_redis()
+        if cached is None:
+            config = await SystemSettingsService._load(db)
+            await SystemSettingsService._write_redis(config)
+        elif cached is False:
+            config = None
+        else:
+            public, fingerprint = cached
+            if _secret is not None and _secret[0] == fingerprint:
+                config = replace(public, evolution_api_key=_secret[1])
+            else:
+                # Chave mudou (ou processo novo): só ela exige o Postgres
+                config = await SystemSettingsService._load(db)
+
+        _local = (now + LOCAL_TTL, config)
+        return config
+
+    @staticmethod
+    async def _load(db: AsyncSession) -> WhatsAppConfig | None:
+        """Lê a configuração do Postgres e guarda a chave na memória do processo."""
+        global _secret
+        settings = (await db.execute(select(SystemSettings).limit(1))).scalar_one_or_none()
+        config = WhatsAppConfig.from_model(settings) if settings else None
+        if config:
+            _secret = (_key_fingerprint(config.evolution_api_key), config.evolution_api_key)
+        return config
+
+    @staticmethod
+    async def invalidate() -> None:
+        """Invalidação explícita após alterar as configurações."""
+        global _local, _secret
+        _local = None
+        _secret = None
+        try:
+            await redis_client.delete(CONFIG_KEY, STATE_KEY)
+        except Exception as e:
+            logger.warning(f"[Settings] Falha ao invalidar cache da configuração: {e}")
+
+    @staticmethod
+    async def get_instance_state(config: WhatsAppConfig | SystemSettings) -> dict:
+        """
+        Estado da instância publicado pelo poller. Sem estado em cache
+        (poller parado ou recém-invalidado), consulta ao vivo e publica.
+        """
+        try:
+            raw = await redis_client.get(STATE_KEY)
+            if raw:
+                return json.loads(raw)
+        except Exception as e:
+            logger.warning(f"[Settings] Redis indisponível ao ler estado da instância: {e}")
+        return await SystemSettingsService.refresh_instance_state(config)
+
+    @staticmethod
+    async def refresh_instance_state(config: WhatsAppConfig | SystemSettings | None) -> dict:
+        """Consulta o connectionState na Evolution API e publica no Redis."""
+        from app.services.evolution_api_service import EvolutionApiService
+
+        status = await EvolutionApiService.get_connection_state(config) if config else "NOT_CONFIGURED"
+        state = {"status": status, "checked_at": time.time()}
+        try:
+            await redis_client.set(STATE_KEY, json.dumps(state), ex=STATE_TTL)
+        except Exception as e:
+            logger.warning(f"[Settings] Falha ao publicar estado da instância: {e}")
+        return state
+
+    @staticmethod
+    async def publish_tracing_policy(db: AsyncSession) -> dict | None:
+        """Publica no Redis os overrides de amostragem salvos no banco."""
+        from app.core.tracing import POLICY_KEY
+
+        settings = (await db.execute(select(SystemSettings).limit(1))).scalar_one_or_none()
+        overrides = settings.tracing_policy if settings else None
+        try:
+            if overrides:
+                await redis_client.set(POLICY_KEY, json.dumps(overrides))
+            else:
+                await redis_client.delete(POLICY_KEY)
+        except Exception as e:
+            logger.warning(f"[Settings] Falha ao publicar a política de amostragem: {e}")
+        return overrides
+
+    @staticmethod
+    async def _read_redis() -> tuple[WhatsAppConfig, str] | bool | None:
+        """
+        (config sem a chave, impressão digital da chave) do Redis;
+        False = "não configurado" cacheado; None = miss.
+        """
+        try:
+            raw = await redis_client.get(CONFIG_KEY)
+        except Exception as e:
+            logger.warning(f"[Settings] Redis indisponível ao ler configuração: {e}")
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        if not data:
+            return False
+        fingerprint = data.pop("key_fingerprint", None)
+        if fingerprint is None:
+            # Formato antigo do cache: ignora e relê do banco
+            return None
+        return WhatsAppConfig(evolution_api_key=None, **data), fingerprint
+
+    @staticmethod
+    async def _write_redis(config: WhatsAppConfig | None) -> None:
+        """Publica só os campos não secretos (a chave vira impressão digital)."""
+        payload = {}
+        if config:
+            payload = asdict(config)
+            payload["key_fingerprint"] = _key_fingerprint(payload.pop("evolution_api_key"))
+        try:
+            await redis_client.set(CONFIG_KEY, json.dumps(payload), ex=REDIS_TTL)
+        except Exception as e:
+            logger.warning(f"[Settings] Falha ao gravar configuração no Redis: {e}")
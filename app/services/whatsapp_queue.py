@@ -0,0 +1,227 @@
+"""
+Manager Show — Service: Fila de Saída WhatsApp (Evolution API)
+
+Envios não chamam a Evolution direto: entram numa fila no Redis por
+instância, drenada por UM consumidor por vez (lock distribuído) na task
+`drain_whatsapp_queue`. Assim a vazão é controlada globalmente, somando
+todos os pods e workers.
+
+Estruturas no Redis (por instância):
+- wa:q:{instancia}:{lane}          lista de destinatários "tenant:telefone"
+- wa:msg:{instancia}:{lane}:{dest} lista de textos pendentes do destinatário
+- wa:pause:{instancia}             pausa pedida pela Evolution (Retry-After)
+- wa:drain:{instancia}             lock do consumidor
+
+Prioridade: a lane `daysheet` (operacional) é sempre drenada antes da
+`marketing`. Coalescência: várias mensagens para o mesmo número enquanto
+ele aguarda na fila viram um único envio (textos concatenados).
+Cota: mensagens/dia por tenant derivadas de Tenant.whatsapp_limit.
+Textos que esgotam MAX_ATTEMPTS saem da fila e vão para o dead-letter do
+outbox (tópico `whatsapp.undelivered`), de onde podem ser reenfileirados.
+"""
+
+import enum
+import json
+import logging
+import uuid
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.tenant import Tenant
+from app.redis import redis_client
+from app.services.whatsapp_service import normalize_phone
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MESSAGE_TTL = 24 * 60 * 60
+USAGE_TTL = 2 * 24 * 60 * 60
+DRAIN_LOCK_TTL = 90
+MAX_ATTEMPTS = 5
+COALESCE_SEPARATOR = "\n\n"
+
+
+class WhatsAppLane(str, enum.Enum):
+    """Lanes de prioridade (ordem = prioridade de drenagem)."""
+    DAYSHEET = "daysheet"
+    MARKETING = "marketing"
+
+
+# Enfileira o texto; só o primeiro texto pendente coloca o destinatário na lane
+_ENQUEUE_LUA = """
+local created = redis.call('RPUSH', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+if created == 1 then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+return created
+"""
+
+# Retira o próximo destinatário (lanes em ordem de prioridade) + todos os seus textos
+_DEQUEUE_LUA = """
+for i, lane in ipairs(KEYS) do
+    local dest = redis.call('LPOP', lane)
+    if dest then
+        local msg_key = ARGV[i] .. dest
+        local items = redis.call('LRANGE', msg_key, 0, -1)
+        redis.call('DEL', msg_key)
+        return {i, dest, unpack(items)}
+    end
+end
+return nil
+"""
+
+# Devolve textos não enviados à frente da fila do destinatário; o destinatário
+# volta à frente (pausa/Retry-After) ou ao fim (falha comum) da lane
+_REQUEUE_LUA = """
+local pending = redis.call('LLEN', KEYS[2])
+for i = #ARGV, 3, -1 do
+    redis.call('LPUSH', KEYS[2], ARGV[i])
+end
+redis.call('EXPIRE', KEYS[2], 86400)
+if pending == 0 then
+    if ARGV[1] == 'front' then
+        redis.call('LPUSH', KEYS[1], ARGV[2])
+    else
+        redis.call('RPUSH', KEYS[1], ARGV[2])
+    end
+end
+return pending
+"""
+
+_enqueue_script = redis_client.register_script(_ENQUEUE_LUA)
+_dequeue_script = redis_client.register_script(_DEQUEUE_LUA)
+_requeue_script = redis_client.register_script(_REQUEUE_LUA)
+
+
+def _lane_key(instance: str, lane: WhatsAppLane) -> str:
+    return f"wa:q:{instance}:{lane.value}"
+
+
+def _msg_prefix(instance: str, lane: WhatsAppLane) -> str:
+    return f"wa:msg:{instance}:{lane.value}:"
+
+
+def _usage_key(tenant_id: uuid.UUID | str) -> str:
+    return f"wa:usage:{tenant_id}:{date.today().isoformat()}"
+
+
+class WhatsAppQueue:
+    @staticmethod
+    def pause_key(instance: str) -> str:
+        return f"wa:pause:{instance}"
+
+    @staticmethod
+    def drain_lock_key(instance: str) -> str:
+        return f"wa:drain:{instance}"
+
+    @staticmethod
+    async def daily_quota(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+        """Mensagens/dia permitidas ao tenant (Tenant.whatsapp_limit)."""
+        limit = await db.scalar(select(Tenant.whatsapp_limit).where(Tenant.id == tenant_id))
+        if not limit:
+            return settings.whatsapp_free_daily_messages
+        return limit * settings.whatsapp_daily_messages_per_slot
+
+    @staticmethod
+    async def enqueue(
+        instance: str,
+        tenant_id: uuid.UUID,
+        phone: str,
+        text: str,
+        lane: WhatsAppLane = WhatsAppLane.DAYSHEET,
+        quota: int | None = None,
+    ) -> bool:
+        """
+        Coloca a mensagem na fila da instância e acorda o consumidor.
+        Retorna False se a cota diária do tenant já foi atingida.
+        """
+        if quota is not None:
+            used = await redis_client.incr(_usage_key(tenant_id))
+            if used == 1:
+                await redis_client.expire(_usage_key(tenant_id), USAGE_TTL)
+            if used > quota:
+                await redis_client.decr(_usage_key(tenant_id))
+                logger.warning(f"[WhatsApp Queue] Cota diária ({quota}) atingida pelo tenant {tenant_id}.")
+                return False
+
+        dest = f"{tenant_id}:{normalize_phone(phone)}"
+        item = json.dumps({"text": text, "attempts": 0})
+        await _enqueue_script(
+            keys=[_lane_key(instance, lane), _msg_prefix(instance, lane) + dest],
+            args=[dest, item, MESSAGE_TTL],
+        )
+        await WhatsAppQueue.kick(instance)
+        return True
+
+    @staticmethod
+    async def dequeue(instance: str) -> tuple[WhatsAppLane, str, list[dict]] | None:
+        """Próximo destinatário (respeitando a prioridade) com os textos coalescidos."""
+        lanes = list(WhatsAppLane)
+        result = await _dequeue_script(
+            keys=[_lane_key(instance, lane) for lane in lanes],
+            args=[_msg_prefix(instance, lane) for lane in lanes],
+        )
+        if not result:
+            return None
+        lane_index, dest, *items = result
+        return lanes[int(lane_index) - 1], dest, [json.loads(i) for i in items]
+
+    @staticmethod
+    async def requeue(
+        instance: str,
+        lane: WhatsAppLane,
+        dest: str,
+        items: list[dict],
+        front: bool = False,
+    ) -> list[dict]:
+        """
+        Devolve os textos para nova tentativa. Retorna os que esgotaram as
+        tentativas e saíram da fila (o chamador os manda para o dead-letter).
+        """
+        retry = [{**i, "attempts": i.get("attempts", 0) + 1} for i in items]
+        dropped = [i for i in retry if i["attempts"] >= MAX_ATTEMPTS]
+        retry = [i for i in retry if i["attempts"] < MAX_ATTEMPTS]
+        if dropped:
+            logger.error(
+                f"[WhatsApp Queue] {len(dropped)} mensagem(ns) para {dest} descartada(s) "
+                f"após {MAX_ATTEMPTS} tentativas."
+            )
+        if retry:
+            await _requeue_script(
+                keys=[_lane_key(instance, lane), _msg_prefix(instance, lane) + dest],
+                args=["front" if front else "back", dest, *(json.dumps(i) for i in retry)],
+            )
+        return dropped
+
+    @staticmethod
+    async def pause(instance: str, seconds: float) -> None:
+        """Pausa a instância inteira (Retry-After da Evolution)."""
+        await redis_client.set(WhatsAppQueue.pause_key(instance), "1", px=int(seconds * 1000))
+
+    @staticmethod
+    async def paused_for(instance: str) -> float:
+        """Segundos restantes de pausa (0 se liberada)."""
+        ttl = await redis_client.pttl(WhatsAppQueue.pause_key(instance))
+        return ttl / 1000 if ttl and ttl > 0 else 0.0
+
+    @staticmethod
+    async def pending_count(instance: str) -> int:
+        total = 0
+        for lane in WhatsAppLane:
+            total += await redis_client.llen(_lane_key(instance, lane))
+        return total
+
+    @staticmethod
+    async def kick(instance: str) -> None:
+        """Agenda o consumidor da instância se nenhum estiver rodando."""
+        if await redis_client.set(WhatsAppQueue.drain_lock_key(instance), "1", nx=True, ex=DRAIN_LOCK_TTL):
+            from app.tasks.notifications import drain_whatsapp_queue
+            drain_whatsapp_queue.delay(instance)
+
+    @staticmethod
+    def coalesce(items: list[dict]) -> str:
+        return COALESCE_SEPARATOR.join(i["text"] for i in items)
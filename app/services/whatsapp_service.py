@@ -1,33 +1,53 @@
 import logging
-import httpx
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.system_settings import SystemSettings
+from app.config import get_settings
+from app.core.http_client import get_http_client
+from app.core.rate_limit import TokenBucket
+from app.services.system_settings_service import SystemSettingsService, WhatsAppConfig
 
 logger = logging.getLogger(__name__)
+app_settings = get_settings()
 
-async def send_whatsapp_message(phone: str, message: str, db: AsyncSession) -> bool:
+
+async def get_whatsapp_config(db: AsyncSession) -> WhatsAppConfig | None:
+    """Configuração global da Evolution API (cacheada — ver SystemSettingsService)."""
+    return await SystemSettingsService.get_whatsapp_config(db)
+
+
+async def send_whatsapp_text(
+    settings: WhatsAppConfig | None,
+    phone: str,
+    message: str,
+) -> bool:
     """
-    Envia uma mensagem de WhatsApp utilizando a Evolution API configurada globalmente.
+    Envia uma mensagem de WhatsApp com a configuração já carregada.
+    Envios em massa devem passar pela fila (app.services.whatsapp_queue).
     """
-    try:
-        # Busca configurações globais
-        stmt = select(SystemSettings).limit(1)
-        result = await db.execute(stmt)
-        settings = result.scalar_one_or_none()
+    sent, _ = await deliver_whatsapp_text(settings, phone, message)
+    return sent
 
+
+async def deliver_whatsapp_text(
+    settings: WhatsAppConfig | None,
+    phone: str,
+    message: str,
+) -> tuple[bool, float | None]:
+    """
+    Envio de baixo nível usado pela fila. Cada envio consome um token do
+    bucket distribuído da instância Evolution (protege contra throttling
+    e banimento somando todos os workers).
+
+    Retorna (enviado, retry_after): retry_after (segundos) vem preenchido
+    quando a Evolution pede para reduzir o ritmo (429/503).
+    """
+    try:
         if not settings or not settings.is_whatsapp_active:
             logger.info(f"WhatsApp inativo ou não configurado. Mensagem para {phone} não enviada.")
-            return False
+            return False, None
 
         if not settings.evolution_api_url or not settings.evolution_api_key or not settings.evolution_instance_name:
             logger.warning("Configurações da Evolution API incompletas.")
-            return False
-
-        # Formata o número (garante DDI 55 e apenas números)
-        clean_phone = "".join(filter(str.isdigit, phone))
-        if not clean_phone.startswith("55"):
-            clean_phone = f"55{clean_phone}"
+            return False, None
 
         url = f"{settings.evolution_api_url.rstrip('/')}/message/sendText/{settings.evolution_instance_name}"
         headers = {
@@ -35,9 +55,9 @@ async def send_whatsapp_message(phone: str, message: str, db: AsyncSession) -> b
             "Content-Type": "application/json"
         }
         payload = {
-            "number": clean_phone,
+            "number": normalize_phone(phone),
             "options": {
-                "delay": 1200,
+                "delay": app_settings.whatsapp_typing_delay_ms,
                 "presence": "composing",
                 "linkPreview": True
             },
@@ -46,17 +66,54 @@ async def send_whatsapp_message(phone: str, message: str, db: AsyncSession) -> b
             }
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code in (200, 201):
-                logger.info(f"Mensagem enviada com sucesso para {phone}")
-                return True
-            else:
-                logger.error(f"Erro Evolution API ({response.status_code}): {response.text}")
-                return False
+        await TokenBucket(
+            f"whatsapp:instance:{settings.evolution_instance_name}",
+            app_settings.whatsapp_instance_rate_per_second,
+            app_settings.whatsapp_instance_burst,
+        ).acquire()
+
+        response = await get_http_client().post(url, json=payload, headers=headers, timeout=10.0)
+
+        if response.status_code in (200, 201):
+            logger.info(f"Mensagem enviada com sucesso para {phone}")
+            return True, None
+        if response.status_code in (429, 503):
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            logger.warning(f"Evolution API pediu pausa ({response.status_code}). Retry-After: {retry_after}s")
+            return False, retry_after
+
+        logger.error(f"Erro Evolution API ({response.status_code}): {response.text}")
+        return False, None
 
     except Exception as e:
         logger.error(f"Erro grave ao enviar WhatsApp para {phone}: {str(e)}")
         # Em produção, aqui dispararíamos um alerta no Sentry
+        return False, None
+
+
+def normalize_phone(phone: str) -> str:
+    """Formata o número (garante DDI 55 e apenas números)."""
+    clean_phone = "".join(filter(str.isdigit, phone))
+    if not clean_phone.startswith("55"):
+        clean_phone = f"55{clean_phone}"
+    return clean_phone
+
+
+def _parse_retry_after(value: str | None) -> float:
+    """Retry-After em segundos (padrão de 30s se ausente ou em formato de data)."""
+    try:
+        return max(float(value), 1.0)
+    except (TypeError, ValueError):
+        return 30.0
+
+
+async def send_whatsapp_message(phone: str, message: str, db: AsyncSession) -> bool:
+    """
+    Envia uma mensagem de WhatsApp utilizando a Evolution API configurada globalmente.
+    """
+    try:
+        settings = await get_whatsapp_config(db)
+    except Exception as e:
+        logger.error(f"Erro grave ao enviar WhatsApp para {phone}: {str(e)}")
         return False
+    return await send_whatsapp_text(settings, phone, message)
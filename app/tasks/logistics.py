@@ -0,0 +1,152 @@
+"""
+Manager Show — Tasks: Logistics (Enriquecimento em Background)
+
+As escritas na timeline do Day Sheet não esperam APIs de terceiros:
+o item é gravado na hora e o clima/rotas são preenchidos por esta task.
+
+Deduplicação + debounce por show (Redis):
+- Toda escrita atualiza `last_edit` do show.
+- Só existe UM job agendado por show (`pending`, SET NX).
+- O job só executa depois de DEBOUNCE_SECONDS sem novas edições;
+  se houver edição mais recente, ele se reagenda pelo tempo restante.
+- O agendamento roda depois do commit do request (app.core.post_commit):
+  o worker nunca lê uma timeline ainda não commitada.
+O cliente acompanha o resultado via GET /daysheet/enrichment (polling).
+"""
+
+import json
+import logging
+import time
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.celery_app import celery_app
+from app.core.celery_utils import async_to_sync
+from app.core.post_commit import after_commit, send_task
+from app.database import async_session_factory
+from app.models.logistics_timeline import LogisticsTimeline
+from app.models.show import Show
+from app.redis import redis_client
+from app.services.public_daysheet_service import PublicDaysheetService
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = 5
+# Margem para o job não ficar órfão caso o worker morra antes de executar
+PENDING_TTL = 10 * 60
+STATUS_TTL = 24 * 60 * 60
+
+
+def _pending_key(show_id: str) -> str:
+    return f"logistics:enrich:pending:{show_id}"
+
+
+def _last_edit_key(show_id: str) -> str:
+    return f"logistics:enrich:last_edit:{show_id}"
+
+
+def _status_key(show_id: str) -> str:
+    return f"logistics:enrich:status:{show_id}"
+
+
+async def _set_status(show_id: str, state: str, **extra) -> None:
+    payload = {"state": state, "updated_at": time.time(), **extra}
+    await redis_client.set(_status_key(show_id), json.dumps(payload), ex=STATUS_TTL)
+
+
+def schedule_timeline_enrichment(db: AsyncSession, show_id: uuid.UUID, tenant_id: uuid.UUID) -> None:
+    """
+    Agenda (com debounce) o enriquecimento da timeline do show para depois
+    do commit do request. Nunca propaga erro: a escrita do produtor não
+    pode falhar por causa disso.
+    """
+    sid = str(show_id)
+
+    async def _schedule() -> None:
+        try:
+            await redis_client.set(_last_edit_key(sid), time.time(), ex=PENDING_TTL)
+            await _set_status(sid, "pending")
+            if await redis_client.set(_pending_key(sid), "1", nx=True, ex=PENDING_TTL):
+                await send_task(enrich_show_timeline, [sid, str(tenant_id)], countdown=DEBOUNCE_SECONDS)
+        except Exception as e:
+            logger.error(f"[Logistics] Falha ao agendar enriquecimento do show {sid}: {str(e)}")
+
+    after_commit(db, _schedule)
+
+
+async def get_enrichment_status(show_id: uuid.UUID) -> dict:
+    """Estado do último enriquecimento (pending | running | done | failed)."""
+    raw = await redis_client.get(_status_key(str(show_id)))
+    if not raw:
+        return {"state": "idle"}
+    return json.loads(raw)
+
+
+@celery_app.task(name="enrich_show_timeline")
+@async_to_sync
+async def enrich_show_timeline(show_id: str, tenant_id: str):
+    """
+    Preenche weather_temp, weather_condition, route_distance e
+    route_duration de toda a timeline do show (LogisticsService.enrich_timeline).
+    """
+    from app.services.logistics_service import LogisticsService
+
+    # Debounce: ainda houve edição recente? Reagenda pelo tempo restante.
+    last_edit = await redis_client.get(_last_edit_key(show_id))
+    if last_edit:
+        remaining = float(last_edit) + DEBOUNCE_SECONDS - time.time()
+        if remaining > 0:
+            enrich_show_timeline.apply_async(args=[show_id, tenant_id], countdown=remaining)
+            return "rescheduled"
+
+    # Libera o slot: edições a partir daqui agendam uma nova execução
+    await redis_client.delete(_pending_key(show_id))
+    await _set_status(show_id, "running")
+
+    async with async_session_factory() as db:
+        try:
+            show_uuid = uuid.UUID(show_id)
+            tenant_uuid = uuid.UUID(tenant_id)
+
+            show = await db.scalar(select(Show).where(Show.id == show_uuid, Show.tenant_id == tenant_uuid))
+            if not show:
+                logger.error(f"[Logistics] Show {show_id} não encontrado para enriquecimento.")
+                await _set_status(show_id, "failed")
+                return False
+
+            stmt_tl = (
+                select(LogisticsTimeline)
+                .where(LogisticsTimeline.show_id == show_uuid, LogisticsTimeline.tenant_id == tenant_uuid)
+                .order_by(LogisticsTimeline.order, LogisticsTimeline.time)
+            )
+            items = (await db.execute(stmt_tl)).scalars().all()
+
+            updated = await LogisticsService.enrich_timeline(db, show, items)
+            await db.commit()
+
+            await _set_status(show_id, "done", items_updated=updated)
+        except Exception as e:
+            await db.rollback()
+            await _set_status(show_id, "failed")
+            logger.error(f"[Logistics] Erro no enriquecimento do show {show_id}: {str(e)}")
+            raise e
+
+        # Timeline final (com clima/rotas): atualiza o roteiro público. O
+        # enriquecimento já foi gravado; uma falha aqui não o torna "failed"
+        # (o documento expira pelo TTL ou é remontado na próxima edição).
+        try:
+            await PublicDaysheetService.rebuild(db, show_uuid)
+        except Exception as e:
+            logger.error(f"[Logistics] Falha ao atualizar o roteiro público do show {show_id}: {str(e)}")
+        return updated
+
+
+@celery_app.task(name="build_public_daysheet")
+@async_to_sync
+async def build_public_daysheet(show_id: str):
+    """Pré-computa o documento do roteiro público (Smart Share) no Redis."""
+    async with async_session_factory() as db:
+        result = await PublicDaysheetService.rebuild(db, uuid.UUID(show_id))
+        return result[0] if result else None
@@ -1,132 +1,392 @@
 """
 Manager Show — Tasks: Notifications (Information Push)
-Este módulo é o coração do assistente virtual ativo, retirando o peso 
+Este módulo é o coração do assistente virtual ativo, retirando o peso
 operacional do produtor ao automatizar a comunicação com a equipe.
+
+O disparo é dividido em duas fases:
+1. Fase em lote (banco): vínculos ShowCrew de toda a equipe em um único
+   UPSERT e todos os device tokens em uma única query.
+2. Fase de envio: WhatsApp entra na fila da instância Evolution
+   (app.services.whatsapp_queue, drenada por `drain_whatsapp_queue`) e o
+   Push FCM sai em lote.
+
+A publicação do roteiro grava um evento no outbox (app.services.outbox_service)
+na mesma transação; a entrega chega aqui pelo handler `daysheet.published`.
+Cada destinatário atendido (device push, membro no WhatsApp) é registrado
+por mensagem: a nova tentativa do outbox só reenvia para quem falhou.
+
+Para o WhatsApp, "atendido" significa entregue à fila da instância: o
+outbox garante o handoff, não o envio. Textos que a fila descarta após
+esgotar as tentativas voltam ao outbox como dead-letter do tópico
+`whatsapp.undelivered` (visível e reprocessável pela Retaguarda).
 """
 
+import asyncio
 import logging
+import time
 import uuid
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.celery_app import celery_app
 from app.core.celery_utils import async_to_sync
 from app.database import async_session_factory
+from app.redis import redis_client
 from app.models.show import Show
 from app.models.artist_crew import ArtistCrew
+from app.models.device_token import DeviceToken
 from app.models.show_crew import ShowCrew
+from app.models.outbox_message import OutboxMessage
+from app.services.outbox_service import OutboxService, PartialDeliveryError
 
 logger = logging.getLogger(__name__)
 
+# Tempo máximo de uma execução do consumidor da fila (o Beat/kick reagenda)
+DRAIN_MAX_SECONDS = 55
+
+DAYSHEET_PUBLISHED_TOPIC = "daysheet.published"
+WHATSAPP_UNDELIVERED_TOPIC = "whatsapp.undelivered"
+
+
+@OutboxService.handler(DAYSHEET_PUBLISHED_TOPIC)
+async def _on_daysheet_published(db: AsyncSession, message: OutboxMessage) -> None:
+    """Handler do outbox: roteiro publicado → aquece o roteiro público e notifica a equipe."""
+    from app.services.public_daysheet_service import PublicDaysheetService
+
+    # Documento pronto antes do link chegar à equipe inteira
+    await PublicDaysheetService.rebuild(db, uuid.UUID(message.payload["show_id"]))
+    await send_daysheet_notifications(db, message.payload["show_id"], str(message.tenant_id), message)
+
+
+@OutboxService.handler(WHATSAPP_UNDELIVERED_TOPIC)
+async def _on_whatsapp_undelivered(db: AsyncSession, message: OutboxMessage) -> None:
+    """Handler do outbox: devolve à fila da instância textos que ela descartou."""
+    from app.services.whatsapp_queue import WhatsAppLane, WhatsAppQueue
+
+    payload = message.payload
+    for text in payload["texts"]:
+        # Sem cota: o texto já foi contado no primeiro enfileiramento
+        await WhatsAppQueue.enqueue(
+            payload["instance"],
+            message.tenant_id,
+            payload["phone"],
+            text,
+            lane=WhatsAppLane(payload["lane"]),
+        )
+
+
 @celery_app.task(name="notify_crew_about_daysheet")
 @async_to_sync
 async def notify_crew_about_daysheet(show_id: str, tenant_id: str):
     """
-    Busca a equipe do artista vinculada ao show e simula o disparo
-    de notificações com o Link Mágico do Roteiro.
+    Disparo direto (fora do outbox) das notificações do roteiro.
     """
-    logger.info(f"[Information Push] Iniciando notificações para Show {show_id} (Tenant {tenant_id})")
-    
     async with async_session_factory() as db:
         try:
-            # 1. Busca o Show e valida existência
-            show_uuid = uuid.UUID(show_id)
-            tenant_uuid = uuid.UUID(tenant_id)
-            
-            stmt_show = select(Show).where(Show.id == show_uuid, Show.tenant_id == tenant_uuid)
-            result_show = await db.execute(stmt_show)
-            show = result_show.scalar_one_or_none()
-            
-            if not show:
-                logger.error(f"[Information Push] Erro: Show {show_id} não encontrado ou acesso negado.")
-                return False
-
-            # 2. Busca membros ativos da equipe do artista
-            stmt_crew = select(ArtistCrew).where(
-                ArtistCrew.artist_id == show.artist_id,
-                ArtistCrew.tenant_id == tenant_uuid,
-                ArtistCrew.is_active == True
-            )
-            result_crew = await db.execute(stmt_crew)
-            crew_members = result_crew.scalars().all()
-            
-            if not crew_members:
-                logger.warning(f"[Information Push] Nenhum membro de equipe ativo encontrado para o Artista {show.artist_id}")
-                return True
-
-            # 3. Disparo Real via WhatsApp (Information Push)
-            # Retira o peso do produtor ser o "mensageiro"
-            from app.services.whatsapp_service import send_whatsapp_message
-
-            for member in crew_members:
-                if not member.phone:
-                    logger.warning(f"[Information Push] Membro {member.name} não possui telefone cadastrado.")
-                    continue
-
-                try:
-                    # --- SMART SHARE: Vinculação de Equipe ---
-                    # Garante que o membro está na tabela de rastreio para este show
-                    stmt_check_assignment = select(ShowCrew).where(
-                        ShowCrew.show_id == show_uuid,
-                        ShowCrew.crew_member_id == member.id
-                    )
-                    res_assignment = await db.execute(stmt_check_assignment)
-                    assignment = res_assignment.scalar_one_or_none()
-
-                    if not assignment:
-                        assignment = ShowCrew(
-                            show_id=show_uuid,
-                            crew_member_id=member.id,
-                            tenant_id=tenant_uuid
-                        )
-                        db.add(assignment)
-                        await db.commit()
-                        await db.refresh(assignment)
-
-                    # --- Geração do Link com Rastreador (Param 'token') ---
-                    magic_link = f"https://managershow.vimasistemas.com.br/daysheet/{show_id}?token={assignment.token}"
-                    
-                    message = (
-                        f"Olá {member.name.split()[0]}, o roteiro do show em {show.location_city} "
-                        f"já está liberado! 🚀\n\nAcesse agora: {magic_link}"
-                    )
-
-                    await send_whatsapp_message(
-                        phone=member.phone,
-                        message=message,
-                        db=db
-                    )
-                except Exception as e:
-                    logger.error(f"[Information Push] Falha ao notificar membro via WhatsApp {member.id}: {str(e)}")
-
-                try:
-                    # --- NATIVE PUSH: Firebase Cloud Messaging ---
-                    # Além do WhatsApp, envia um Push Notification para todos os Devices (FCM) logados deste membro
-                    from app.models.device_token import DeviceToken
-                    from app.services.fcm_service import FCMService
-
-                    stmt_devices = select(DeviceToken.fcm_token).where(DeviceToken.user_id == member.user_id)
-                    res_devices = await db.execute(stmt_devices)
-                    tokens = res_devices.scalars().all()
-
-                    if tokens:
-                        # Inicializa FCM (noop se já estiver inicializado)
-                        FCMService.initialize()
-
-                        push_title = f"Roteiro Liberado: {show.location_city}"
-                        push_body = f"Toque para visualizar sua passagem e hotel atualizados."
-                        
-                        # Disparo em massa para todos os aparelhos do músico
-                        FCMService.send_multicast_notification(
-                            tokens=list(tokens),
-                            title=push_title,
-                            body=push_body,
-                            data={"show_id": str(show_id), "type": "route_published"}
-                        )
-                except Exception as e:
-                    logger.error(f"[Information Push] Falha ao enviar Native Push (FCM) para {member.id}: {str(e)}")
-
-            logger.info(f"[Information Push] Notificações concluídas com sucesso para o show em {show.location_city}.")
-            return True
-
+            sent = await send_daysheet_notifications(db, show_id, tenant_id)
+            await db.commit()
+            return sent
         except Exception as e:
+            await db.rollback()
             logger.error(f"[Information Push] Erro crítico na task: {str(e)}")
             raise e
+
+
+async def send_daysheet_notifications(
+    db: AsyncSession,
+    show_id: str,
+    tenant_id: str,
+    message: OutboxMessage | None = None,
+) -> bool:
+    """
+    Busca a equipe do artista vinculada ao show e dispara as notificações
+    (WhatsApp + Push) com o Link Mágico do Roteiro.
+    Não faz commit: as escritas (vínculos ShowCrew) ficam na transação do chamador.
+
+    Com `message` (entrega via outbox), destinatários já atendidos em
+    tentativas anteriores são pulados e os atendidos agora são registrados.
+    Falhas reais de entrega levantam PartialDeliveryError só com os que falharam.
+    """
+    logger.info(f"[Information Push] Iniciando notificações para Show {show_id} (Tenant {tenant_id})")
+
+    from app.services.fcm_service import FCMService
+    from app.services.whatsapp_queue import WhatsAppLane, WhatsAppQueue
+    from app.services.whatsapp_service import get_whatsapp_config
+
+    # =================================================================
+    # FASE 1 — Lote (banco)
+    # =================================================================
+
+    # 1. Busca o Show e valida existência
+    show_uuid = uuid.UUID(show_id)
+    tenant_uuid = uuid.UUID(tenant_id)
+
+    stmt_show = select(Show).where(Show.id == show_uuid, Show.tenant_id == tenant_uuid)
+    result_show = await db.execute(stmt_show)
+    show = result_show.scalar_one_or_none()
+
+    if not show:
+        logger.error(f"[Information Push] Erro: Show {show_id} não encontrado ou acesso negado.")
+        return False
+
+    # 2. Busca membros ativos da equipe do artista
+    stmt_crew = select(ArtistCrew).where(
+        ArtistCrew.artist_id == show.artist_id,
+        ArtistCrew.tenant_id == tenant_uuid,
+        ArtistCrew.is_active == True
+    )
+    result_crew = await db.execute(stmt_crew)
+    crew_members = result_crew.scalars().all()
+
+    if not crew_members:
+        logger.warning(f"[Information Push] Nenhum membro de equipe ativo encontrado para o Artista {show.artist_id}")
+        return True
+
+    # 3. SMART SHARE: vínculos de rastreio de toda a equipe em um único UPSERT.
+    # DO UPDATE (no-op) para que o RETURNING traga também os vínculos já existentes.
+    stmt_upsert = pg_insert(ShowCrew).values([
+        {"id": uuid.uuid4(), "show_id": show_uuid, "crew_member_id": m.id, "tenant_id": tenant_uuid, "token": uuid.uuid4()}
+        for m in crew_members
+    ])
+    stmt_upsert = stmt_upsert.on_conflict_do_update(
+        constraint="uq_show_crews_show_member",
+        set_={"crew_member_id": stmt_upsert.excluded.crew_member_id},
+    ).returning(ShowCrew.id, ShowCrew.crew_member_id, ShowCrew.token)
+    assignments = {row.crew_member_id: row for row in await db.execute(stmt_upsert)}
+
+    # 4. NATIVE PUSH: todos os device tokens da equipe em uma única query
+    user_ids = [m.user_id for m in crew_members if m.user_id]
+    assignment_ids = [a.id for a in assignments.values()]
+    stmt_devices = select(DeviceToken.fcm_token).where(
+        DeviceToken.tenant_id == tenant_uuid,
+        or_(
+            DeviceToken.user_id.in_(user_ids),
+            DeviceToken.crew_member_id.in_(assignment_ids),
+        ),
+    )
+    tokens = list(dict.fromkeys((await db.execute(stmt_devices)).scalars().all()))
+
+    # 5. Configuração da Evolution API e cota do tenant (uma vez por disparo)
+    whatsapp_config = await get_whatsapp_config(db)
+    whatsapp_enabled = bool(
+        whatsapp_config and whatsapp_config.is_whatsapp_active and whatsapp_config.evolution_instance_name
+    )
+    quota = await WhatsAppQueue.daily_quota(db, tenant_uuid) if whatsapp_enabled else 0
+
+    await db.flush()
+
+    # =================================================================
+    # FASE 2 — Envio (WhatsApp via fila da instância, Push em lote)
+    # =================================================================
+    done = await OutboxService.delivered(db, message) if message else set()
+    push_tokens = [t for t in tokens if f"push:{t}" not in done]
+    pending_members = [m for m in crew_members if f"whatsapp:{m.id}" not in done]
+
+    async def _notify_whatsapp(member: ArtistCrew) -> bool:
+        """True = na fila; False = sem canal para o membro. Exceção = falha (retry)."""
+        if not whatsapp_enabled:
+            return False
+        if not member.phone:
+            logger.warning(f"[Information Push] Membro {member.name} não possui telefone cadastrado.")
+            return False
+
+        # --- Geração do Link com Rastreador (Param 'token') ---
+        magic_link = f"https://managershow.vimasistemas.com.br/daysheet/{show_id}?token={assignments[member.id].token}"
+
+        text = (
+            f"Olá {member.name.split()[0]}, o roteiro do show em {show.location_city} "
+            f"já está liberado! 🚀\n\nAcesse agora: {magic_link}"
+        )
+        queued = await WhatsAppQueue.enqueue(
+            whatsapp_config.evolution_instance_name,
+            tenant_uuid,
+            member.phone,
+            text,
+            lane=WhatsAppLane.DAYSHEET,
+            quota=quota,
+        )
+        if not queued:
+            raise RuntimeError(f"cota diária de WhatsApp ({quota}) atingida")
+        return True
+
+    async def _notify_push() -> dict | None:
+        if not push_tokens:
+            return None
+        # Mesma mensagem para toda a equipe: lotes de até 500 tokens, tokens mortos removidos
+        return await FCMService.push_to_tenant(
+            db,
+            tenant_uuid,
+            push_tokens,
+            title=f"Roteiro Liberado: {show.location_city}",
+            body="Toque para visualizar sua passagem e hotel atualizados.",
+            data={"show_id": str(show_id), "type": "route_published"},
+        )
+
+    results = await asyncio.gather(
+        _notify_push(),
+        *(_notify_whatsapp(m) for m in pending_members),
+        return_exceptions=True,
+    )
+
+    push_result, whatsapp_results = results[0], results[1:]
+    delivered: list[str] = []
+    failed: dict[str, str] = {}
+
+    if isinstance(push_result, Exception):
+        logger.error(f"[Information Push] Falha ao enviar Native Push (FCM): {str(push_result)}")
+        failed.update({f"push:{t}": str(push_result) for t in push_tokens})
+    else:
+        # Tokens mortos já foram removidos: só as falhas transitórias voltam.
+        # Sem resultado do FCM nada foi enviado: todos os tokens falharam.
+        retry_tokens = set(push_result["failed_tokens"]) if push_result else set(push_tokens)
+        for token in push_tokens:
+            if token in retry_tokens:
+                failed[f"push:{token}"] = "falha FCM"
+            else:
+                delivered.append(f"push:{token}")
+
+    for member, queued in zip(pending_members, whatsapp_results):
+        if isinstance(queued, Exception):
+            logger.error(f"[Information Push] Falha ao enfileirar WhatsApp do membro {member.id}: {str(queued)}")
+            failed[f"whatsapp:{member.id}"] = str(queued)
+        elif queued:
+            delivered.append(f"whatsapp:{member.id}")
+
+    if message:
+        await OutboxService.record_delivery(db, message, delivered)
+    if failed:
+        # O outbox reagenda com backoff apenas os destinatários que falharam
+        raise PartialDeliveryError(failed)
+
+    queued_count = sum(1 for r in whatsapp_results if r is True)
+    logger.info(
+        f"[Information Push] Notificações concluídas para o show em {show.location_city}: "
+        f"{queued_count}/{len(pending_members)} WhatsApp na fila, {len(push_tokens)} device(s) push."
+    )
+    return True
+
+
+@celery_app.task(name="poll_evolution_instance_state")
+@async_to_sync
+async def poll_evolution_instance_state():
+    """
+    Health poller da Evolution API: publica o connectionState da instância
+    no Redis (lido pela tela de configurações da Retaguarda).
+    """
+    from app.services.system_settings_service import SystemSettingsService
+
+    async with async_session_factory() as db:
+        config = await SystemSettingsService.get_whatsapp_config(db)
+    state = await SystemSettingsService.refresh_instance_state(config)
+    if state["status"] not in ("CONNECTED", "NOT_CONFIGURED"):
+        logger.warning(f"[Information Push] Instância Evolution com status {state['status']}.")
+    return state["status"]
+
+
+@celery_app.task(name="drain_whatsapp_queue")
+@async_to_sync
+async def drain_whatsapp_queue(instance: str):
+    """
+    Consumidor da fila WhatsApp de uma instância Evolution. Só roda um por
+    instância (lock `wa:drain`), respeitando o token bucket distribuído,
+    a prioridade das lanes e as pausas pedidas via Retry-After.
+    """
+    from app.services.whatsapp_queue import DRAIN_LOCK_TTL, WhatsAppQueue
+    from app.services.whatsapp_service import deliver_whatsapp_text, get_whatsapp_config
+
+    lock_key = WhatsAppQueue.drain_lock_key(instance)
+    deadline = time.monotonic() + DRAIN_MAX_SECONDS
+    sent = 0
+    try:
+        async with async_session_factory() as db:
+            config = await get_whatsapp_config(db)
+        if not config or not config.is_whatsapp_active or config.evolution_instance_name != instance:
+            logger.warning(f"[WhatsApp Queue] Instância {instance} inativa ou não configurada. Fila retida.")
+            return 0
+
+        while time.monotonic() < deadline:
+            await redis_client.expire(lock_key, DRAIN_LOCK_TTL)
+
+            paused = await WhatsAppQueue.paused_for(instance)
+            if paused:
+                await asyncio.sleep(min(paused, max(deadline - time.monotonic(), 0)))
+                continue
+
+            job = await WhatsAppQueue.dequeue(instance)
+            if job is None:
+                break
+
+            lane, dest, items = job
+            phone = dest.split(":", 1)[1]
+            ok, retry_after = await deliver_whatsapp_text(config, phone, WhatsAppQueue.coalesce(items))
+            if ok:
+                sent += len(items)
+                continue
+
+            dropped = await WhatsAppQueue.requeue(instance, lane, dest, items, front=retry_after is not None)
+            if dropped:
+                await _dead_letter_whatsapp(instance, lane, dest, dropped)
+            if retry_after:
+                await WhatsAppQueue.pause(instance, retry_after)
+    finally:
+        await redis_client.delete(lock_key)
+
+    # Sobrou mensagem (prazo da execução ou corrida com um enqueue): reagenda
+    if await WhatsAppQueue.pending_count(instance):
+        await WhatsAppQueue.kick(instance)
+    if sent:
+        logger.info(f"[WhatsApp Queue] {sent} mensagem(ns) enviada(s) pela instância {instance}.")
+    return sent
+
+
+async def _dead_letter_whatsapp(instance: str, lane, dest: str, items: list[dict]) -> None:
+    """Registra no dead-letter do outbox os textos descartados pela fila."""
+    tenant_id, phone = dest.split(":", 1)
+    async with async_session_factory() as db:
+        await OutboxService.dead_letter(
+            db,
+            uuid.UUID(tenant_id),
+            WHATSAPP_UNDELIVERED_TOPIC,
+            {"instance": instance, "lane": lane.value, "phone": phone, "texts": [i["text"] for i in items]},
+            f"Envio pela Evolution falhou {items[0]['attempts']} vez(es); texto retirado da fila do WhatsApp",
+        )
+        await db.commit()
+
+
+@celery_app.task(name="kick_whatsapp_queue")
+@async_to_sync
+async def kick_whatsapp_queue():
+    """Rede de segurança do Beat: acorda o consumidor se houver fila parada."""
+    from app.services.whatsapp_queue import WhatsAppQueue
+    from app.services.whatsapp_service import get_whatsapp_config
+
+    async with async_session_factory() as db:
+        config = await get_whatsapp_config(db)
+    if config and config.is_whatsapp_active and config.evolution_instance_name:
+        if await WhatsAppQueue.pending_count(config.evolution_instance_name):
+            await WhatsAppQueue.kick(config.evolution_instance_name)
+
+
+@celery_app.task(name="flush_read_receipts")
+@async_to_sync
+async def flush_read_receipts():
+    """
+    Persiste em show_crews, em lotes, as leituras do roteiro registradas
+    no Redis pelo pixel público (ReadReceiptService.record).
+    """
+    from app.services.read_receipt_service import FLUSH_BATCH_SIZE, ReadReceiptService
+
+    total = 0
+    async with async_session_factory() as db:
+        try:
+            while True:
+                flushed = await ReadReceiptService.flush(db, FLUSH_BATCH_SIZE)
+                await db.commit()
+                total += flushed
+                if flushed < FLUSH_BATCH_SIZE:
+                    break
+            return total
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Information Push] Erro ao persistir read receipts: {str(e)}")
+            raise e
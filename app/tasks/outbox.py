@@ -0,0 +1,52 @@
+"""
+Manager Show — Tasks: Outbox (Relay + Entrega)
+Drena a tabela outbox_messages para o Celery e executa os handlers.
+"""
+
+import logging
+import uuid
+
+from app.celery_app import celery_app
+from app.core.celery_utils import async_to_sync
+from app.database import async_session_factory
+from app.services.outbox_service import RELAY_BATCH_SIZE, OutboxService
+
+logger = logging.getLogger(__name__)
+
+# Limite de lotes por execução do relay (o Beat chama de novo em seguida)
+MAX_BATCHES_PER_RUN = 10
+
+@celery_app.task(name="relay_outbox")
+@async_to_sync
+async def relay_outbox():
+    """Publica no broker as mensagens pendentes/vencidas, em lotes."""
+    total = 0
+    async with async_session_factory() as db:
+        try:
+            for _ in range(MAX_BATCHES_PER_RUN):
+                published = await OutboxService.relay_batch(db, RELAY_BATCH_SIZE)
+                total += published
+                if published < RELAY_BATCH_SIZE:
+                    break
+            if total:
+                logger.info(f"[Outbox] Relay publicou {total} mensagem(ns).")
+            return total
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Outbox] Erro crítico no relay: {str(e)}")
+            raise e
+
+
+@celery_app.task(name="deliver_outbox_message")
+@async_to_sync
+async def deliver_outbox_message(message_id: str):
+    """Entrega uma mensagem do outbox (handler registrado para o tópico)."""
+    async with async_session_factory() as db:
+        try:
+            status = await OutboxService.deliver(db, uuid.UUID(message_id))
+            await db.commit()
+            return status.value if status else None
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Outbox] Erro crítico na entrega {message_id}: {str(e)}")
+            raise e
@@ -0,0 +1,71 @@
+"""
+Manager Show — Tasks: Storage (Manutenção do S3/Minio)
+Rotinas periódicas do storage content-addressed.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+from app.core.celery_utils import async_to_sync
+from app.core.storage_refs import recount_references
+from app.database import async_session_factory
+from app.services.s3_service import S3Service
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+@celery_app.task(name="collect_unreferenced_objects")
+@async_to_sync
+async def collect_unreferenced_objects():
+    """
+    Garbage Collector do storage: apaga do bucket e do índice os
+    objetos cujo ref_count chegou a zero (após o período de carência).
+    """
+    async with async_session_factory() as db:
+        try:
+            removed = await S3Service.collect_garbage(db)
+            await db.commit()
+            return removed
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Storage GC] Erro crítico na task: {str(e)}")
+            raise e
+
+
+@celery_app.task(name="recount_storage_references")
+@async_to_sync
+async def recount_storage_references():
+    """
+    Recontagem do ref_count: corrige o que o hook de flush não vê
+    (ON DELETE CASCADE do banco e delete()/update() em lote).
+    """
+    async with async_session_factory() as db:
+        try:
+            fixed = await recount_references(db)
+            await db.commit()
+            if fixed:
+                logger.warning(f"[Storage GC] ref_count corrigido em {fixed} objeto(s).")
+            return fixed
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Storage GC] Erro crítico na recontagem: {str(e)}")
+            raise e
+
+
+@celery_app.task(name="reconcile_storage_usage")
+@async_to_sync
+async def reconcile_storage_usage():
+    """
+    Reconciliação do ledger de storage com a listagem real dos buckets
+    (list_objects_v2 paginado, buckets em paralelo).
+    """
+    async with async_session_factory() as db:
+        try:
+            drifts = await StorageService.reconcile_usage(db)
+            await db.commit()
+            logger.info(f"[QUOTA] Reconciliação concluída. {len(drifts)} tenant(s) com divergência.")
+            return drifts
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[QUOTA] Erro crítico na reconciliação: {str(e)}")
+            raise e
@@ -0,0 +1,651 @@
+"""
+Manager Show — Gerador de Dataset Sintético (Benchmarks / Ensaios de Migração)
+
+Popula o PostgreSQL com agências na escala real de produção — dezenas
+de artistas, uma década de shows, centenas de milhares de lançamentos
+no ledger e milhares de check-ins — em minutos, via COPY (psycopg2).
+
+Distribuições realistas:
+- Cidades/UFs ponderadas (peso do Nordeste no mercado de shows).
+- Sazonalidade: pico de São João (junho), verão/Carnaval, fins de semana.
+- Mercado público (prefeituras) ~40%, com status de pagamento coerentes
+  com a idade do show (empenho → liquidação → pago).
+- Cachês log-normais por artista (poucos artistas "âncora" caros).
+- Tipos de negociação, custos por categoria e timeline do Day Sheet.
+
+Reprodutível: a mesma --seed gera os mesmos IDs e valores. Use
+--replace para apagar (CASCADE) as agências geradas antes com a mesma seed.
+
+Pré-requisito: schema migrado (alembic upgrade head).
+
+Execução:
+    python -m scripts.generate_dataset --preset large --seed 42
+    python -m scripts.generate_dataset --tenants 2 --artists 10 --years 3 --ledger-rows 50000
+"""
+
+import argparse
+import csv
+import enum
+import io
+import json
+import math
+import random
+import time as time_module
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import Table, create_engine
+
+from app.config import get_settings
+from app.models.artist import Artist
+from app.models.artist_crew import ArtistCrew
+from app.models.commission import Commission, CommissionBase
+from app.models.contractor import Contractor
+from app.models.financial_transaction import (
+    FinancialTransaction,
+    PublicPaymentStatus,
+    TransactionCategory,
+    TransactionType,
+)
+from app.models.logistics_timeline import LogisticsTimeline
+from app.models.role import DEFAULT_PERMISSIONS, Role
+from app.models.show import ClientType, NegotiationType, Show, ShowStatus
+from app.models.show_checkin import ShowCheckin
+from app.models.show_crew import ShowCrew
+from app.models.tenant import Tenant, TenantStatus
+from app.models.user import User
+from app.models.venue import Venue
+
+settings = get_settings()
+
+PRESETS = {
+    "small": {"tenants": 1, "artists": 5, "years": 2, "ledger_rows": 20_000, "checkins": 500},
+    "medium": {"tenants": 2, "artists": 15, "years": 5, "ledger_rows": 150_000, "checkins": 3_000},
+    "large": {"tenants": 1, "artists": 30, "years": 10, "ledger_rows": 500_000, "checkins": 10_000},
+}
+
+COPY_CHUNK_ROWS = 50_000
+NULL = r"\N"
+
+# (cidade, UF, peso) — mercado de shows concentrado no NE/SE
+CITIES = [
+    ("Caruaru", "PE", 6), ("Recife", "PE", 8), ("Campina Grande", "PB", 6), ("João Pessoa", "PB", 4),
+    ("Salvador", "BA", 8), ("Feira de Santana", "BA", 3), ("Fortaleza", "CE", 7), ("Juazeiro do Norte", "CE", 2),
+    ("Natal", "RN", 3), ("Mossoró", "RN", 3), ("Maceió", "AL", 3), ("Aracaju", "SE", 3), ("Teresina", "PI", 2),
+    ("São Luís", "MA", 2), ("Petrolina", "PE", 3), ("São Paulo", "SP", 9), ("Campinas", "SP", 3),
+    ("Ribeirão Preto", "SP", 3), ("Barretos", "SP", 2), ("Rio de Janeiro", "RJ", 6), ("Belo Horizonte", "MG", 5),
+    ("Uberlândia", "MG", 2), ("Goiânia", "GO", 5), ("Brasília", "DF", 4), ("Cuiabá", "MT", 2),
+    ("Campo Grande", "MS", 2), ("Curitiba", "PR", 3), ("Londrina", "PR", 2), ("Porto Alegre", "RS", 2),
+    ("Florianópolis", "SC", 2), ("Belém", "PA", 3), ("Manaus", "AM", 2),
+]
+# Jan..Dez — verão/Carnaval e São João (junho) concentram a agenda
+MONTH_WEIGHTS = [9, 10, 6, 6, 7, 16, 8, 6, 6, 7, 8, 11]
+# Seg..Dom
+WEEKDAY_WEIGHTS = [2, 2, 3, 6, 14, 18, 9]
+GENRES = ["Sertanejo", "Forró", "Piseiro", "Pagode", "Axé", "Funk", "Arrocha", "MPB", "Brega", "Gospel"]
+CREW_ROLES = ["Músico", "Técnico de Som", "Roadie", "Iluminador", "Produtor de Estrada", "Backing Vocal", "Segurança"]
+NEGOTIATION_WEIGHTS = {
+    NegotiationType.CACHE_MAIS_DESPESAS: 40,
+    NegotiationType.COLOCADO_TOTAL: 30,
+    NegotiationType.CACHE_MAIS_AEREO: 22,
+    NegotiationType.PERSONALIZADO: 8,
+}
+FUTURE_STATUS_WEIGHTS = {
+    ShowStatus.SONDAGEM: 25,
+    ShowStatus.PROPOSTA: 25,
+    ShowStatus.CONTRATO_PENDENTE: 15,
+    ShowStatus.ASSINADO: 20,
+    ShowStatus.PRE_PRODUCAO: 15,
+}
+COST_CATEGORIES = {
+    TransactionType.PRODUCTION_COST: [
+        TransactionCategory.CREW_PAYMENT, TransactionCategory.BACKLINE,
+        TransactionCategory.SOUND_LIGHT, TransactionCategory.STAGE,
+    ],
+    TransactionType.LOGISTICS_COST: [
+        TransactionCategory.FLIGHT, TransactionCategory.BUS, TransactionCategory.HOTEL,
+        TransactionCategory.VAN_TRANSFER, TransactionCategory.MEALS,
+    ],
+}
+TIMELINE_TEMPLATE = [
+    (time(7, 0), "Saída para o Aeroporto", "van"),
+    (time(9, 30), "Voo", "flight"),
+    (time(13, 0), "Check-in no Hotel", "hotel"),
+    (time(16, 0), "Passagem de Som", "soundcheck"),
+    (time(19, 0), "Jantar da Equipe", "meal"),
+    (time(22, 0), "SHOW", "show"),
+    (time(0, 30), "Retorno ao Hotel", "van"),
+]
+
+
+class Generator:
+    """Gera as linhas de cada tabela de forma determinística a partir da seed."""
+
+    def __init__(self, seed: int, today: date):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.today = today
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def weighted(self, options: dict):
+        return self.rng.choices(list(options), weights=list(options.values()))[0]
+
+    def money(self, value: float) -> Decimal:
+        return Decimal(str(round(value, 2)))
+
+    def show_date(self, start: date, end: date) -> date:
+        """Data com sazonalidade mensal e concentração em fins de semana."""
+        while True:
+            year = self.rng.randint(start.year, end.year)
+            month = self.rng.choices(range(1, 13), weights=MONTH_WEIGHTS)[0]
+            day = self.rng.randint(1, 28)
+            candidate = date(year, month, day)
+            weekday_weight = WEEKDAY_WEIGHTS[candidate.weekday()] / max(WEEKDAY_WEIGHTS)
+            if start <= candidate <= end and self.rng.random() < weekday_weight:
+                return candidate
+
+    def at(self, day: date, hour: int = 12) -> datetime:
+        return datetime.combine(day, time(hour, self.rng.randint(0, 59)), tzinfo=timezone.utc)
+
+
+# =============================================================================
+# COPY
+# =============================================================================
+
+def _encode(value) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _column_defaults(table: Table) -> dict:
+    """Defaults do lado Python (COPY não os aplica; server_default sim)."""
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if default is None:
+            continue
+        if default.is_scalar:
+            defaults[column.name] = lambda arg=default.arg: arg
+        elif default.is_callable:
+            defaults[column.name] = lambda fn=default.arg: fn(None)
+    return defaults
+
+
+def _copy_columns(table: Table, first_row: dict) -> list[str]:
+    """
+    Colunas do COPY a partir do schema (não só da primeira linha): linhas
+    com chaves diferentes — ex.: pagamento público só em parte da receita —
+    recebem o default Python ou NULL. Colunas só com server_default entram
+    apenas se a primeira linha as trouxer; fora disso o banco as preenche.
+    """
+    return [
+        column.name
+        for column in table.columns
+        if column.name in first_row or column.default is not None or column.server_default is None
+    ]
+
+
+def copy_rows(raw_conn, model, rows: Iterable[dict]) -> int:
+    """COPY em blocos de COPY_CHUNK_ROWS; completa colunas com default Python ou NULL."""
+    table = model.__table__
+    defaults = _column_defaults(table)
+    columns: list[str] | None = None
+    total = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> None:
+        buffer.seek(0)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        with raw_conn.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL \'{NULL}\')',
+                buffer,
+            )
+        buffer.seek(0)
+        buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        if columns is None:
+            columns = _copy_columns(table, row)
+        writer.writerow([
+            _encode(row[c]) if c in row else _encode(defaults[c]() if c in defaults else None)
+            for c in columns
+        ])
+        pending += 1
+        total += 1
+        if pending >= COPY_CHUNK_ROWS:
+            flush()
+            pending = 0
+    if pending:
+        flush()
+    return total
+
+
+# =============================================================================
+# Geração por agência
+# =============================================================================
+
+def generate_tenant(gen: Generator, index: int, args) -> dict:
+    """
+    Cadastros da agência (listas) + geradores das tabelas volumosas,
+    indexados pelo model; "admin_id" traz o usuário para o X-Dev-User-Id.
+    """
+    rng = gen.rng
+    tenant_id = gen.uuid()
+    created = gen.at(gen.today - timedelta(days=365 * args.years + 30))
+    stamp = {"created_at": created, "updated_at": created}
+
+    tenant = {
+        "id": tenant_id,
+        "name": f"Agência Sintética {args.seed}-{index + 1}",
+        "email": f"agencia{index + 1}.seed{args.seed}@synthetic.managershow.dev",
+        "status": TenantStatus.ACTIVE,
+        "account_type": "AGENCY",
+        "plan_type": "Enterprise",
+        "is_onboarded": True,
+        "users_limit": 500,
+        "subscription_expires_at": gen.at(gen.today + timedelta(days=365)),
+        **stamp,
+    }
+
+    admin_permissions = {key: True for key in {**DEFAULT_PERMISSIONS, "is_admin": True}}
+    roles = {
+        name: {"id": gen.uuid(), "tenant_id": tenant_id, "name": name, "permissions": permissions, **stamp}
+        for name, permissions in (("Admin", admin_permissions), ("Músico", dict(DEFAULT_PERMISSIONS)))
+    }
+
+    def user(name: str, role: str) -> dict:
+        user_id = gen.uuid()
+        return {
+            "id": user_id,
+            "tenant_id": tenant_id,
+            "clerk_id": f"synthetic_{user_id.hex[:20]}",
+            "email": f"{user_id.hex[:12]}@synthetic.managershow.dev",
+            "name": name,
+            "role_id": roles[role]["id"],
+            "is_active": True,
+            "has_global_artist_access": role == "Admin",
+            **stamp,
+        }
+
+    users = [user("Admin Sintético", "Admin")]
+    admin_id = users[0]["id"]
+
+    artists, crews = [], []
+    crew_by_artist: dict[uuid.UUID, list[dict]] = {}
+    for n in range(args.artists):
+        artist_id = gen.uuid()
+        artists.append({
+            "id": artist_id,
+            "tenant_id": tenant_id,
+            "name": f"Artista {n + 1:02d} ({rng.choice(GENRES)})",
+            "genre": rng.choice(GENRES),
+            **stamp,
+        })
+        members = []
+        for m in range(rng.randint(8, 16)):
+            linked = rng.random() < 0.5
+            member_user = user(f"Equipe {n + 1:02d}-{m + 1:02d}", "Músico") if linked else None
+            if member_user:
+                users.append(member_user)
+            members.append({
+                "id": gen.uuid(),
+                "tenant_id": tenant_id,
+                "artist_id": artist_id,
+                "name": f"Equipe {n + 1:02d}-{m + 1:02d}",
+                "role": rng.choice(CREW_ROLES),
+                "base_cache": gen.money(rng.uniform(300, 2500)),
+                "base_diaria": gen.money(rng.uniform(80, 300)),
+                "is_active": True,
+                "phone": f"55{rng.randint(11, 99)}9{rng.randint(10_000_000, 99_999_999)}",
+                "user_id": member_user["id"] if member_user else None,
+                **stamp,
+            })
+        crews.extend(members)
+        crew_by_artist[artist_id] = members
+
+    city_weights = {(city, uf): weight for city, uf, weight in CITIES}
+    contractors, venues = [], []
+    venues_by_city: dict[tuple[str, str], list[dict]] = {}
+    for (city, uf) in city_weights:
+        public = {
+            "id": gen.uuid(), "tenant_id": tenant_id, "name": f"Prefeitura de {city}",
+            "city": city, "uf": uf, **stamp,
+        }
+        private = {
+            "id": gen.uuid(), "tenant_id": tenant_id, "name": f"Eventos {city} Ltda",
+            "city": city, "uf": uf, **stamp,
+        }
+        contractors.extend([public, private])
+        city_venues = [
+            {
+                "id": gen.uuid(), "tenant_id": tenant_id, "name": f"{kind} de {city}",
+                "city": city, "uf": uf, "capacity": capacity, **stamp,
+            }
+            for kind, capacity in (("Pátio de Eventos", 40_000), ("Casa de Shows", 3_000))
+        ]
+        venues.extend(city_venues)
+        venues_by_city[(city, uf)] = [public, private, *city_venues]
+
+    # Shows: volume proporcional ao "peso" do artista (poucos âncoras lotam a agenda)
+    start = gen.today - timedelta(days=365 * args.years)
+    end = gen.today + timedelta(days=180)
+    popularity = [rng.paretovariate(1.8) for _ in artists]
+    target_shows = max(len(artists), args.ledger_rows // 24)
+    per_artist = [max(1, round(target_shows * p / sum(popularity))) for p in popularity]
+
+    shows = []
+    for artist, count, weight in zip(artists, per_artist, popularity):
+        base_fee = 25_000 * min(weight, 8)
+        for _ in range(count):
+            city, uf = gen.weighted(city_weights)
+            public_contractor, private_contractor, big_venue, small_venue = venues_by_city[(city, uf)]
+            client_type = ClientType.PUBLIC if rng.random() < 0.4 else ClientType.PRIVATE
+            day = gen.show_date(start, end)
+            past = day < gen.today
+            if past:
+                status = ShowStatus.CONCLUIDO if rng.random() < 0.95 else ShowStatus.EM_ESTRADA
+            else:
+                status = gen.weighted(FUTURE_STATUS_WEIGHTS)
+            venue = big_venue if client_type == ClientType.PUBLIC else rng.choice([big_venue, small_venue])
+            base_price = base_fee * rng.lognormvariate(0, 0.35)
+            kickback = base_price * rng.uniform(0.05, 0.15) if client_type == ClientType.PUBLIC else 0
+            validated = status not in (ShowStatus.SONDAGEM, ShowStatus.PROPOSTA, ShowStatus.CONTRATO_PENDENTE)
+            created_at = gen.at(day - timedelta(days=rng.randint(20, 120)))
+            shows.append({
+                "id": gen.uuid(),
+                "tenant_id": tenant_id,
+                "artist_id": artist["id"],
+                "contractor_id": (public_contractor if client_type == ClientType.PUBLIC else private_contractor)["id"],
+                "venue_id": venue["id"],
+                "status": status,
+                "client_type": client_type,
+                "negotiation_type": gen.weighted(NEGOTIATION_WEIGHTS),
+                "date_show": day,
+                "location_city": city,
+                "location_uf": uf,
+                "location_venue_name": venue["name"],
+                "base_price": gen.money(base_price),
+                "real_cache": gen.money(base_price - kickback),
+                "production_kickback": gen.money(kickback),
+                "tax_percentage": gen.money(rng.choice([5, 6, 8.5, 11.33])),
+                "logistics_budget_limit": gen.money(base_price * rng.uniform(0.1, 0.25)),
+                "contract_validated": validated,
+                "contract_validated_at": created_at + timedelta(days=rng.randint(1, 15)) if validated else None,
+                "contract_validated_by": admin_id if validated else None,
+                "road_closed": status == ShowStatus.CONCLUIDO,
+                "road_closed_at": gen.at(day + timedelta(days=1)) if status == ShowStatus.CONCLUIDO else None,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+
+    return {
+        "admin_id": admin_id,
+        Tenant: [tenant],
+        Role: list(roles.values()),
+        User: users,
+        Artist: artists,
+        ArtistCrew: crews,
+        Contractor: contractors,
+        Venue: venues,
+        Show: shows,
+        FinancialTransaction: ledger_rows(gen, shows, args.ledger_rows),
+        Commission: commission_rows(gen, shows),
+        LogisticsTimeline: timeline_rows(gen, shows),
+        ShowCrew: crew_rows(gen, shows, crew_by_artist),
+        ShowCheckin: checkin_rows(gen, shows, crew_by_artist, args.checkins),
+    }
+
+
+def ledger_rows(gen: Generator, shows: list[dict], target: int) -> Iterator[dict]:
+    """Receita, imposto, comissões, custos por categoria e extras (~target linhas)."""
+    rng = gen.rng
+    per_show = target / max(len(shows), 1)
+    for show in shows:
+        validated = show["contract_validated"]
+        base = float(show["base_price"])
+        public = show["client_type"] == ClientType.PUBLIC
+        created = show["created_at"]
+
+        def row(tx_type, category, budgeted, realized, description, **extra) -> dict:
+            return {
+                "id": gen.uuid(),
+                "tenant_id": show["tenant_id"],
+                "show_id": show["id"],
+                "type": tx_type,
+                "category": category,
+                "description": description,
+                "budgeted_amount": gen.money(budgeted),
+                "realized_amount": gen.money(realized),
+                "is_auto_generated": tx_type in (TransactionType.REVENUE, TransactionType.TAX),
+                "created_at": created,
+                "updated_at": created,
+                **extra,
+            }
+
+        realized = show["status"] == ShowStatus.CONCLUIDO
+        payment = {}
+        if public:
+            payment = public_payment(gen, show["date_show"]) if validated else {}
+        yield row(TransactionType.REVENUE, TransactionCategory.OTHER, base, base if realized else 0, "Cachê", **payment)
+        yield row(TransactionType.TAX, TransactionCategory.TAX_NF, base * float(show["tax_percentage"]) / 100,
+                  base * float(show["tax_percentage"]) / 100 if realized else 0, "Imposto NF")
+        yield row(TransactionType.COMMISSION, TransactionCategory.INTERMEDIARY, base * 0.05,
+                  base * 0.05 if realized else 0, "Comissão do intermediário")
+        if public and float(show["production_kickback"]):
+            kickback = float(show["production_kickback"])
+            yield row(TransactionType.KICKBACK, TransactionCategory.OTHER, kickback,
+                      kickback if realized else 0, "Retorno de produção")
+
+        if not validated:
+            continue
+        # Custos: quantidade em torno da média necessária para atingir o alvo do ledger
+        costs = max(0, round(rng.gauss(per_show - 4, math.sqrt(per_show))))
+        for _ in range(costs):
+            tx_type = TransactionType.PRODUCTION_COST if rng.random() < 0.45 else TransactionType.LOGISTICS_COST
+            category = rng.choice(COST_CATEGORIES[tx_type])
+            budgeted = base * rng.uniform(0.003, 0.03)
+            overrun = rng.lognormvariate(0, 0.12)
+            yield row(tx_type, category, budgeted, budgeted * overrun if realized else 0, category.value.title())
+        if realized and rng.random() < 0.3:
+            yield row(
+                TransactionType.EXTRA_EXPENSE, TransactionCategory.OTHER, 0, rng.uniform(50, 800), "Despesa de estrada"
+            )
+
+
+def public_payment(gen: Generator, show_day: date) -> dict:
+    """Ciclo do mercado público coerente com a idade do show."""
+    rng = gen.rng
+    age = (gen.today - show_day).days
+    if age < 0:
+        status = PublicPaymentStatus.EMPENHADO if rng.random() < 0.5 else PublicPaymentStatus.PENDING_EMPENHO
+    elif age < 30:
+        status = rng.choice([PublicPaymentStatus.EMPENHADO, PublicPaymentStatus.LIQUIDADO])
+    elif age < 120:
+        status = rng.choices([PublicPaymentStatus.LIQUIDADO, PublicPaymentStatus.PAGO], weights=[40, 60])[0]
+    else:
+        status = PublicPaymentStatus.PAGO if rng.random() < 0.97 else PublicPaymentStatus.LIQUIDADO
+
+    empenho_date = (
+        show_day - timedelta(days=rng.randint(5, 40))
+        if status != PublicPaymentStatus.PENDING_EMPENHO else None
+    )
+    liquidation_date = (
+        show_day + timedelta(days=rng.randint(3, 25))
+        if status in (PublicPaymentStatus.LIQUIDADO, PublicPaymentStatus.PAGO) else None
+    )
+    return {
+        "public_payment_status": status,
+        "empenho_date": empenho_date,
+        "empenho_number": f"{show_day.year}NE{rng.randint(1, 99999):05d}" if empenho_date else None,
+        "liquidation_date": liquidation_date,
+    }
+
+
+def commission_rows(gen: Generator, shows: list[dict]) -> Iterator[dict]:
+    for show in shows:
+        if not show["contract_validated"]:
+            continue
+        for name, base, percentage in (
+            ("Escritório", CommissionBase.NET, 15), ("Intermediário", CommissionBase.GROSS, 5),
+        ):
+            yield {
+                "id": gen.uuid(),
+                "tenant_id": show["tenant_id"],
+                "show_id": show["id"],
+                "beneficiary_name": name,
+                "commission_base": base,
+                "percentage": gen.money(percentage),
+                "created_at": show["created_at"],
+                "updated_at": show["created_at"],
+            }
+
+
+def timeline_rows(gen: Generator, shows: list[dict]) -> Iterator[dict]:
+    """Day Sheet para shows em pré-produção, estrada ou concluídos."""
+    rng = gen.rng
+    eligible = {ShowStatus.PRE_PRODUCAO, ShowStatus.EM_ESTRADA, ShowStatus.CONCLUIDO}
+    for show in shows:
+        if show["status"] not in eligible:
+            continue
+        steps = TIMELINE_TEMPLATE if rng.random() < 0.6 else rng.sample(TIMELINE_TEMPLATE, rng.randint(4, 6))
+        for order, (at, title, icon) in enumerate(sorted(steps, key=TIMELINE_TEMPLATE.index), start=1):
+            yield {
+                "id": gen.uuid(),
+                "tenant_id": show["tenant_id"],
+                "show_id": show["id"],
+                "time": at,
+                "title": title,
+                "description": f"{title} — {show['location_city']}/{show['location_uf']}",
+                "icon_type": icon,
+                "order": order,
+                "created_at": show["created_at"],
+                "updated_at": show["created_at"],
+            }
+
+
+def crew_rows(gen: Generator, shows: list[dict], crew_by_artist: dict) -> Iterator[dict]:
+    """Escala (show_crews) dos shows em estrada/concluídos nos últimos 2 anos."""
+    rng = gen.rng
+    horizon = gen.today - timedelta(days=730)
+    for show in shows:
+        if show["status"] not in (ShowStatus.EM_ESTRADA, ShowStatus.CONCLUIDO) or show["date_show"] < horizon:
+            continue
+        for member in crew_by_artist[show["artist_id"]]:
+            read = rng.random() < 0.85
+            yield {
+                "id": gen.uuid(),
+                "tenant_id": show["tenant_id"],
+                "show_id": show["id"],
+                "crew_member_id": member["id"],
+                "token": gen.uuid(),
+                "read_receipt": read,
+                "read_at": gen.at(show["date_show"] - timedelta(days=rng.randint(0, 5)), 9) if read else None,
+            }
+
+
+def checkin_rows(gen: Generator, shows: list[dict], crew_by_artist: dict, target: int) -> Iterator[dict]:
+    """Check-ins da equipe com usuário vinculado, dos shows mais recentes para trás."""
+    rng = gen.rng
+    produced = 0
+    concluded = sorted(
+        (s for s in shows if s["status"] == ShowStatus.CONCLUIDO), key=lambda s: s["date_show"], reverse=True,
+    )
+    for show in concluded:
+        for member in crew_by_artist[show["artist_id"]]:
+            if produced >= target:
+                return
+            if member["user_id"] is None or rng.random() > 0.9:
+                continue
+            produced += 1
+            yield {
+                "id": gen.uuid(),
+                "tenant_id": show["tenant_id"],
+                "show_id": show["id"],
+                "user_id": member["user_id"],
+                "checked_in_at": gen.at(show["date_show"], rng.randint(14, 20)),
+                "dynamic_data": {"km": rng.randint(0, 900)} if rng.random() < 0.3 else {},
+            }
+
+
+# =============================================================================
+# Execução
+# =============================================================================
+
+# Ordem de carga respeita as FKs
+LOAD_ORDER = [
+    Tenant, Role, User, Artist, ArtistCrew, Contractor, Venue, Show,
+    FinancialTransaction, Commission, LogisticsTimeline, ShowCrew, ShowCheckin,
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Gera um dataset sintético reprodutível de agências grandes.")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--seed", type=int, default=42, help="Mesma seed = mesmo dataset")
+    parser.add_argument("--tenants", type=int)
+    parser.add_argument("--artists", type=int, help="Artistas por agência")
+    parser.add_argument("--years", type=int, help="Anos de histórico de shows")
+    parser.add_argument("--ledger-rows", type=int, help="Lançamentos financeiros (aprox.) por agência")
+    parser.add_argument("--checkins", type=int, help="Check-ins de equipe por agência")
+    parser.add_argument("--today", type=date.fromisoformat, default=date(2026, 1, 1),
+                        help="Data de referência (fixa para reprodutibilidade)")
+    parser.add_argument("--replace", action="store_true", help="Apaga antes as agências desta seed")
+    args = parser.parse_args()
+    for key, value in PRESETS[args.preset].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    return args
+
+
+def generate(args: argparse.Namespace) -> None:
+    engine = create_engine(settings.database_url_sync)
+    gen = Generator(args.seed, args.today)
+    print(f"\n🧪 Dataset sintético — seed={args.seed}, {args.tenants} agência(s), "
+          f"{args.artists} artistas, {args.years} anos, ~{args.ledger_rows:,} lançamentos/agência\n")
+
+    raw_conn = engine.raw_connection()
+    try:
+        for index in range(args.tenants):
+            started = time_module.perf_counter()
+            data = generate_tenant(gen, index, args)
+            tenant_id = data[Tenant][0]["id"]
+            with raw_conn.cursor() as cursor:
+                if args.replace:
+                    cursor.execute("DELETE FROM tenants WHERE id = %s", (str(tenant_id),))
+            for model in LOAD_ORDER:
+                count = copy_rows(raw_conn, model, data[model])
+                print(f"   ✅ {model.__tablename__:<24} {count:>10,}")
+            raw_conn.commit()
+            print(f"   🏁 Agência {tenant_id} em {time_module.perf_counter() - started:.1f}s "
+                  f"— X-Dev-User-Id: {data['admin_id']}\n")
+        # VACUUM fora de transação: mapa de visibilidade como em produção
+        # (index-only scans) e estatísticas atualizadas para o planner
+        raw_conn.dbapi_connection.autocommit = True
+        with raw_conn.cursor() as cursor:
+            cursor.execute("VACUUM (ANALYZE)")
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    generate(parse_args())
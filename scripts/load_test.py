@@ -0,0 +1,432 @@
+"""
+Manager Show — Teste de Carga por Cenário (Noite de Show)
+
+Gerador de carga assíncrono que reproduz o tráfego real contra a API em
+execução: usuários virtuais (VUs) das maiores agências do banco — cada um
+autenticado via X-Dev-User-Id e com o próprio IP (X-Forwarded-For, como
+celulares distintos) — executam um mix ponderado de ações com tempo de
+"pensar" exponencial entre elas.
+
+A concorrência sobe em estágios (--stages). Em cada estágio o harness
+lê o /metrics da API e relata, além de vazão e p50/p95/p99 por ação:
+- pool do banco: saturação máxima e p95 da espera por conexão;
+- event loop: p95 do lag (sentinela managershow_event_loop_lag_seconds);
+- rate limiter: fração de respostas 429.
+O primeiro estágio que estoura um desses limites (ou o SLO de p95, ou para
+de ganhar vazão) é o ponto de saturação, com o gargalo identificado.
+
+Pré-requisitos:
+- API com APP_ENV=development (X-Dev-User-Id) e uvicorn --proxy-headers
+  (padrão; confia no X-Forwarded-For vindo de 127.0.0.1);
+- dataset sintético (as ações gravam check-ins, recibos e sync — use um
+  banco descartável e regenere com `generate_dataset --replace`).
+
+Execução:
+    python -m scripts.load_test --scenario show_night --stages 25,50,100,200,400 --stage-seconds 60
+    python -m scripts.load_test --base-url http://staging:8000 --tenants 3 --output carga.json
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import create_engine, text
+
+from app.config import get_settings
+
+settings = get_settings()
+
+API = "/api/v1/client"
+
+# Ação → peso. Noite de show: equipe sincronizando, fazendo check-in,
+# mandando recibos e abrindo o roteiro público ao mesmo tempo.
+SCENARIOS = {
+    "show_night": {
+        "sync_pull": 30,
+        "public_daysheet": 25,
+        "batch_checkin": 15,
+        "receipt_upload": 10,
+        "daysheet": 12,
+        "sync_push": 8,
+    },
+    "office_hours": {
+        "list_shows": 30,
+        "dre": 15,
+        "analytics_cockpit": 15,
+        "simulate": 15,
+        "daysheet": 10,
+        "sync_pull": 15,
+    },
+}
+
+# Limiares de gargalo
+POOL_SATURATION_LIMIT = 0.9
+POOL_WAIT_P95_LIMIT_MS = 50.0
+LOOP_LAG_P95_LIMIT_MS = 100.0
+RATE_LIMITED_LIMIT = 0.01
+ERROR_RATE_LIMIT = 0.01
+MIN_THROUGHPUT_GAIN = 0.10
+
+RECEIPT_SIZE = 150 * 1024
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+# =============================================================================
+# Usuários virtuais
+# =============================================================================
+
+@dataclass
+class VirtualUser:
+    index: int
+    user_id: str
+    show_id: str
+    timeline_ids: list[str]
+    etag: str | None = None
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "X-Dev-User-Id": self.user_id,
+            "X-Forwarded-For": f"10.{self.index // 65536 % 256}.{self.index // 256 % 256}.{self.index % 256}",
+        }
+
+
+def discover_identities(tenants: int) -> list[dict]:
+    """Usuários ativos e shows "da noite" (mais próximos de hoje) das maiores agências."""
+    engine = create_engine(settings.database_url_sync)
+    identities = []
+    with engine.connect() as conn:
+        tenant_ids = conn.execute(text("""
+            SELECT tenant_id FROM shows GROUP BY tenant_id ORDER BY count(*) DESC LIMIT :n
+        """), {"n": tenants}).scalars().all()
+        for tenant_id in tenant_ids:
+            users = conn.execute(text(
+                "SELECT id FROM users WHERE tenant_id = :tenant AND is_active ORDER BY id"
+            ), {"tenant": tenant_id}).scalars().all()
+            shows = conn.execute(text("""
+                SELECT id FROM shows WHERE tenant_id = :tenant
+                ORDER BY abs(date_show - CURRENT_DATE), id LIMIT 5
+            """), {"tenant": tenant_id}).scalars().all()
+            for show_id in shows:
+                timeline_ids = conn.execute(text(
+                    "SELECT id FROM logistics_timeline WHERE show_id = :show"
+                ), {"show": show_id}).scalars().all()
+                identities += [
+                    {"user_id": str(u), "show_id": str(show_id), "timeline_ids": [str(t) for t in timeline_ids]}
+                    for u in users
+                ]
+    engine.dispose()
+    if not identities:
+        raise SystemExit("Nenhum usuário/show encontrado: gere o dataset (scripts.generate_dataset) antes.")
+    return identities
+
+
+async def run_action(client: httpx.AsyncClient, vu: VirtualUser, action: str) -> httpx.Response:
+    headers = vu.headers
+    if action == "sync_pull":
+        since = int((time.time() - 15 * 60) * 1000)
+        return await client.get(f"{API}/sync/pull", params={"last_pulled_at": since}, headers=headers)
+    if action == "sync_push":
+        payload = {"changes": {"logistics_timeline": {"updated": [
+            {"id": item_id, "description": f"Atualizado offline ({vu.index})"} for item_id in vu.timeline_ids[:2]
+        ]}}}
+        params = {"last_pulled_at": int(time.time() * 1000)}
+        return await client.post(f"{API}/sync/push", params=params, json=payload, headers=headers)
+    if action == "batch_checkin":
+        url = f"{API}/shows/{vu.show_id}/road-closing/checkin"
+        return await client.post(url, json={"user_ids": [vu.user_id]}, headers=headers)
+    if action == "receipt_upload":
+        content = PNG_HEADER + os.urandom(RECEIPT_SIZE)
+        files = {"file": (f"recibo-{vu.index}.png", content, "image/png")}
+        return await client.post(f"{API}/receipts/upload", files=files, headers=headers)
+    if action == "public_daysheet":
+        public_headers = {"X-Forwarded-For": headers["X-Forwarded-For"]}
+        if vu.etag:
+            public_headers["If-None-Match"] = vu.etag
+        response = await client.get(f"/public/daysheet/{vu.show_id}", headers=public_headers)
+        vu.etag = response.headers.get("ETag", vu.etag)
+        return response
+    if action == "daysheet":
+        return await client.get(f"{API}/shows/{vu.show_id}/daysheet/", headers=headers)
+    if action == "list_shows":
+        return await client.get(f"{API}/shows/", params={"page": 1, "page_size": 20}, headers=headers)
+    if action == "dre":
+        return await client.get(f"{API}/shows/{vu.show_id}/dre/", headers=headers)
+    if action == "analytics_cockpit":
+        return await client.get(f"{API}/analytics/performance/artists", headers=headers)
+    if action == "simulate":
+        params = {"city": "Recife", "uf": "PE", "cache": 80000, "flights_count": 6, "days_hotel": 2}
+        return await client.get(f"{API}/shows/simulate", params=params, headers=headers)
+    raise ValueError(f"Ação desconhecida: {action}")
+
+
+# =============================================================================
+# Coleta
+# =============================================================================
+
+@dataclass
+class StageStats:
+    users: int
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Counter = field(default_factory=Counter)
+    timeouts: int = 0
+    pool_saturation: float = 0.0
+    pool_wait_p95_ms: float | None = None
+    loop_lag_p95_ms: float | None = None
+    duration: float = 0.0
+
+    def record(self, action: str, elapsed: float, status: int | None) -> None:
+        self.latencies[action].append(elapsed * 1000)
+        if status is None:
+            self.timeouts += 1
+        else:
+            self.statuses[status] += 1
+
+    @property
+    def requests(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def rate_limited(self) -> float:
+        return self.statuses[429] / self.requests if self.requests else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        errors = self.timeouts + sum(n for status, n in self.statuses.items() if status >= 500)
+        return errors / self.requests if self.requests else 0.0
+
+    def percentile(self, pct: float, action: str | None = None) -> float:
+        samples = sorted(
+            self.latencies[action] if action else [s for values in self.latencies.values() for s in values]
+        )
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+    def bottlenecks(self, slo_p95_ms: float) -> list[str]:
+        found = []
+        if self.rate_limited > RATE_LIMITED_LIMIT:
+            found.append(f"rate limiter ({self.rate_limited:.1%} de 429)")
+        if self.pool_saturation >= POOL_SATURATION_LIMIT or (self.pool_wait_p95_ms or 0) > POOL_WAIT_P95_LIMIT_MS:
+            found.append(
+                f"pool do banco (saturação {self.pool_saturation:.0%}, espera p95 {self.pool_wait_p95_ms or 0:.0f}ms)"
+            )
+        if (self.loop_lag_p95_ms or 0) > LOOP_LAG_P95_LIMIT_MS:
+            found.append(f"event loop (lag p95 {self.loop_lag_p95_ms:.0f}ms)")
+        if self.error_rate > ERROR_RATE_LIMIT:
+            found.append(f"erros ({self.error_rate:.1%} 5xx/timeout)")
+        if not found and self.percentile(95) > slo_p95_ms:
+            found.append(f"latência (p95 {self.percentile(95):.0f}ms > SLO {slo_p95_ms:.0f}ms)")
+        return found
+
+    def to_dict(self, slo_p95_ms: float) -> dict:
+        return {
+            "users": self.users,
+            "requests": self.requests,
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "rate_limited": round(self.rate_limited, 4),
+            "error_rate": round(self.error_rate, 4),
+            "pool_saturation": round(self.pool_saturation, 3),
+            "pool_wait_p95_ms": self.pool_wait_p95_ms,
+            "loop_lag_p95_ms": self.loop_lag_p95_ms,
+            "statuses": dict(self.statuses),
+            "actions": {
+                action: {"count": len(samples), "p95_ms": round(self.percentile(95, action), 1)}
+                for action, samples in sorted(self.latencies.items())
+            },
+            "bottlenecks": self.bottlenecks(slo_p95_ms),
+        }
+
+
+class MetricsScraper:
+    """Lê o /metrics da API: saturação do pool (máxima) e histogramas por estágio."""
+
+    def __init__(self, client: httpx.AsyncClient, token: str):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.available = True
+
+    async def scrape(self) -> dict | None:
+        if not self.available:
+            return None
+        try:
+            response = await self.client.get("/metrics", headers=self.headers)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"   ⚠️  /metrics indisponível ({e}); relatório apenas do lado do cliente")
+            self.available = False
+            return None
+
+        snapshot = {"saturation": 0.0, "pool_wait": {}, "loop_lag": {}}
+        for family in text_string_to_metric_families(response.text):
+            for sample in family.samples:
+                if sample.name == "managershow_db_pool_saturation":
+                    snapshot["saturation"] = max(snapshot["saturation"], sample.value)
+                elif sample.name == "managershow_db_pool_checkout_seconds_bucket":
+                    snapshot["pool_wait"][float(sample.labels["le"])] = sample.value
+                elif sample.name == "managershow_event_loop_lag_seconds_bucket":
+                    snapshot["loop_lag"][float(sample.labels["le"])] = sample.value
+        return snapshot
+
+
+def histogram_quantile(q: float, before: dict, after: dict) -> float | None:
+    """Quantil (ms) do incremento de um histograma entre dois scrapes (interpolação do Prometheus)."""
+    bounds = sorted(after)
+    counts = [after[b] - before.get(b, 0.0) for b in bounds]
+    if not counts or counts[-1] <= 0:
+        return None
+    rank = q * counts[-1]
+    index = bisect.bisect_left(counts, rank)
+    if index >= len(bounds) - 1:
+        return round(bounds[-2] * 1000, 1) if len(bounds) > 1 else None
+    lower = bounds[index - 1] if index > 0 else 0.0
+    below = counts[index - 1] if index > 0 else 0.0
+    in_bucket = counts[index] - below
+    fraction = (rank - below) / in_bucket if in_bucket else 0.0
+    return round((lower + (bounds[index] - lower) * fraction) * 1000, 1)
+
+
+# =============================================================================
+# Execução
+# =============================================================================
+
+async def virtual_user(client, vu: VirtualUser, mix: dict, think_time: float, stats_ref: list, stop: asyncio.Event):
+    rng = random.Random(vu.index)
+    actions, weights = list(mix), list(mix.values())
+    await asyncio.sleep(rng.uniform(0, think_time))  # chegada espalhada
+    while not stop.is_set():
+        action = rng.choices(actions, weights=weights)[0]
+        started = time.perf_counter()
+        try:
+            status = (await run_action(client, vu, action)).status_code
+        except httpx.TimeoutException:
+            status = None
+        except httpx.HTTPError:
+            status = 599  # conexão recusada/resetada
+        stats_ref[0].record(action, time.perf_counter() - started, status)
+        if think_time:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=rng.expovariate(1 / think_time))
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    mix = SCENARIOS[args.scenario]
+    identities = discover_identities(args.tenants)
+    stages = [int(n) for n in args.stages.split(",")]
+    limits = httpx.Limits(max_connections=max(stages) + 10, max_keepalive_connections=max(stages) + 10)
+
+    print(f"\n🔥 Carga '{args.scenario}' contra {args.base_url} — {len(identities)} identidades, "
+          f"estágios {stages} × {args.stage_seconds}s\n")
+
+    results = []
+    stop = asyncio.Event()
+    stats_ref: list[StageStats] = [StageStats(users=0)]
+    tasks: list[asyncio.Task] = []
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        scraper = MetricsScraper(client, args.metrics_token)
+        try:
+            for users in stages:
+                # Sobe a concorrência sem reiniciar os VUs já ativos (rampa)
+                while len(tasks) < users:
+                    index = len(tasks)
+                    identity = identities[index % len(identities)]
+                    vu = VirtualUser(index=index, **identity)
+                    tasks.append(asyncio.create_task(
+                        virtual_user(client, vu, mix, args.think_time, stats_ref, stop)
+                    ))
+
+                stage = StageStats(users=users)
+                stats_ref[0] = stage
+                before = await scraper.scrape()
+                started = time.perf_counter()
+                deadline = started + args.stage_seconds
+                while time.perf_counter() < deadline:
+                    await asyncio.sleep(min(1.0, max(0.0, deadline - time.perf_counter())))
+                    snapshot = await scraper.scrape()
+                    if snapshot:
+                        stage.pool_saturation = max(stage.pool_saturation, snapshot["saturation"])
+                stage.duration = time.perf_counter() - started
+
+                after = await scraper.scrape()
+                if before and after:
+                    stage.pool_wait_p95_ms = histogram_quantile(0.95, before["pool_wait"], after["pool_wait"])
+                    stage.loop_lag_p95_ms = histogram_quantile(0.95, before["loop_lag"], after["loop_lag"])
+
+                result = stage.to_dict(args.slo_p95_ms)
+                results.append(result)
+                print_stage(result)
+        finally:
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    print_saturation(results)
+    return results
+
+
+def print_stage(result: dict) -> None:
+    print(
+        f"   👥 {result['users']:>4} VUs  {result['throughput_rps']:>7.1f} req/s  "
+        f"p50 {result['p50_ms']:>7.1f}ms  p95 {result['p95_ms']:>7.1f}ms  p99 {result['p99_ms']:>7.1f}ms  "
+        f"429 {result['rate_limited']:>6.1%}  erros {result['error_rate']:>6.1%}  "
+        f"pool {result['pool_saturation']:>4.0%}/{result['pool_wait_p95_ms'] or 0:>5.0f}ms  "
+        f"loop {result['loop_lag_p95_ms'] or 0:>5.0f}ms"
+    )
+    slowest = sorted(result["actions"].items(), key=lambda item: -item[1]["p95_ms"])[:3]
+    print("        mais lentas: " + ", ".join(f"{name} {data['p95_ms']:.0f}ms" for name, data in slowest))
+    for bottleneck in result["bottlenecks"]:
+        print(f"        ⚠️  {bottleneck}")
+
+
+def print_saturation(results: list[dict]) -> None:
+    """Primeiro estágio com gargalo, ou em que a vazão parou de crescer."""
+    for previous, current in zip([None] + results, results):
+        if current["bottlenecks"]:
+            print(f"\n🚧 Saturação em {current['users']} VUs: {'; '.join(current['bottlenecks'])}\n")
+            return
+        if previous and current["throughput_rps"] < previous["throughput_rps"] * (1 + MIN_THROUGHPUT_GAIN):
+            print(f"\n🚧 Vazão estagnada em {current['users']} VUs "
+                  f"({previous['throughput_rps']:.0f} → {current['throughput_rps']:.0f} req/s): "
+                  f"fila antes do handler — compare p95 por ação e CPU do processo\n")
+            return
+    print(f"\n✅ Sem saturação até {results[-1]['users']} VUs\n")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Teste de carga por cenário contra a API em execução.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="show_night")
+    parser.add_argument("--stages", default="25,50,100,200,400", help="VUs por estágio (rampa)")
+    parser.add_argument("--stage-seconds", type=int, default=60)
+    parser.add_argument("--think-time", type=float, default=2.0, help="Pausa média entre ações (s)")
+    parser.add_argument("--tenants", type=int, default=3, help="Agências (maiores do banco) com VUs")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--slo-p95-ms", type=float, default=1000.0)
+    parser.add_argument("--metrics-token", default=settings.metrics_token)
+    parser.add_argument("--output", help="Grava os resultados por estágio em JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    stage_results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"scenario": args.scenario, "stages": stage_results}, f, indent=2)
@@ -0,0 +1,267 @@
+"""
+Benchmarks de endpoints (regressão de performance)
+
+Rodam contra o Postgres/Redis configurados (containers locais) populados
+pelo dataset sintético:
+
+    alembic upgrade head
+    python -m scripts.generate_dataset --preset large --seed 42
+    BENCHMARK=1 APP_ENV=development pytest tests/benchmarks -q
+
+Variáveis:
+- BENCHMARK=1                 habilita a suíte (ignorada no `pytest` comum)
+- BENCHMARK_USER_ID           usuário autenticado (default: admin da maior agência)
+- BENCHMARK_UPDATE_BASELINE=1 grava os resultados como nova baseline
+- BENCHMARK_TOLERANCE         folga relativa do p95 sobre a baseline (default 0.25)
+
+Sem baseline.json (ou sem a entrada do endpoint) o benchmark falha: a
+primeira execução numa máquina de referência usa BENCHMARK_UPDATE_BASELINE=1
+e o baseline.json gerado é versionado junto com a mudança.
+
+Escritas (check-in, sync push) rodam numa transação desfeita ao final do
+request: o dataset não muda entre execuções.
+"""
+
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+RESULTS_PATH = Path(__file__).parent / "results.json"
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "0.25"))
+# Diferenças abaixo disso são ruído de máquina, não regressão
+NOISE_FLOOR_MS = 5.0
+
+_results: dict[str, "BenchmarkResult"] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("BENCHMARK") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmarks: defina BENCHMARK=1 (requer Postgres/Redis com dataset)")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
+
+
+@dataclass
+class BenchmarkResult:
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries: int
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _load_baseline() -> dict:
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+def check_regression(name: str, result: BenchmarkResult) -> None:
+    """
+    Falha se o p95 passou da baseline + folga, se o endpoint passou a
+    executar mais queries ou se não há baseline para comparar.
+    """
+    _results[name] = result
+    if os.getenv("BENCHMARK_UPDATE_BASELINE") == "1":
+        return
+    baseline = _load_baseline().get(name)
+    if baseline is None:
+        pytest.fail(
+            f"{name}: sem baseline em {BASELINE_PATH.name}. "
+            f"Gere com BENCHMARK_UPDATE_BASELINE=1 e versione o arquivo."
+        )
+
+    assert result.queries <= baseline["queries"], (
+        f"{name}: {result.queries} queries/request (baseline {baseline['queries']})"
+    )
+    limit = max(baseline["p95_ms"] * (1 + TOLERANCE), baseline["p95_ms"] + NOISE_FLOOR_MS)
+    assert result.p95_ms <= limit, (
+        f"{name}: p95 {result.p95_ms:.1f}ms acima do limite {limit:.1f}ms "
+        f"(baseline {baseline['p95_ms']:.1f}ms, folga {TOLERANCE:.0%})"
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    payload = {name: asdict(result) for name, result in sorted(_results.items())}
+    RESULTS_PATH.write_text(json.dumps(payload, indent=2) + "\n")
+    if os.getenv("BENCHMARK_UPDATE_BASELINE") == "1":
+        BASELINE_PATH.write_text(json.dumps({**_load_baseline(), **payload}, indent=2, sort_keys=True) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    baseline = _load_baseline()
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'endpoint':<28}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}{'Δp95':>9}")
+    for name, result in sorted(_results.items()):
+        reference = baseline.get(name)
+        delta = f"{(result.p95_ms / reference['p95_ms'] - 1):+.0%}" if reference and reference["p95_ms"] else "—"
+        terminalreporter.write_line(
+            f"{name:<28}{result.p50_ms:>8.1f}ms{result.p95_ms:>8.1f}ms{result.p99_ms:>8.1f}ms"
+            f"{result.queries:>9}{delta:>9}"
+        )
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@dataclass
+class BenchmarkContext:
+    client: object
+    headers: dict
+    tenant_id: str
+    show_id: str
+    crew_user_ids: list[str]
+    timeline_ids: list[str]
+    pull_since_ms: int
+
+
+def _discover(user_id: str | None) -> dict:
+    """IDs de referência no dataset: show passado com mais lançamentos da agência."""
+    from sqlalchemy import create_engine, text
+
+    from app.config import get_settings
+
+    engine = create_engine(get_settings().database_url_sync)
+    with engine.connect() as conn:
+        if user_id is None:
+            user_id = conn.execute(text("""
+                SELECT u.id FROM users u
+                JOIN roles r ON r.id = u.role_id
+                WHERE r.name = 'Admin' AND u.is_active
+                ORDER BY (SELECT count(*) FROM shows s WHERE s.tenant_id = u.tenant_id) DESC
+                LIMIT 1
+            """)).scalar_one()
+        tenant_id = conn.execute(text("SELECT tenant_id FROM users WHERE id = :id"), {"id": user_id}).scalar_one()
+        show_id = conn.execute(text("""
+            SELECT s.id FROM shows s
+            JOIN financial_transactions ft ON ft.show_id = s.id
+            WHERE s.tenant_id = :tenant AND s.date_show < CURRENT_DATE
+            GROUP BY s.id ORDER BY count(*) DESC, s.id LIMIT 1
+        """), {"tenant": tenant_id}).scalar_one()
+        crew_user_ids = conn.execute(text(
+            "SELECT id FROM users WHERE tenant_id = :tenant ORDER BY id LIMIT 10"
+        ), {"tenant": tenant_id}).scalars().all()
+        timeline_ids = conn.execute(text(
+            'SELECT id FROM logistics_timeline WHERE show_id = :show ORDER BY "order"'
+        ), {"show": show_id}).scalars().all()
+        last_update = conn.execute(text(
+            "SELECT max(updated_at) FROM shows WHERE tenant_id = :tenant"
+        ), {"tenant": tenant_id}).scalar_one()
+    engine.dispose()
+
+    since = (last_update or datetime.now()) - timedelta(days=7)
+    return {
+        "user_id": str(user_id),
+        "tenant_id": str(tenant_id),
+        "show_id": str(show_id),
+        "crew_user_ids": [str(u) for u in crew_user_ids],
+        "timeline_ids": [str(t) for t in timeline_ids],
+        "pull_since_ms": int(since.timestamp() * 1000),
+    }
+
+
+@pytest.fixture(scope="session")
+def bench() -> BenchmarkContext:
+    from fastapi.testclient import TestClient
+
+    from app.config import get_settings
+    from app.core.limiter import limiter
+    from app.main import app
+
+    if not get_settings().is_development:
+        pytest.skip("benchmarks autenticam via X-Dev-User-Id: use APP_ENV=development")
+
+    ids = _discover(os.getenv("BENCHMARK_USER_ID"))
+    limiter.enabled = False  # rate limit mediria o throttling, não o endpoint
+    with TestClient(app) as client:
+        yield BenchmarkContext(
+            client=client,
+            headers={"X-Dev-User-Id": ids["user_id"]},
+            tenant_id=ids["tenant_id"],
+            show_id=ids["show_id"],
+            crew_user_ids=ids["crew_user_ids"],
+            timeline_ids=ids["timeline_ids"],
+            pull_since_ms=ids["pull_since_ms"],
+        )
+    limiter.enabled = True
+
+
+@pytest.fixture
+def rollback_writes():
+    """Sessões do request dentro de uma transação externa desfeita ao final."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app import database
+    from app.main import app
+
+    async def _get_db():
+        async with database.engine.connect() as conn:
+            await conn.begin()
+            session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+            try:
+                yield session
+                await session.commit()
+            finally:
+                await session.close()
+                await conn.rollback()
+
+    app.dependency_overrides[database.get_db] = _get_db
+    yield
+    app.dependency_overrides.pop(database.get_db, None)
+
+
+@pytest.fixture
+def benchmark():
+    """
+    Executa `call` (warmup + iterações), mede p50/p95/p99 e queries/request
+    e compara com a baseline do endpoint `name`.
+
+        benchmark("list_shows", lambda: client.get(url, headers=...), iterations=30)
+    """
+    from app.core.query_counter import record_queries
+
+    def _benchmark(name: str, call, iterations: int = 30, warmup: int = 3) -> BenchmarkResult:
+        for _ in range(warmup):
+            response = call()
+            assert response.status_code < 400, f"{response.status_code}: {response.text[:300]}"
+
+        samples, queries = [], []
+        for _ in range(iterations):
+            with record_queries() as stats:
+                started = time.perf_counter()
+                response = call()
+                samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code < 400, f"{response.status_code}: {response.text[:300]}"
+            queries.append(stats.count)
+
+        result = BenchmarkResult(
+            iterations=iterations,
+            p50_ms=round(statistics.median(samples), 2),
+            p95_ms=round(_percentile(samples, 95), 2),
+            p99_ms=round(_percentile(samples, 99), 2),
+            queries=max(queries),
+        )
+        check_regression(name, result)
+        return result
+
+    return _benchmark
@@ -0,0 +1,56 @@
+"""
+Benchmarks dos endpoints quentes (ver tests/benchmarks/conftest.py).
+
+Cada caso mede p50/p95/p99 e queries/request e compara com baseline.json.
+"""
+
+import time
+
+import pytest
+
+API = "/api/v1/client"
+
+READ_CASES = {
+    "list_shows": lambda b: f"{API}/shows/?page=1&page_size=20",
+    "list_shows_month": lambda b: f"{API}/shows/?page=1&page_size=20&year=2025&month=6",
+    "list_shows_week": lambda b: f"{API}/shows/?page=1&page_size=50&view=week&anchor=2025-06-14",
+    "dre": lambda b: f"{API}/shows/{b.show_id}/dre/",
+    "analytics_cockpit": lambda b: f"{API}/analytics/performance/artists",
+    "analytics_cockpit_year": lambda b: (
+        f"{API}/analytics/performance/artists?start_date=2025-01-01&end_date=2025-12-31"
+    ),
+    "simulate": lambda b: (
+        f"{API}/shows/simulate?city=Recife&uf=PE&cache=80000&transport_type=AEREO&flights_count=6&days_hotel=2"
+    ),
+    "sync_pull": lambda b: f"{API}/sync/pull?last_pulled_at={b.pull_since_ms}",
+    "daysheet": lambda b: f"{API}/shows/{b.show_id}/daysheet/",
+}
+
+# Endpoints caros (PDF, pull com muitos registros) rodam menos iterações
+ITERATIONS = {"sync_pull": 10, "daysheet_pdf": 10}
+
+
+@pytest.mark.parametrize("name", list(READ_CASES))
+def test_read_endpoint(name, bench, benchmark):
+    url = READ_CASES[name](bench)
+    benchmark(name, lambda: bench.client.get(url, headers=bench.headers), iterations=ITERATIONS.get(name, 30))
+
+
+def test_daysheet_pdf(bench, benchmark):
+    url = f"{API}/shows/{bench.show_id}/daysheet/pdf"
+    benchmark("daysheet_pdf", lambda: bench.client.get(url, headers=bench.headers),
+              iterations=ITERATIONS["daysheet_pdf"])
+
+
+def test_batch_checkin(bench, benchmark, rollback_writes):
+    url = f"{API}/shows/{bench.show_id}/road-closing/checkin"
+    payload = {"user_ids": bench.crew_user_ids}
+    benchmark("batch_checkin", lambda: bench.client.post(url, json=payload, headers=bench.headers))
+
+
+def test_sync_push(bench, benchmark, rollback_writes):
+    url = f"{API}/sync/push?last_pulled_at={int(time.time() * 1000)}"
+    payload = {"changes": {"logistics_timeline": {
+        "updated": [{"id": item_id, "description": "Atualizado offline"} for item_id in bench.timeline_ids],
+    }}}
+    benchmark("sync_push", lambda: bench.client.post(url, json=payload, headers=bench.headers))
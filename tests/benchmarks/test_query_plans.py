@@ -0,0 +1,129 @@
+"""
+Verificação dos índices de padrão de consulta (migração f7c3a9e1b5d2).
+
+Roda EXPLAIN dos filtros quentes no dataset sintético e exige que o
+planner escolha o índice composto/parcial correspondente. Funil e help
+desk não têm volume no dataset: para eles basta o índice ser utilizável
+(enable_seqscan = off).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+CASES = {
+    "agenda": (
+        "SELECT * FROM shows WHERE tenant_id = :tenant ORDER BY date_show DESC LIMIT 20",
+        "ix_shows_tenant_date_show",
+    ),
+    "agenda_mes": (
+        "SELECT * FROM shows WHERE tenant_id = :tenant AND date_show >= :start AND date_show < :end",
+        "ix_shows_tenant_date_show",
+    ),
+    "agenda_artista": (
+        "SELECT * FROM shows WHERE tenant_id = :tenant AND artist_id = :artist "
+        "AND date_show >= :start AND date_show < :end",
+        "ix_shows_tenant_artist_date_show",
+    ),
+    "dre": (
+        "SELECT type, sum(budgeted_amount), sum(realized_amount) FROM financial_transactions "
+        "WHERE tenant_id = :tenant AND show_id = :show GROUP BY type",
+        "ix_financial_transactions_tenant_show_type",
+    ),
+    "sync_shows": (
+        "SELECT * FROM shows WHERE tenant_id = :tenant AND updated_at > :since",
+        "ix_shows_tenant_updated_at",
+    ),
+    "sync_ledger": (
+        "SELECT * FROM financial_transactions WHERE tenant_id = :tenant AND updated_at > :since",
+        "ix_financial_transactions_tenant_updated_at",
+    ),
+    "sync_timeline": (
+        "SELECT * FROM logistics_timeline WHERE tenant_id = :tenant AND updated_at > :since",
+        "ix_logistics_timeline_tenant_updated_at",
+    ),
+    "checkin": (
+        "SELECT * FROM show_checkins WHERE show_id = :show AND user_id = :user",
+        "ix_show_checkins_show_user",
+    ),
+}
+
+SMALL_TABLE_CASES = {
+    "funil": (
+        "SELECT * FROM commercial_leads WHERE tenant_id = :tenant AND status = 'NEGOCIAÇÃO' "
+        "ORDER BY created_at DESC LIMIT 20",
+        "ix_commercial_leads_tenant_status_created_at",
+    ),
+    "tickets_tenant": (
+        "SELECT * FROM tickets WHERE tenant_id = :tenant AND status = 'ABERTO' ORDER BY created_at DESC LIMIT 20",
+        "ix_tickets_tenant_status_created_at",
+    ),
+    "fila_help_desk": (
+        "SELECT * FROM tickets WHERE status IN ('ABERTO', 'EM_ATENDIMENTO') ORDER BY created_at DESC LIMIT 20",
+        "ix_tickets_open_queue",
+    ),
+}
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+@pytest.fixture(scope="module")
+def conn():
+    from sqlalchemy import create_engine, text
+
+    from app.config import get_settings
+
+    engine = create_engine(get_settings().database_url_sync)
+    with engine.connect() as connection:
+        row = connection.execute(text("""
+            SELECT s.tenant_id, s.id AS show, s.artist_id, c.user_id,
+                   (SELECT max(updated_at) FROM shows) AS last_update
+            FROM shows s JOIN show_checkins c ON c.show_id = s.id
+            ORDER BY s.date_show DESC LIMIT 1
+        """)).mappings().first()
+        if row is None:
+            pytest.skip("dataset sintético ausente (scripts.generate_dataset)")
+        connection.info["params"] = {
+            "tenant": row["tenant_id"],
+            "show": row["show"],
+            "artist": row["artist_id"],
+            "user": row["user_id"],
+            "start": date(2025, 6, 1),
+            "end": date(2025, 7, 1),
+            "since": row["last_update"] - timedelta(days=7),
+        }
+        yield connection
+    engine.dispose()
+
+
+def _plan_indexes(conn, sql: str) -> set[str]:
+    from sqlalchemy import text
+
+    params = {key: value for key, value in conn.info["params"].items() if f":{key}" in sql}
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+    return _index_names(plan[0]["Plan"])
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_planner_uses_index(conn, name):
+    sql, index = CASES[name]
+    used = _plan_indexes(conn, sql)
+    assert index in used, f"{name}: esperado {index}, plano usou {sorted(used) or 'seq scan'}"
+
+
+@pytest.mark.parametrize("name", list(SMALL_TABLE_CASES))
+def test_index_usable_on_small_tables(conn, name):
+    from sqlalchemy import text
+
+    sql, index = SMALL_TABLE_CASES[name]
+    conn.execute(text("SET enable_seqscan = off"))
+    try:
+        used = _plan_indexes(conn, sql)
+    finally:
+        conn.execute(text("RESET enable_seqscan"))
+    assert index in used, f"{name}: esperado {index}, plano usou {sorted(used) or 'seq scan'}"
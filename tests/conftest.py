@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.query_counter import N_PLUS_ONE_THRESHOLD, record_queries
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Orçamento de queries por endpoint: falha o teste se o bloco executar
+    mais statements que o declarado ou repetir o mesmo formato (N+1).
+
+        def test_listar_shows(query_budget):
+            with query_budget(max_queries=4):
+                client.get("/api/v1/client/shows", headers=...)
+    """
+    @contextmanager
+    def _budget(max_queries: int, max_repeats: int = N_PLUS_ONE_THRESHOLD - 1):
+        with record_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Orçamento de {max_queries} queries excedido:\n{stats.report()}"
+        )
+        assert stats.worst_repeat <= max_repeats, (
+            f"Mesmo statement repetido {stats.worst_repeat}x (N+1?):\n{stats.report()}"
+        )
+
+    return _budget
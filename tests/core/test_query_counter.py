@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.query_counter import _after_cursor_execute, normalize_statement, record_queries
+
+
+def _execute(statement: str) -> None:
+    """Simula o hook de cursor do SQLAlchemy para um statement."""
+    _after_cursor_execute(None, None, statement, None, None, False)
+
+
+def test_normalize_collapses_parameters_and_lists():
+    a = normalize_statement("SELECT * FROM users WHERE id IN ($1, $2, $3) AND tenant_id = $4")
+    b = normalize_statement("SELECT *  FROM users\nWHERE id IN ($1) AND tenant_id = $2")
+    assert a == b == "SELECT * FROM users WHERE id IN (?) AND tenant_id = ?"
+
+
+def test_record_queries_detects_repeated_shapes():
+    with record_queries() as stats:
+        for i in range(3):
+            _execute(f"SELECT * FROM users WHERE id = ${i + 1}")
+        _execute("SELECT count(*) FROM shows")
+
+    assert stats.count == 4
+    assert stats.worst_repeat == 3
+    assert list(stats.duplicates.values()) == [3]
+
+
+def test_query_budget_fails_when_exceeded(query_budget):
+    with query_budget(max_queries=2):
+        _execute("SELECT 1")
+        _execute("SELECT 2")
+
+    with pytest.raises(AssertionError, match="Orçamento"):
+        with query_budget(max_queries=1):
+            _execute("SELECT 1")
+            _execute("SELECT 2")
+
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with query_budget(max_queries=10, max_repeats=1):
+            _execute("SELECT * FROM shows WHERE id = $1")
+            _execute("SELECT * FROM shows WHERE id = $1")
@@ -0,0 +1,71 @@
+import csv
+import io
+import uuid
+from contextlib import contextmanager
+from datetime import date
+
+from app.models.financial_transaction import (
+    FinancialTransaction,
+    PublicPaymentStatus,
+    TransactionCategory,
+    TransactionType,
+)
+from scripts.generate_dataset import NULL, copy_rows
+
+
+class _CaptureConn:
+    """Conexão psycopg2 falsa: guarda o comando e as linhas de cada COPY."""
+
+    def __init__(self):
+        self.copies: list[tuple[str, list[list[str]]]] = []
+
+    @contextmanager
+    def cursor(self):
+        yield self
+
+    def copy_expert(self, sql: str, buffer: io.StringIO) -> None:
+        self.copies.append((sql, list(csv.reader(io.StringIO(buffer.read())))))
+
+
+def _ledger_row(tx_type, category, **extra) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": uuid.uuid4(),
+        "show_id": uuid.uuid4(),
+        "type": tx_type,
+        "category": category,
+        "description": "linha",
+        "budgeted_amount": "100.00",
+        "realized_amount": "0.00",
+        **extra,
+    }
+
+
+def test_copy_rows_keeps_columns_of_mixed_ledger_rows():
+    payment = {
+        "public_payment_status": PublicPaymentStatus.PAGO,
+        "empenho_date": date(2025, 5, 20),
+        "empenho_number": "2025NE00042",
+        "liquidation_date": date(2025, 6, 30),
+    }
+    rows = [
+        # show privado primeiro: receita sem colunas do mercado público
+        _ledger_row(TransactionType.REVENUE, TransactionCategory.OTHER),
+        _ledger_row(TransactionType.REVENUE, TransactionCategory.OTHER, **payment),
+        _ledger_row(TransactionType.TAX, TransactionCategory.TAX_NF),
+    ]
+    conn = _CaptureConn()
+
+    assert copy_rows(conn, FinancialTransaction, rows) == 3
+
+    [(sql, lines)] = conn.copies
+    columns = [c.strip('"') for c in sql.split("(", 1)[1].split(")", 1)[0].split(", ")]
+    records = [dict(zip(columns, line)) for line in lines]
+    assert records[0]["public_payment_status"] == NULL
+    assert records[1]["public_payment_status"] == PublicPaymentStatus.PAGO.value
+    assert records[1]["empenho_number"] == "2025NE00042"
+    assert records[1]["liquidation_date"] == "2025-06-30"
+    assert records[2]["empenho_date"] == NULL
+    assert records[2]["is_auto_generated"] == "false"
+    # created_at/updated_at ficam para o server_default
+    assert "created_at" not in columns
@@ -0,0 +1,12 @@
+from app.services.fcm_service import FCMService
+
+
+async def test_send_batch_without_firebase_fails_every_token(monkeypatch):
+    monkeypatch.setattr(FCMService, "_initialized", False)
+
+    result = await FCMService.send_batch(["tok-a", "tok-b", "tok-a"], title="Roteiro", body="Liberado")
+
+    assert result["success"] == 0
+    assert result["failure"] == 2
+    assert result["failed_tokens"] == ["tok-a", "tok-b"]
+    assert result["dead_tokens"] == []